@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import netaddr
+from fluxory.lib import addrconv
+from benchmarks.utils import bench
+
+
+class mac_dialect(netaddr.mac_unix):
+    word_fmt = "%.2x"
+
+
+def main() -> None:
+    """Compare netaddr objects against the addrconv fast paths."""
+    mac_text = "00:11:22:33:44:55"
+    mac_bin = addrconv.mac.text_to_bin(mac_text)
+    ipv4_text = "10.0.0.1"
+    ipv4_bin = addrconv.ipv4.text_to_bin(ipv4_text)
+    ipv6_text = "2001:db8::1"
+    ipv6_bin = addrconv.ipv6.text_to_bin(ipv6_text)
+
+    bench(
+        "netaddr mac bin_to_text",
+        lambda: str(
+            netaddr.EUI(
+                netaddr.strategy.eui48.packed_to_int(mac_bin),
+                version=48,
+                dialect=mac_dialect,
+            )
+        ),
+    )
+    bench("addrconv mac bin_to_text", lambda: addrconv.mac.bin_to_text(mac_bin))
+    bench("netaddr mac text_to_bin", lambda: netaddr.EUI(mac_text).packed)
+    bench("addrconv mac text_to_bin", lambda: addrconv.mac.text_to_bin(mac_text))
+    bench(
+        "netaddr ipv4 bin_to_text",
+        lambda: str(
+            netaddr.IPAddress(
+                netaddr.strategy.ipv4.packed_to_int(ipv4_bin), version=4
+            )
+        ),
+    )
+    bench("addrconv ipv4 bin_to_text", lambda: addrconv.ipv4.bin_to_text(ipv4_bin))
+    bench(
+        "netaddr ipv4 text_to_bin",
+        lambda: netaddr.IPAddress(ipv4_text, version=4).packed,
+    )
+    bench("addrconv ipv4 text_to_bin", lambda: addrconv.ipv4.text_to_bin(ipv4_text))
+    bench(
+        "netaddr ipv6 bin_to_text",
+        lambda: str(
+            netaddr.IPAddress(
+                netaddr.strategy.ipv6.packed_to_int(ipv6_bin), version=6
+            )
+        ),
+    )
+    bench("addrconv ipv6 bin_to_text", lambda: addrconv.ipv6.bin_to_text(ipv6_bin))
+
+
+if __name__ == "__main__":
+    main()
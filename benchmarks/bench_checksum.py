@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+from fluxory.lib.packet import packet, ipv4, tcp, packet_utils
+from benchmarks.utils import bench, frame
+
+
+def main() -> None:
+    """Checksum rates by size, and a port and TTL rewrite of a packet."""
+    for size in (20, 64, 1500, 9000, 65536):
+        data = memoryview(bytearray(os.urandom(size)))
+        bench(f"checksum, {size} bytes", lambda: packet_utils.checksum(data), 10000)
+        bench(f"fletcher_checksum, {size} bytes",
+              lambda: packet_utils.fletcher_checksum(data, 14), 1000)
+
+    pkt = packet.Packet(frame(b"x" * 1400))
+    ip = pkt.get_protocol(ipv4.ipv4)
+    l4 = pkt.get_protocol(tcp.tcp)
+
+    def rewrite(full: bool) -> None:
+        ip.ttl = (ip.ttl - 1) & 0xff
+        l4.dst_port ^= 1
+        if full:
+            l4.csum = 0
+        pkt.serialize()
+
+    bench("1500 bytes rewrite, full re-sum", lambda: rewrite(True), 10000)
+    bench("1500 bytes rewrite, incremental", lambda: rewrite(False), 10000)
+
+
+if __name__ == "__main__":
+    main()
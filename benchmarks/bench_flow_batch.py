@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Flows installed per second, needs rabbitmq and a connected switch."""
+
+import asyncio
+import time
+from fluxory.flow_batch import FlowBatch
+from fluxory.ofproto import ofproto_v1_5, ofproto_v1_5_parser as parser
+from fluxory.rpc import RequestRawRPC
+from benchmarks.bench_rpc_pool import BenchApp
+
+
+def flow_mods(count: int) -> list:
+    """Build count distinct flow mods."""
+    actions = [parser.OFPActionOutput(1)]
+    inst = [parser.OFPInstructionActions(ofproto_v1_5.OFPIT_APPLY_ACTIONS, actions)]
+    return [
+        parser.OFPFlowMod(
+            priority=100,
+            match=parser.OFPMatch(eth_type=0x0800, ipv4_dst=f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"),
+            instructions=inst,
+        )
+        for i in range(count)
+    ]
+
+
+async def main(flows: int = 10000) -> None:
+    """Compare one write_dpid RPC per flow against FlowBatch."""
+    app = BenchApp()
+    await app.run()
+    dpid = (await app.list_switches())[0]
+
+    start = time.perf_counter()
+    for mod in flow_mods(flows // 10):
+        mod.serialize()
+        await app.rpc("write_dpid", **RequestRawRPC(dpid=dpid, payload=mod.buf).to_dict())
+    print(f"{'write_dpid per flow':<40} {flows // 10 / (time.perf_counter() - start):>14,.0f} flows/s")
+
+    for bundle in (False, True):
+        batch = FlowBatch(app, dpid, ofproto_v1_5.OFP_VERSION, bundle=bundle)
+        for mod in flow_mods(flows):
+            batch.add(mod)
+        start = time.perf_counter()
+        windows = await batch.commit()
+        rate = flows / (time.perf_counter() - start)
+        errors = sum(len(w.errors) for w in windows)
+        name = f"FlowBatch bundle={bundle}"
+        print(f"{name:<40} {rate:>14,.0f} flows/s, {errors} errors")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
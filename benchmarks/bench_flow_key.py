@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.lib.packet import packet, ethernet, vlan, ipv4, ipv6, tcp, udp, arp
+from fluxory.lib.packet.flow_key import flow_key, flow_keys
+from benchmarks.bench_packet_depth import mix
+from benchmarks.utils import bench
+
+L4 = (tcp.tcp, udp.udp)
+
+
+def packet_key(data: bytes, in_port: int) -> tuple:
+    """The same key as flow_key, through Packet and get_protocol."""
+    pkt = packet.Packet(data, int_addrs=True)
+    eth = pkt.get_protocol(ethernet.ethernet)
+    vid = pkt.get_protocol(vlan.vlan)
+    ip = pkt.get_protocol(ipv4.ipv4) or pkt.get_protocol(ipv6.ipv6)
+    l4 = next((p for p in pkt if isinstance(p, L4)), None)
+    arp_pkt = pkt.get_protocol(arp.arp)
+    eth_type = vid.ethertype if vid else eth.ethertype
+    if ip is not None:
+        (src, dst) = (ip.src, ip.dst)
+        proto = ip.proto if isinstance(ip, ipv4.ipv4) else ip.nxt
+    elif arp_pkt is not None:
+        (src, dst, proto) = (arp_pkt.src_ip, arp_pkt.dst_ip, arp_pkt.opcode)
+    else:
+        (src, dst, proto) = (0, 0, 0)
+    return (in_port, eth.src, eth.dst, eth_type, vid.vid if vid else 0,
+            src, dst, proto, l4.src_port if l4 else 0, l4.dst_port if l4 else 0)
+
+
+def main() -> None:
+    """Flow keys of a packet in mix, decoded or extracted."""
+    pkts = mix()
+    ports = list(range(len(pkts)))
+    for (data, port) in zip(pkts, ports):
+        assert tuple(flow_key(data, port)) == packet_key(data, port)
+
+    n = 2000
+    bench("Packet and get_protocol, mix",
+          lambda: [packet_key(d, p) for (d, p) in zip(pkts, ports)], n)
+    bench("flow_key, mix",
+          lambda: [flow_key(d, p) for (d, p) in zip(pkts, ports)], n)
+    bench("flow_keys, mix", lambda: flow_keys(pkts, ports), n)
+
+
+if __name__ == "__main__":
+    main()
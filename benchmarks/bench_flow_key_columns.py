@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.lib.packet import packet
+from fluxory.lib.packet.flow_key import flow_keys, flow_key_columns, pack_frames
+from benchmarks.bench_packet_depth import mix
+from benchmarks.utils import bench
+
+BATCH = 10000
+
+
+def main() -> None:
+    """Classify a buffer of packet in frames, per packet or at once."""
+    pkts = mix()
+    frames = [pkts[i % len(pkts)] for i in range(BATCH)]
+    ports = [i % 48 for i in range(BATCH)]
+    packed = pack_frames(frames)
+    lengths = [len(data) for data in frames]
+    print(f"batches of {BATCH} frames")
+    bench("Packet", lambda: [packet.Packet(data) for data in frames], 3)
+    bench("flow_keys", lambda: flow_keys(frames, ports), 10)
+    bench("flow_key_columns", lambda: flow_key_columns(frames, ports), 10)
+    bench("pack_frames", lambda: pack_frames(frames), 10)
+    bench(
+        "flow_key_columns, packed",
+        lambda: flow_key_columns(packed, ports, lengths=lengths),
+        10,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.lib.packet import packet, ethernet
+from fluxory.ofproto import ofproto_v1_5_parser as ofparser
+from benchmarks.utils import bench, frame
+
+
+def main() -> None:
+    """Compare text and int address modes on a learning switch hot path."""
+    data = frame()
+    mac_to_port: dict = {}
+
+    def learn(int_addrs: bool, stop_at: type = None) -> int:
+        pkt = packet.Packet(data, int_addrs=int_addrs, stop_at=stop_at)
+        eth = pkt.get_protocols(ethernet.ethernet)[0]
+        mac_to_port[eth.src] = 1
+        return mac_to_port.get(eth.dst, 0)
+
+    bench("Packet learn, text addresses", lambda: learn(False))
+    bench("Packet learn, int addresses", lambda: learn(True))
+    bench("Packet learn, ethernet only, text addresses",
+          lambda: learn(False, ethernet.ethernet))
+    bench("Packet learn, ethernet only, int addresses",
+          lambda: learn(True, ethernet.ethernet))
+
+    match = ofparser.OFPMatch(
+        in_port=1,
+        eth_src="00:00:00:00:00:01",
+        eth_dst="00:00:00:00:00:02",
+        ipv4_src="10.0.0.1",
+        ipv4_dst="10.0.0.2",
+        eth_type=0x0800,
+    )
+    buf = bytearray()
+    match.serialize(buf, 0)
+    buf = bytes(buf)
+    bench("OFPMatch.parser, text addresses", lambda: ofparser.OFPMatch.parser(buf, 0))
+    bench(
+        "OFPMatch.parser, int addresses",
+        lambda: ofparser.OFPMatch.parser(buf, 0, int_addrs=True),
+    )
+
+
+if __name__ == "__main__":
+    main()
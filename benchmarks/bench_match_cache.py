@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.ofproto import ofproto_v1_5 as ofproto
+from fluxory.ofproto import ofproto_v1_5_parser as ofparser
+from benchmarks.utils import bench
+
+
+def new_match() -> ofparser.OFPMatch:
+    return ofparser.OFPMatch(
+        in_port=1,
+        eth_dst="00:00:00:00:00:02",
+        eth_src="00:00:00:00:00:01",
+        eth_type=0x0800,
+        ipv4_src="10.0.0.1",
+        ipv4_dst=("10.0.0.0", "255.255.255.0"),
+        ip_proto=6,
+        tcp_dst=80,
+    )
+
+
+def main() -> None:
+    """OFPFlowMod.serialize with a fresh match and with a reused one."""
+    actions = [ofparser.OFPActionOutput(2)]
+    inst = [ofparser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)]
+    match = new_match()
+
+    def fresh_match() -> None:
+        ofparser.OFPFlowMod(priority=1, match=new_match(), instructions=inst).serialize()
+
+    def reused_match() -> None:
+        ofparser.OFPFlowMod(priority=1, match=match, instructions=inst).serialize()
+
+    def match_only() -> None:
+        match.serialize(bytearray(), 0)
+
+    bench("OFPFlowMod.serialize, fresh match", fresh_match, 10000)
+    bench("OFPFlowMod.serialize, reused match", reused_match, 10000)
+    bench("OFPMatch.serialize, reused match", match_only, 100000)
+
+
+if __name__ == "__main__":
+    main()
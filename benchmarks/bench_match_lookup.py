@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.ofproto import ofproto_v1_5_parser as ofparser
+from benchmarks.utils import bench
+
+KEYS = ("in_port", "eth_type", "eth_src", "eth_dst", "ip_proto", "tcp_dst")
+
+
+def main() -> None:
+    """Compare rebuilding a dict per lookup against the OFPMatch index."""
+    match = ofparser.OFPMatch(
+        in_port=3,
+        eth_type=0x0800,
+        eth_src="00:00:00:00:00:01",
+        eth_dst="00:00:00:00:00:02",
+        ip_proto=6,
+        tcp_dst=80,
+    )
+
+    def rebuilt() -> list:
+        return [dict(match._fields2).get(k) for k in KEYS]
+
+    def indexed() -> list:
+        return [match.get(k) for k in KEYS]
+
+    assert rebuilt() == indexed()
+    bench("dict(_fields2) per lookup", rebuilt, 100000)
+    bench("OFPMatch.get", indexed, 100000)
+    bench("OFPMatch['in_port']", lambda: match["in_port"], 100000)
+    bench("'tcp_dst' in OFPMatch", lambda: "tcp_dst" in match, 100000)
+
+
+if __name__ == "__main__":
+    main()
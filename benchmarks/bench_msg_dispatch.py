@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import struct
+from fluxory.ofproto import ofproto_parser, ofproto_protocol
+from benchmarks.bench_stats_columns import flow_stats_body
+from benchmarks.utils import bench, frame, packet_in
+
+# fixed size of the messages that are sampled zero-filled
+ZERO_FILLED = {
+    "OFPT_ERROR": "OFP_ERROR_MSG_SIZE",
+    "OFPT_ECHO_REPLY": "OFP_HEADER_SIZE",
+    "OFPT_FEATURES_REPLY": "OFP_SWITCH_FEATURES_SIZE",
+    "OFPT_GET_CONFIG_REPLY": "OFP_SWITCH_CONFIG_SIZE",
+    "OFPT_ROLE_REPLY": "OFP_ROLE_REQUEST_SIZE",
+    "OFPT_ROLE_STATUS": "OFP_ROLE_STATUS_SIZE",
+    "OFPT_GET_ASYNC_REPLY": "OFP_ASYNC_CONFIG_SIZE",
+    "OFPT_PORT_STATUS": "OFP_PORT_STATUS_SIZE",
+    "OFPT_TABLE_STATUS": "OFP_TABLE_STATUS_SIZE",
+}
+
+
+def message(ofproto, msg_type: int, body: bytes) -> bytes:
+    """Prepend an OpenFlow header to body."""
+    buf = bytearray(ofproto.OFP_HEADER_SIZE) + body
+    struct.pack_into(ofproto.OFP_HEADER_PACK_STR, buf, 0, ofproto.OFP_VERSION,
+                     msg_type, len(buf), 1)
+    return bytes(buf)
+
+
+def samples(ofproto, ofparser) -> dict:
+    """Build a serialized message of every msg_type that can be sampled."""
+    msgs = {}
+    for (msg_type, cls) in ofparser._classes.items():
+        try:
+            msg = cls()
+            msg.serialize()
+            msgs[msg_type] = bytes(msg.buf)
+        except Exception:
+            pass
+    for (name, size) in ZERO_FILLED.items():
+        if hasattr(ofproto, size):
+            size = getattr(ofproto, size) - ofproto.OFP_HEADER_SIZE
+            msgs[getattr(ofproto, name)] = message(
+                ofproto, getattr(ofproto, name), bytes(size))
+    msgs[ofproto.OFPT_PACKET_IN] = packet_in(ofproto, ofparser, frame())
+    mp_reply = bytearray(ofproto.OFP_MULTIPART_REPLY_SIZE - ofproto.OFP_HEADER_SIZE)
+    if ofproto.OFP_VERSION == 4:
+        struct.pack_into("!H", mp_reply, 0, ofproto.OFPMP_FLOW)
+        mp_reply += flow_stats_body(10)
+    else:
+        struct.pack_into("!H", mp_reply, 0, ofproto.OFPMP_DESC)
+        mp_reply += bytes(ofproto.OFP_DESC_SIZE)
+    msgs[ofproto.OFPT_MULTIPART_REPLY] = message(
+        ofproto, ofproto.OFPT_MULTIPART_REPLY, bytes(mp_reply))
+    # only keep the samples that parse
+    return {
+        msg_type: buf for (msg_type, buf) in msgs.items()
+        if ofproto_parser.msg(*ofproto_parser.header(buf), buf) is not None
+    }
+
+
+def main() -> None:
+    """Decode rate of every sampled message type."""
+    logging.getLogger("fluxory.ofproto.ofproto_parser").setLevel(logging.ERROR)
+    for (version, (ofproto, ofparser)) in sorted(ofproto_protocol._versions.items()):
+        msgs = samples(ofproto, ofparser)
+        skipped = sorted(set(ofparser._classes) - set(msgs))
+        print(f"version {version}: {len(msgs)} msg types, skipped {skipped}")
+        for (msg_type, buf) in sorted(msgs.items()):
+            args = ofproto_parser.header(buf) + (buf,)
+            name = next(
+                k for (k, v) in vars(ofproto).items()
+                if k.startswith("OFPT_") and v == msg_type
+            )
+            bench(f"{msg_type:>3} {name}", lambda: ofproto_parser.msg(*args), 10000)
+
+        # only the dispatch, on a header only message
+        (_, msg_type, msg_len, xid) = ofproto_parser.header(
+            msgs[ofproto.OFPT_HELLO])
+        versions = ofproto_protocol._versions
+        parsers = ofproto_parser._msg_parsers
+
+        def dict_lookup() -> object:
+            return versions.get(version)[1]._classes[msg_type].parser
+
+        def table_lookup() -> object:
+            return parsers[version << 8 | msg_type]
+
+        bench("dispatch, dict lookups", dict_lookup, 1000000)
+        bench("dispatch, flat table", table_lookup, 1000000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.ofproto import ofproto_v1_5 as ofproto
+from fluxory.ofproto import ofproto_v1_5_parser as ofparser
+from benchmarks.utils import bench, frame
+
+
+def packet_out(in_port: int, data: bytes) -> ofparser.OFPPacketOut:
+    return ofparser.OFPPacketOut(
+        buffer_id=ofproto.OFP_NO_BUFFER,
+        match=ofparser.OFPMatch(in_port=in_port),
+        actions=[ofparser.OFPActionOutput(ofproto.OFPP_FLOOD)],
+        data=data,
+    )
+
+
+def flow_mod(in_port: int, port: int) -> ofparser.OFPFlowMod:
+    actions = [ofparser.OFPActionOutput(port)]
+    return ofparser.OFPFlowMod(
+        priority=100,
+        match=ofparser.OFPMatch(in_port=in_port, eth_dst="00:00:00:00:00:02"),
+        instructions=[
+            ofparser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)
+        ],
+    )
+
+
+def main() -> None:
+    """Full construction against patching a pre-serialized template."""
+    data = frame()
+    out_tmpl = ofparser.OFPPacketOutTemplate(packet_out(ofproto.OFPP_CONTROLLER, b""))
+    mod_tmpl = ofparser.OFPFlowModTemplate(flow_mod(1, 1))
+
+    def build_packet_out() -> bytearray:
+        msg = packet_out(3, data)
+        msg.set_xid(7)
+        msg.serialize()
+        return msg.buf
+
+    def build_flow_mod() -> bytearray:
+        msg = flow_mod(3, 2)
+        msg.set_xid(7)
+        msg.serialize()
+        return msg.buf
+
+    assert out_tmpl.serialize(data, xid=7, in_port=3) == build_packet_out()
+    assert mod_tmpl.serialize(xid=7, in_port=3, port=2) == build_flow_mod()
+
+    bench("OFPPacketOut, construct and serialize", build_packet_out, 10000)
+    bench("OFPPacketOutTemplate.serialize",
+          lambda: out_tmpl.serialize(data, xid=7, in_port=3), 100000)
+    bench("OFPFlowMod, construct and serialize", build_flow_mod, 10000)
+    bench("OFPFlowModTemplate.serialize",
+          lambda: mod_tmpl.serialize(xid=7, in_port=3, port=2), 100000)
+
+
+if __name__ == "__main__":
+    main()
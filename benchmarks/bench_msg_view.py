@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto import ofproto_v1_5, ofproto_v1_5_parser
+from benchmarks.utils import bench, frame, packet_in
+
+
+def main() -> None:
+    """Compare eager and lazy packet-in dispatch."""
+    body = packet_in(ofproto_v1_5, ofproto_v1_5_parser, frame())
+
+    def handler(lazy: bool) -> int:
+        (version, msg_type, msg_len, xid) = ofproto_parser.header(body)
+        msg = ofproto_parser.msg(version, msg_type, msg_len, xid, body, lazy=lazy)
+        return msg.buffer_id
+
+    bench("eager msg() + buffer_id", lambda: handler(False))
+    bench("lazy msg() + buffer_id", lambda: handler(True))
+
+
+if __name__ == "__main__":
+    main()
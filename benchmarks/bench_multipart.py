@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Peak memory of a large multipart reply, collected or streamed."""
+
+import asyncio
+import struct
+import tracemalloc
+from fluxory.multipart import MultipartStream
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto import ofproto_v1_3 as ofproto
+from benchmarks.bench_stats_columns import flow_stats_body
+
+SEGMENTS = 100
+ENTRIES = 600
+
+
+def segment(more: bool) -> bytes:
+    """Build a serialized OFPFlowStatsReply segment."""
+    buf = bytearray(ofproto.OFP_MULTIPART_REPLY_SIZE) + flow_stats_body(ENTRIES)
+    struct.pack_into(ofproto.OFP_HEADER_PACK_STR, buf, 0, ofproto.OFP_VERSION,
+                     ofproto.OFPT_MULTIPART_REPLY, len(buf), 1)
+    flags = ofproto.OFPMPF_REPLY_MORE if more else 0
+    struct.pack_into(ofproto.OFP_MULTIPART_REPLY_PACK_STR, buf,
+                     ofproto.OFP_HEADER_SIZE, ofproto.OFPMP_FLOW, flags)
+    return bytes(buf)
+
+
+def view(buf: bytes) -> ofproto_parser.MsgView:
+    return ofproto_parser.msg(*ofproto_parser.header(buf), buf, lazy=True)
+
+
+async def collected() -> int:
+    """Decode every entry once the whole reply is received."""
+    segments = [view(segment(i < SEGMENTS - 1)) for i in range(SEGMENTS)]
+    entries = [entry for reply in segments for entry in reply.body]
+    return sum(entry.byte_count for entry in entries)
+
+
+async def streamed(columns: bool) -> int:
+    """Consume each segment as it's received."""
+    stream = MultipartStream(1, 1)
+
+    async def receive() -> None:
+        for i in range(SEGMENTS):
+            stream.feed(view(segment(i < SEGMENTS - 1)))
+            await asyncio.sleep(0)
+        stream.close()
+
+    asyncio.ensure_future(receive())
+    total = 0
+    if columns:
+        async for body in stream.chunks(columns=True):
+            total += int(body["byte_count"].sum())
+    else:
+        async for entry in stream:
+            total += entry.byte_count
+    return total
+
+
+def peak(coro) -> tuple:
+    tracemalloc.start()
+    result = asyncio.run(coro)
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (result, size)
+
+
+def main() -> None:
+    """Compare the peak memory of collecting and streaming a reply."""
+    print(f"{SEGMENTS} segments of {ENTRIES} flow stats entries")
+    (expected, collected_peak) = peak(collected())
+    print(f"{'collected, objects':<40} {collected_peak / 2 ** 20:>10.1f} MiB")
+    for columns in (False, True):
+        (total, streamed_peak) = peak(streamed(columns))
+        assert total == expected
+        name = f"streamed, {'columns' if columns else 'objects'}"
+        print(f"{name:<40} {streamed_peak / 2 ** 20:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
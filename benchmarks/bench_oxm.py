@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.ofproto import ofproto_v1_5 as ofproto
+from fluxory.ofproto import ofproto_v1_5_parser as ofparser
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    """Compare the generic and table-driven OXM codecs on a packet-in match."""
+    match = ofparser.OFPMatch(
+        in_port=3,
+        eth_type=0x0800,
+        eth_src="00:00:00:00:00:01",
+        ip_proto=6,
+        tcp_dst=80,
+        metadata=(0x10, 0xFF),
+    )
+    buf = bytearray()
+    match.serialize(buf, 0)
+    buf = bytes(buf)
+    end = len(buf)
+
+    def generic_parse() -> list:
+        (offset, fields) = (4, [])
+        while offset < end and buf[offset:offset + 4] != b"\x00" * 4:
+            (n, value, mask, field_len) = ofproto.oxm_parse(buf, offset)
+            fields.append(ofproto.oxm_to_user(n, value, mask))
+            offset += field_len
+        return fields
+
+    def fast_parse() -> list:
+        (offset, fields) = (4, [])
+        while offset < end and buf[offset:offset + 4] != b"\x00" * 4:
+            (k, uv, field_len) = ofproto.oxm_parse_to_user(buf, offset)
+            fields.append((k, uv))
+            offset += field_len
+        return fields
+
+    assert generic_parse() == fast_parse()
+
+    def generic_serialize() -> None:
+        out = bytearray()
+        for (k, uv) in match._fields2:
+            (n, value, mask) = ofproto.oxm_from_user(k, uv)
+            ofproto.oxm_serialize(n, value, mask, out, len(out))
+
+    def fast_serialize() -> None:
+        out = bytearray()
+        for (k, uv) in match._fields2:
+            ofproto.oxm_serialize_from_user(k, uv, out, len(out))
+
+    bench("generic oxm parse", generic_parse)
+    bench("table-driven oxm parse", fast_parse)
+    bench("generic oxm serialize", generic_serialize)
+    bench("table-driven oxm serialize", fast_serialize)
+    bench("OFPMatch.parser", lambda: ofparser.OFPMatch.parser(buf, 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.lib.packet import packet, ethernet, vlan, arp, ipv4, ipv6, tcp, udp
+from benchmarks.utils import bench, frame
+
+PAYLOAD = b"x" * 64
+
+
+def build(*protocols) -> bytes:
+    pkt = packet.Packet()
+    for proto in protocols:
+        pkt.add_protocol(proto)
+    pkt.serialize()
+    return bytes(pkt.data)
+
+
+def mix() -> list:
+    """Packet ins of a learning switch: mostly tcp and udp, some arp, vlan
+    tagged and ipv6 traffic."""
+    eth = dict(dst="00:00:00:00:00:02", src="00:00:00:00:00:01")
+    udp4 = build(
+        ethernet.ethernet(ethertype=0x0800, **eth),
+        ipv4.ipv4(src="10.0.0.1", dst="10.0.0.2", proto=17),
+        udp.udp(src_port=1234, dst_port=53),
+        PAYLOAD,
+    )
+    arp_req = build(ethernet.ethernet(ethertype=0x0806, **eth), arp.arp())
+    tagged = build(
+        ethernet.ethernet(ethertype=0x8100, **eth),
+        vlan.vlan(vid=10, ethertype=0x0800),
+        ipv4.ipv4(src="10.0.0.1", dst="10.0.0.2", proto=6),
+        tcp.tcp(src_port=1234, dst_port=80),
+        PAYLOAD,
+    )
+    udp6 = build(
+        ethernet.ethernet(ethertype=0x86DD, **eth),
+        ipv6.ipv6(src="fe80::1", dst="fe80::2", nxt=17),
+        udp.udp(src_port=1234, dst_port=53),
+        PAYLOAD,
+    )
+    return [frame(PAYLOAD)] * 5 + [udp4] * 2 + [arp_req, tagged, udp6]
+
+
+def main() -> None:
+    """Decode rate of a packet in mix by decoding depth."""
+    pkts = mix()
+
+    def decode(**kwargs) -> None:
+        for data in pkts:
+            packet.Packet(data, **kwargs)
+
+    n = 2000
+    bench("Packet, all layers", lambda: decode(), n)
+    for depth in (3, 2, 1):
+        bench(f"Packet, max_depth={depth}", lambda: decode(max_depth=depth), n)
+    bench("Packet, stop_at=ethernet", lambda: decode(stop_at=ethernet.ethernet), n)
+    bench("Packet, stop_at=(ipv4, ipv6)",
+          lambda: decode(stop_at=(ipv4.ipv4, ipv6.ipv6)), n)
+
+
+if __name__ == "__main__":
+    main()
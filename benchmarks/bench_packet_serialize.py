@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import Callable
+from fluxory.lib.packet import packet, packet_base
+from fluxory.lib.packet import ethernet, vlan, ipv4, tcp, udp, vxlan
+from benchmarks.utils import bench
+
+MAC = dict(dst="00:00:00:00:00:02", src="00:00:00:00:00:01")
+
+
+def layers(depth: int, payload: bytes) -> list:
+    """Build the protocols of an ethernet frame of depth layers, payload
+    included."""
+    protocols = [ethernet.ethernet(ethertype=0x0800, **MAC)]
+    if depth == 6:
+        protocols += [
+            ipv4.ipv4(src="192.168.0.1", dst="192.168.0.2", proto=17),
+            udp.udp(src_port=4789, dst_port=4789),
+            vxlan.vxlan(vni=7),
+            ethernet.ethernet(ethertype=0x0800, **MAC),
+        ]
+    elif depth > 3:
+        protocols[0].ethertype = 0x8100
+        protocols.append(vlan.vlan(vid=10, ethertype=0x0800))
+        if depth == 5:
+            protocols[0].ethertype = 0x88A8
+            protocols.insert(1, vlan.svlan(vid=20, ethertype=0x8100))
+    if depth == 6:
+        protocols.append(ipv4.ipv4(src="10.0.0.1", dst="10.0.0.2", proto=6))
+    else:
+        protocols += [
+            ipv4.ipv4(src="10.0.0.1", dst="10.0.0.2", proto=6),
+            tcp.tcp(src_port=1234, dst_port=80),
+        ]
+    return protocols + [payload]
+
+
+def serialize_concat(pkt: packet.Packet) -> None:
+    """Packet.serialize as it was, prepending every header to a copy of
+    the bytes after it."""
+    pkt.data = bytearray()
+    r = pkt.protocols[::-1]
+    for i, p in enumerate(r):
+        if isinstance(p, packet_base.PacketBase):
+            prev = None if i == len(r) - 1 else r[i + 1]
+            data = p.serialize(pkt.data, prev)
+        else:
+            data = bytes(p)
+        pkt.data = bytearray(data + pkt.data)
+
+
+def main() -> None:
+    """Serialize rate of fresh 3 to 6 layer frames, building the protocols
+    included."""
+    for size in (64, 1400, 9000, 65000):
+        payload = b"x" * size
+        for depth in (3, 4, 5, 6):
+
+            def build(serialize: Callable) -> bytearray:
+                pkt = packet.Packet(protocols=layers(depth, payload))
+                serialize(pkt)
+                return pkt.data
+
+            assert build(serialize_concat) == build(packet.Packet.serialize)
+            name = f"{depth} layers, {size} bytes payload"
+            bench(f"{name}, concat", lambda: build(serialize_concat), 5000)
+            bench(f"{name}, in place", lambda: build(packet.Packet.serialize), 5000)
+
+
+if __name__ == "__main__":
+    main()
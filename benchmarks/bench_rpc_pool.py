@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""write_dpid calls per second, needs rabbitmq and a connected switch."""
+
+import asyncio
+import time
+from fluxory.app import App
+from fluxory.ofproto import ofproto_v1_5_parser
+from fluxory.rpc import JsonRPC, RequestRawRPC
+
+
+class BenchApp(App):
+    def on_ofp_message(self, message) -> None:
+        with message.process():
+            pass
+
+    def on_t_message(self, message) -> None:
+        with message.process():
+            pass
+
+
+async def main(calls: int = 2000, concurrency: int = 64) -> None:
+    """Compare a JsonRPC per call against the App RPC pool."""
+    app = BenchApp()
+    await app.run()
+    dpid = (await app.list_switches())[0]
+    barrier = ofproto_v1_5_parser.OFPBarrierRequest()
+    barrier.serialize()
+    req = RequestRawRPC(dpid=dpid, payload=[int(f) for f in barrier.buf]).to_dict()
+
+    async def per_call() -> None:
+        channel = await app._broker_connection.channel()
+        rpc = await JsonRPC.create(channel)
+        await rpc.proxy.write_dpid(**req)
+        await channel.close()
+
+    async def pooled() -> None:
+        await app.rpc("write_dpid", **req)
+
+    for name, call in (("JsonRPC per call", per_call), ("App.rpc pool", pooled)):
+        sem = asyncio.Semaphore(concurrency)
+
+        async def bounded() -> None:
+            async with sem:
+                await call()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded() for _ in range(calls)))
+        rate = calls / (time.perf_counter() - start)
+        print(f"{name:<40} {rate:>14,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from fluxory.ofproto import ofproto_v1_5, ofproto_v1_5_parser as parser
+from fluxory.rpc import BinaryRPC, JsonRPC, RequestRawRPC
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    """Compare JSON and binary write_dpid request framing."""
+    actions = [parser.OFPActionOutput(2)]
+    inst = [parser.OFPInstructionActions(ofproto_v1_5.OFPIT_APPLY_ACTIONS, actions)]
+    match = parser.OFPMatch(
+        in_port=1, eth_dst="00:00:00:00:00:02", eth_src="00:00:00:00:00:01"
+    )
+    mod = parser.OFPFlowMod(priority=1001, match=match, instructions=inst)
+    mod.serialize()
+
+    for rpc_class, payload in (
+        (JsonRPC, [int(f) for f in mod.buf]),
+        (BinaryRPC, bytes(mod.buf)),
+    ):
+        # serialize/deserialize don't touch the channel
+        rpc = rpc_class.__new__(rpc_class)
+        req = RequestRawRPC(dpid=1, payload=payload).to_dict()
+        body = rpc.serialize(req)
+        name = rpc_class.__name__
+        print(f"{name:<40} {len(mod.buf)} -> {len(body)} bytes on the wire")
+        bench(f"{name} serialize", lambda: rpc.serialize(req), number=100000)
+        bench(f"{name} deserialize", lambda: rpc.deserialize(body), number=100000)
+
+
+if __name__ == "__main__":
+    main()
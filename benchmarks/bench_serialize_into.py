@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import tracemalloc
+from fluxory.ofproto import ofproto_v1_5, ofproto_v1_5_parser as parser
+from benchmarks.utils import bench
+
+
+def main(count: int = 256) -> None:
+    """Compare serialize() + concatenation against serialize_into()."""
+    actions = [parser.OFPActionOutput(2)]
+    inst = [parser.OFPInstructionActions(ofproto_v1_5.OFPIT_APPLY_ACTIONS, actions)]
+    mods = [
+        parser.OFPFlowMod(
+            priority=i, match=parser.OFPMatch(in_port=i + 1), instructions=inst
+        )
+        for i in range(count)
+    ]
+    arena = bytearray(count * 128)
+
+    def concat() -> bytes:
+        bufs = []
+        for mod in mods:
+            mod.serialize()
+            bufs.append(mod.buf)
+        return b"".join(bufs)
+
+    def into() -> memoryview:
+        offset = 0
+        for mod in mods:
+            offset = mod.serialize_into(arena, offset)
+        return memoryview(arena)[:offset]
+
+    assert bytes(concat()) == bytes(into())
+    for name, func in (
+        (f"serialize() + join x{count}", concat),
+        (f"serialize_into() arena x{count}", into),
+    ):
+        bench(name, func, number=100)
+        tracemalloc.start()
+        func()
+        (_, peak) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{'':<40} {peak:>14,} bytes peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import struct
+import time
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto import ofproto_v1_3 as ofproto
+from fluxory.ofproto import ofproto_v1_3_parser as ofparser
+from benchmarks.utils import bench
+
+SIZES = (1000, 10000, 100000, 1000000)
+# decoding entries one object at a time is only timed up to this size
+MAX_OBJECTS = 100000
+
+
+def flow_stats_entry() -> bytearray:
+    """Build a serialized OFPFlowStats with a match and an instruction."""
+    match = ofparser.OFPMatch(in_port=1, eth_dst="00:00:00:00:00:02")
+    actions = [ofparser.OFPActionOutput(2)]
+    inst = ofparser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)
+    buf = bytearray(ofproto.OFP_FLOW_STATS_0_SIZE)
+    match.serialize(buf, len(buf))
+    inst.serialize(buf, len(buf))
+    struct.pack_into("!H", buf, 0, len(buf))
+    return buf
+
+
+def flow_stats_body(count: int) -> bytes:
+    """Concatenate count flow stats entries, as the bodies of one or more
+    multipart replies."""
+    entry = flow_stats_entry()
+    buf = bytearray(entry * count)
+    st = ofproto.OFP_FLOW_STATS_0_STRUCT
+    for i in range(count):
+        st.pack_into(buf, i * len(entry), len(entry), 0, i, 0, 1000,
+                     0, 0, 0, i, i * 10, i * 1000)
+    return bytes(buf)
+
+
+def flow_stats_reply(count: int) -> bytes:
+    """Build a serialized OFPFlowStatsReply with count entries."""
+    body = flow_stats_body(count)
+    buf = bytearray(ofproto.OFP_MULTIPART_REPLY_SIZE) + body
+    struct.pack_into(ofproto.OFP_HEADER_PACK_STR, buf, 0, ofproto.OFP_VERSION,
+                     ofproto.OFPT_MULTIPART_REPLY, len(buf), 1)
+    struct.pack_into(ofproto.OFP_MULTIPART_REPLY_PACK_STR, buf,
+                     ofproto.OFP_HEADER_SIZE, ofproto.OFPMP_FLOW, 0)
+    return bytes(buf)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Compare object and columnar decoding of flow stats entries."""
+    # a single reply is capped at 64KB, about 700 of these entries
+    reply = flow_stats_reply(600)
+    args = ofproto_parser.header(reply) + (reply,)
+    msg = ofproto_parser.msg(*args)
+    cols = ofproto_parser.msg(*args, columns=True)
+    assert [s.byte_count for s in msg.body] == cols.body["byte_count"].tolist()
+    bench("600 flows reply, objects", lambda: ofproto_parser.msg(*args), 100)
+    bench("600 flows reply, columns",
+          lambda: ofproto_parser.msg(*args, columns=True), 100)
+
+    print(f"{'entries':>10} {'objects':>12} {'columns':>12}")
+    for count in SIZES:
+        body = flow_stats_body(count)
+
+        def objects() -> list:
+            offset = 0
+            entries = []
+            while offset < len(body):
+                entry = ofparser.OFPFlowStats.parser(body, offset)
+                entries.append(entry)
+                offset += entry.length
+            return entries
+
+        def columns() -> ofproto_parser.StatsColumns:
+            return ofproto_parser.StatsColumns.parser(
+                ofparser.OFPFlowStats, body, 0, len(body))
+
+        cols_secs = timed(columns)
+        if count <= MAX_OBJECTS:
+            obj_secs = f"{timed(objects):>11.3f}s"
+        else:
+            obj_secs = f"{'-':>12}"
+        print(f"{count:>10} {obj_secs} {cols_secs:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
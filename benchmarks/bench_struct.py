@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import struct
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto import ofproto_v1_3, ofproto_v1_3_parser
+from fluxory.ofproto import ofproto_v1_5, ofproto_v1_5_parser
+from benchmarks.utils import bench, frame, packet_in
+
+
+def features_reply(ofproto) -> bytes:
+    """Build a serialized OFPSwitchFeatures."""
+    buf = bytearray(ofproto.OFP_SWITCH_FEATURES_SIZE)
+    ofproto.OFP_HEADER_STRUCT.pack_into(
+        buf, 0, ofproto.OFP_VERSION, ofproto.OFPT_FEATURES_REPLY, len(buf), 1
+    )
+    ofproto.OFP_SWITCH_FEATURES_STRUCT.pack_into(
+        buf, ofproto.OFP_HEADER_SIZE, 1, 0, 254, 0, 0x4F, 0
+    )
+    return bytes(buf)
+
+
+def error_msg(ofparser) -> bytes:
+    """Build a serialized OFPErrorMsg."""
+    msg = ofparser.OFPErrorMsg(type_=1, code=2, data=b"x" * 64)
+    msg.serialize()
+    return bytes(msg.buf)
+
+
+def parse(body: bytes) -> object:
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(body)
+    return ofproto_parser.msg(version, msg_type, msg_len, xid, body)
+
+
+def main() -> None:
+    """Compare format strings against precompiled Structs per message type."""
+    fmt = ofproto_v1_3.OFP_PACKET_IN_PACK_STR
+    pin = packet_in(ofproto_v1_3, ofproto_v1_3_parser, frame())
+    bench("struct.unpack_from(format)", lambda: struct.unpack_from(fmt, pin, 8))
+    compiled = ofproto_v1_3.OFP_PACKET_IN_STRUCT
+    bench("Struct.unpack_from", lambda: compiled.unpack_from(pin, 8))
+
+    for (ver, ofproto, ofparser) in (
+        ("1.3", ofproto_v1_3, ofproto_v1_3_parser),
+        ("1.5", ofproto_v1_5, ofproto_v1_5_parser),
+    ):
+        bodies = {
+            "packet_in": packet_in(ofproto, ofparser, frame()),
+            "features_reply": features_reply(ofproto),
+            "error": error_msg(ofparser),
+        }
+        for (msg_name, body) in bodies.items():
+            bench(f"{ver} parse {msg_name}", lambda: parse(body))
+
+
+if __name__ == "__main__":
+    main()
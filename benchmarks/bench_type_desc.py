@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+from fluxory.lib import type_desc
+from benchmarks.utils import bench
+
+# byte_count column of 10k 56 byte records
+RECORDS = 10000
+RECORD_LEN = 56
+FIELD_OFFSET = 40
+
+
+def main() -> None:
+    """Compare per-field and bulk IntDescr decoding."""
+    value = os.urandom(8)
+    bench("Int8.to_user", lambda: type_desc.Int8.to_user(value), 100000)
+    bench("Int8.from_user", lambda: type_desc.Int8.from_user(2 ** 63 + 5), 100000)
+    bench("Int16.to_user", lambda: type_desc.Int16.to_user(value * 2), 100000)
+
+    buf = os.urandom(RECORDS * RECORD_LEN)
+
+    def per_field() -> list:
+        return [
+            type_desc.Int8.to_user(buf[off:off + 8])
+            for off in range(FIELD_OFFSET, len(buf), RECORD_LEN)
+        ]
+
+    def bulk() -> object:
+        return type_desc.Int8.to_user_array(
+            buf, offset=FIELD_OFFSET, stride=RECORD_LEN, count=RECORDS
+        )
+
+    assert per_field() == bulk().tolist()
+    bench(f"{RECORDS} fields, per-field to_user", per_field, 100)
+    bench(f"{RECORDS} fields, to_user_array", bulk, 100)
+
+
+if __name__ == "__main__":
+    main()
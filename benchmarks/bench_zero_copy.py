@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Copies of the received body made while parsing a packet in."""
+
+import tracemalloc
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto import ofproto_v1_5 as ofproto
+from fluxory.ofproto import ofproto_v1_5_parser as ofparser
+from benchmarks.utils import bench, frame, packet_in
+
+# a jumbo frame makes copies of the body stand out of other allocations
+PAYLOAD = 9000
+
+
+def parse(body) -> object:
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(body)
+    msg = ofproto_parser.msg(version, msg_type, msg_len, xid, body)
+    return msg.data
+
+
+def copies(body) -> tuple:
+    """Count and size the allocations of at least PAYLOAD bytes that are
+    still alive after parsing, and the peak of allocated memory while
+    parsing."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    (start, _) = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    data = parse(body)
+    (_, peak) = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "traceback")
+    large = [s for s in stats if s.size_diff >= PAYLOAD]
+    assert len(data) >= PAYLOAD
+    return (sum(s.count_diff for s in large), sum(s.size_diff for s in large),
+            peak - start)
+
+
+def main() -> None:
+    """Compare parsing a slice of the body with parsing a memoryview."""
+    body = packet_in(ofproto, ofparser, frame(b"x" * PAYLOAD))
+    msg_len = len(body)
+    inputs = {
+        "bytes slice": lambda: body[:msg_len],
+        "memoryview": lambda: memoryview(body)[:msg_len],
+    }
+    for (name, get_body) in inputs.items():
+        (count, size, peak) = copies(get_body())
+        print(f"{name:<24} {count:>3} copies kept {size:>8,} bytes, "
+              f"peak {peak:>8,} bytes")
+    for (name, get_body) in inputs.items():
+        bench(f"parse {name}", lambda: parse(get_body()), 10000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import struct
+import timeit
+from typing import Callable
+from fluxory.lib.packet import packet, ethernet, ipv4, tcp
+
+
+def frame(payload: bytes = b"x" * 64) -> bytes:
+    """Build an ethernet/ipv4/tcp frame."""
+    pkt = packet.Packet()
+    pkt.add_protocol(
+        ethernet.ethernet(
+            dst="00:00:00:00:00:02", src="00:00:00:00:00:01", ethertype=0x0800
+        )
+    )
+    pkt.add_protocol(ipv4.ipv4(src="10.0.0.1", dst="10.0.0.2", proto=6))
+    pkt.add_protocol(tcp.tcp(src_port=1234, dst_port=80))
+    pkt.add_protocol(payload)
+    pkt.serialize()
+    return bytes(pkt.data)
+
+
+def packet_in(ofproto, ofparser, data: bytes, xid: int = 1) -> bytes:
+    """Build a serialized OFPPacketIn as a switch would send it."""
+    match = ofparser.OFPMatch(in_port=3, eth_src="00:00:00:00:00:01")
+    buf = bytearray(ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE)
+    match.serialize(buf, len(buf))
+    buf += b"\x00\x00" + data
+    struct.pack_into(
+        ofproto.OFP_PACKET_IN_PACK_STR,
+        buf,
+        ofproto.OFP_HEADER_SIZE,
+        ofproto.OFP_NO_BUFFER,
+        len(data),
+        0,
+        0,
+        0,
+    )
+    struct.pack_into(
+        ofproto.OFP_HEADER_PACK_STR,
+        buf,
+        0,
+        ofproto.OFP_VERSION,
+        ofproto.OFPT_PACKET_IN,
+        len(buf),
+        xid,
+    )
+    return bytes(buf)
+
+
+def bench(name: str, func: Callable, number: int = 10000) -> float:
+    """Run func number times and print the rate per second."""
+    secs = min(timeit.repeat(func, number=number, repeat=3))
+    rate = number / secs
+    print(f"{name:<40} {rate:>14,.0f} ops/s")
+    return rate
@@ -12,7 +12,7 @@ import logging
 import asyncio
 from logging.config import fileConfig
 from aio_pika import IncomingMessage
-from fluxory.rpc import JsonRPC, RequestRawRPC
+from fluxory.rpc import RequestRawRPC
 from fluxory.app import App
 import os
 
@@ -33,6 +33,25 @@ class SimpleSwitch(App):
         self.version = 6
         (self.ofproto, self.ofparser) = ofproto_protocol._versions[self.version]
         self.mac_to_port = {}
+        self.flood = self._flood_template()
+
+    def _flood_template(self) -> ofproto_parser.MsgTemplate:
+        """Pre-serialized flood packet out, in_port is patched per packet."""
+        actions = [self.ofparser.OFPActionOutput(self.ofproto.OFPP_FLOOD)]
+        if self.ofproto.OFP_VERSION == 0x4:
+            out = ofproto_v1_3_parser.OFPPacketOut(
+                buffer_id=self.ofproto.OFP_NO_BUFFER,
+                in_port=self.ofproto.OFPP_CONTROLLER,
+                actions=actions,
+            )
+        else:
+            out = ofproto_v1_5_parser.OFPPacketOut(
+                buffer_id=self.ofproto.OFP_NO_BUFFER,
+                match=self.ofparser.OFPMatch(in_port=self.ofproto.OFPP_CONTROLLER),
+                actions=actions,
+                data=b"",
+            )
+        return self.ofparser.OFPPacketOutTemplate(out)
 
     def on_ofp_message(self, message: IncomingMessage) -> None:
         """Message broker incoming messages callback."""
@@ -42,9 +61,9 @@ class SimpleSwitch(App):
             log.debug(
                 f"msg {version} {msg_type} {msg_len} {xid} {len(message.body)} {type(message.body)}"
             )
-            msg = ofproto_parser.msg(
-                version, msg_type, msg_len, xid, message.body[:msg_len]
-            )
+            # a view of the body, parsed fields refer to it instead of copies
+            body = memoryview(message.body)[:msg_len]
+            msg = ofproto_parser.msg(version, msg_type, msg_len, xid, body)
             if msg_type == self.ofproto.OFPT_PACKET_IN:
                 pkt_in = self.ofparser.OFPPacketIn.parser(msg_len, xid, msg.buf)
                 pkt_in.serialize()
@@ -58,9 +77,6 @@ class SimpleSwitch(App):
 
     async def send_flow_mod_rpc(self, dpid: int, match, port: int, err: bool = False):
         """Send a flow mod."""
-        channel = await self._broker_connection.channel()
-        rpc = await JsonRPC.create(channel)
-
         actions = [self.ofparser.OFPActionOutput(port, self.ofproto.OFPCML_NO_BUFFER)]
         inst = [
             self.ofparser.OFPInstructionActions(
@@ -71,17 +87,18 @@ class SimpleSwitch(App):
             match = self.ofparser.OFPMatch(ipv6_src="::1")
         mod = self.ofparser.OFPFlowMod(priority=1001, match=match, instructions=inst)
         mod.serialize()
-        ints = [int(f) for f in mod.buf]
-        t = await rpc.proxy.write_dpid(
-            **RequestRawRPC(dpid=dpid, payload=ints).to_dict()
+        t = await self.rpc(
+            "write_dpid", **RequestRawRPC(dpid=dpid, payload=mod.buf).to_dict()
         )
-        log.debug(f"rpc flow mod {(t)}")
+        log.debug(f"rpc flow mod {t.to_dict()}")
 
     async def handle_pktin(
         self, pkt_in: ofproto_v1_5_parser.OFPPacketIn, dpid: int
     ) -> None:
         """Handle packet in."""
-        pkt = packet.Packet(pkt_in.data)
+        # addresses as ints, mac_to_port lookups skip text formatting, and
+        # only the ethernet header is read so the rest is left undecoded
+        pkt = packet.Packet(pkt_in.data, int_addrs=True, stop_at=ethernet.ethernet)
         eth = pkt.get_protocols(ethernet.ethernet)[0]
 
         # only ipv4 untagged packets are supported for now
@@ -106,34 +123,13 @@ class SimpleSwitch(App):
             out_port = self.ofproto.OFPP_FLOOD
 
         log.debug(f"mac_to_port {self.mac_to_port}")
-        actions = [self.ofparser.OFPActionOutput(out_port)]
         if out_port != self.ofproto.OFPP_FLOOD:
             match = self.ofparser.OFPMatch(in_port=in_port, eth_dst=dst, eth_src=src)
             await self.send_flow_mod_rpc(dpid, match, out_port)
         else:
-            match = self.ofparser.OFPMatch(in_port=in_port)
-            out: self.ofparser.OFPPacketOut = None
-            if self.ofproto.OFP_VERSION == 0x4:
-                out = ofproto_v1_3_parser.OFPPacketOut(
-                    buffer_id=pkt_in.buffer_id,
-                    in_port=match["in_port"],
-                    actions=actions,
-                    data=pkt_in.data,
-                )
-            elif self.ofproto.OFP_VERSION == 0x6:
-                out = ofproto_v1_5_parser.OFPPacketOut(
-                    buffer_id=pkt_in.buffer_id,
-                    match=match,
-                    actions=actions,
-                    data=pkt_in.data,
-                )
-            channel = await self._broker_connection.channel()
-            rpc = await JsonRPC.create(channel)
-            out.serialize()
-            res = await rpc.proxy.write_dpid(
-                dpid=dpid, payload=[int(f) for f in out.buf]
-            )
-            log.debug(f"res {res}")
+            payload = self.flood.serialize(pkt_in.data, in_port=in_port)
+            res = await self.rpc("write_dpid", dpid=dpid, payload=payload)
+            log.debug(f"res {res.to_dict()}")
 
 
 async def main() -> None:
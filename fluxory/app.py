@@ -2,17 +2,26 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
+import random
+from functools import partial
 from logging import getLogger
-from aio_pika import Message, DeliveryMode, ExchangeType, IncomingMessage
+from aio_pika import Message, DeliveryMode, ExchangeType, IncomingMessage, Queue
 from fluxory.broker_interface import BrokerInterface
 from abc import abstractmethod
-from typing import Dict
-from collections import defaultdict
-from fluxory.queue_events import CtlOFPEvent, CtlTEvent
+from collections import defaultdict, OrderedDict
+from fluxory.queue_events import AppOFPEvent, CtlOFPEvent, CtlTEvent
+from fluxory.ofproto import ofproto_parser, ofproto_protocol
 from fluxory.ofproto.ofproto_parser import MsgBase
-from fluxory.exceptions import FluxoryAppError
+from fluxory.exceptions import FluxoryAppError, FluxoryOFPError
+from fluxory.multipart import MultipartStream
 from fluxory.rpc import JsonRPC, ResponseRPC
-from typing import List
+from fluxory.sharding import HashRing
+from typing import Dict, List, Set, Tuple, Type
+
+# Request types whose replies the controller publishes back to the Apps,
+# see ExpectedType in pkg/ofp/ofp_consts.go: echo, features, get config,
+# multipart, barrier, queue get config, role and get async requests.
+_REPLY_MSG_TYPES = frozenset((2, 5, 7, 18, 20, 22, 24, 26))
 
 
 class App(BrokerInterface):
@@ -21,13 +30,65 @@ class App(BrokerInterface):
 
     apps: Dict[str, str] = defaultdict(str)
 
-    def __init__(self, name: str = "") -> None:
-        """Constructor of App."""
+    def __init__(
+        self,
+        name: str = "",
+        ofp_batch_size: int = 1,
+        ofp_batch_latency: float = 0.01,
+        rpc_pool_size: int = 4,
+        rpc_class: Type[JsonRPC] = JsonRPC,
+        reply_timeout: float = 10.0,
+    ) -> None:
+        """Constructor of App.
+
+        If ofp_batch_size is greater than one, OpenFlow events are delivered
+        to on_ofp_messages in lists of up to ofp_batch_size messages, waiting
+        at most ofp_batch_latency seconds for a batch to fill up, so
+        on_ofp_messages must be overridden.
+
+        RPCs are spread over rpc_pool_size long-lived rpc_class instances,
+        each one on its own channel. BinaryRPC can be used as rpc_class to
+        send write_dpid payloads as raw bytes instead of JSON.
+
+        The futures of send_msg are dropped once reply_timeout seconds
+        have passed without them being resolved. Each segment of a
+        multipart reply re-arms reply_timeout, so long streams aren't cut.
+        """
         super().__init__()
         self.name = name or self.__class__.__name__
         self._ensure_unique_name()
         self.log = getLogger(self.name)
         self.loop = asyncio.get_event_loop()
+        if ofp_batch_size < 1:
+            raise FluxoryAppError(f"Invalid ofp_batch_size {ofp_batch_size}")
+        if ofp_batch_size > 1 and type(self).on_ofp_messages is App.on_ofp_messages:
+            raise FluxoryAppError(
+                f"{self.name} must override on_ofp_messages to use ofp_batch_size"
+            )
+        self.ofp_batch_size = ofp_batch_size
+        self.ofp_batch_latency = ofp_batch_latency
+        self._ofp_batch: List[IncomingMessage] = []
+        self._ofp_batch_timer: asyncio.TimerHandle = None
+        if rpc_pool_size < 1:
+            raise FluxoryAppError(f"Invalid rpc_pool_size {rpc_pool_size}")
+        self.rpc_pool_size = rpc_pool_size
+        self.rpc_class = rpc_class
+        if reply_timeout <= 0:
+            raise FluxoryAppError(f"Invalid reply_timeout {reply_timeout}")
+        self.reply_timeout = reply_timeout
+        self._rpc_pool: List[JsonRPC] = []
+        self._rpc_next = 0
+        self.worker_id = 0
+        self.workers = 1
+        self.shard_refresh = 5.0
+        self._ofp_queue: Queue = None
+        self._shard_ring: HashRing = None
+        self._shard_dpids: Set[int] = set()
+        self._xid = random.randint(1, 0xFFFFFFFF)
+        self._pending_xids: Dict[int, Dict[int, asyncio.Future]] = {}
+        self._xid_segments: Dict[Tuple[int, int], List[MsgBase]] = {}
+        self._xid_streams: Dict[Tuple[int, int], MultipartStream] = {}
+        self._xid_deadlines: Dict[Tuple[int, int], float] = {}
         self.log.info(f"{self.name} just started")
 
     def __repr__(self) -> str:
@@ -39,41 +100,361 @@ class App(BrokerInterface):
             raise FluxoryAppError(f"This Apps's name {self.name} is not unique")
         App.apps[self.name] = self.name
 
+    def set_shard(self, worker_id: int, workers: int) -> None:
+        """Restrict this App to the dpids of one worker out of workers.
+
+        The dpids are assigned to workers with a consistent hash ring, so
+        each dpid is handled by exactly one worker. It must be called
+        before run().
+        """
+        if not 0 <= worker_id < workers:
+            raise FluxoryAppError(f"Invalid worker {worker_id} of {workers}")
+        self.worker_id = worker_id
+        self.workers = workers
+        self._shard_ring = HashRing(range(workers))
+
+    @property
+    def is_sharded(self) -> bool:
+        """Check if this App only handles a subset of dpids."""
+        return self.workers > 1
+
+    def owns_dpid(self, dpid: int) -> bool:
+        """Check if a dpid belongs to this App's shard."""
+        if not self.is_sharded:
+            return True
+        return self._shard_ring.get(dpid) == self.worker_id
+
     async def connect(self) -> None:
         """Connect to message broker."""
         await self.broker_con()
+        await self._create_rpc_pool()
+        on_ofp_message = self._on_ofp_message
+        if self.ofp_batch_size > 1:
+            on_ofp_message = self._on_ofp_batch_message
         for routing_key, func in zip(
             [CtlOFPEvent.queue_wildcard(), CtlTEvent.queue_wildcard()],
-            [self.on_ofp_message, self.on_t_message],
+            [on_ofp_message, self._on_t_message],
         ):
             channel = await self._broker_connection.channel()
-            queue = await channel.declare_queue(
-                self.name + routing_key.split(CtlOFPEvent._separator)[0], durable=True
-            )
-            self.log.info(f"{self} subscribing to {routing_key}")
-            await queue.bind(self._broker_exchange, routing_key=routing_key)
+            if func == self._on_ofp_batch_message:
+                await channel.set_qos(prefetch_count=self.ofp_batch_size)
+            queue_name = self.name + routing_key.split(CtlOFPEvent._separator)[0]
+            if self.is_sharded:
+                queue_name += f"{CtlOFPEvent._separator}{self.worker_id}"
+            queue = await channel.declare_queue(queue_name, durable=True)
+            if self.is_sharded and routing_key == CtlOFPEvent.queue_wildcard():
+                self._ofp_queue = queue
+            else:
+                self.log.info(f"{self} subscribing to {routing_key}")
+                await queue.bind(self._broker_exchange, routing_key=routing_key)
             await queue.consume(func)
+        if self.is_sharded:
+            await self._bind_shard()
+            self.loop.create_task(self._refresh_shard())
+
+    async def _bind_shard(self) -> None:
+        """Bind the OpenFlow events queue to the dpids of this shard."""
+        for dpid in await self.list_switches():
+            await self._bind_dpid(dpid)
+
+    async def _bind_dpid(self, dpid: int) -> None:
+        """Bind the OpenFlow events queue to a dpid if it's in this shard."""
+        if dpid in self._shard_dpids or not self.owns_dpid(dpid):
+            return
+        self._shard_dpids.add(dpid)
+        routing_key = CtlOFPEvent.dpid_wildcard(dpid)
+        self.log.info(f"{self} subscribing to {routing_key}")
+        try:
+            await self._ofp_queue.bind(self._broker_exchange, routing_key=routing_key)
+        except Exception:
+            self._shard_dpids.discard(dpid)
+            self.log.exception(f"{self} failed to subscribe to {routing_key}")
+
+    async def _refresh_shard(self) -> None:
+        """Periodically bind the dpids of switches that connected while no
+        SwitchConnected event could be received, such as before this App
+        started."""
+        while not self.broker_is_closed:
+            await asyncio.sleep(self.shard_refresh)
+            try:
+                await self._bind_shard()
+            except Exception:
+                self.log.exception(f"{self} failed to refresh its dpids")
 
     async def run(self) -> None:
-        """App Entry point."""
+        """App Entry point, it raises if the broker connection fails."""
         connect_coro = self.loop.create_task(self.connect())
         await asyncio.wait({connect_coro})
+        connect_coro.result()
+
+    async def _create_rpc_pool(self) -> None:
+        """Create the long-lived RPC instances, one per channel."""
+        self._rpc_pool = []
+        for _ in range(self.rpc_pool_size):
+            channel = await self._broker_connection.channel()
+            self._rpc_pool.append(await self.rpc_class.create(channel))
+
+    async def rpc(self, method: str, **kwargs) -> ResponseRPC:
+        """Call a controller RPC method on the next pooled RPC instance."""
+        if not self._rpc_pool:
+            raise FluxoryAppError(f"{self} isn't connected to the message broker")
+        rpc = self._rpc_pool[self._rpc_next]
+        self._rpc_next = (self._rpc_next + 1) % len(self._rpc_pool)
+        return ResponseRPC.from_dict(await rpc.call(method, kwargs=kwargs))
 
     async def list_switches(self) -> List[int]:
-        """docstring for ."""
+        """List the dpids of the switches connected to the controller."""
         # TODO handle when the broker isn't available.
-        channel = await self._broker_connection.channel()
-        rpc = await JsonRPC.create(channel)
-        t = await rpc.proxy.list_switches()
-        resp = ResponseRPC.from_dict(t)
+        resp = await self.rpc("list_switches")
         # TODO raise if there's an error
         return resp.result["dpids"]
 
+    def _next_xid(self) -> int:
+        """Get the next xid of the messages sent by this App."""
+        self._xid = self._xid % 0xFFFFFFFF + 1
+        return self._xid
+
+    def send_msg(self, dpid: int, msg: MsgBase) -> asyncio.Future:
+        """Publish an OpenFlow message to a switch as an AppOFPEvent.
+
+        It doesn't wait for the switch, so messages can be pipelined. The
+        returned future is keyed by the message xid, which is assigned if
+        it isn't set.
+
+        Only echo, features, get config, multipart, barrier, queue get
+        config, role and get async requests have their replies forwarded
+        by the controller. Their futures resolve with the reply, or with
+        the list of segments of a multipart reply, and raise
+        asyncio.TimeoutError if no reply arrives within reply_timeout.
+        Every other message, such as flow mods and packet outs, resolves
+        with None once a later barrier reply arrives, or once
+        reply_timeout passes without an error. Send a barrier after them
+        to know they were processed. An OFPT_ERROR reply raises
+        FluxoryOFPError.
+        """
+        return self.send_msgs(dpid, [msg])[0]
+
+    def send_msgs(self, dpid: int, msgs: List[MsgBase]) -> List[asyncio.Future]:
+        """Publish OpenFlow messages concatenated in a single AppOFPEvent.
+
+        Returns one future per message, see send_msg.
+        """
+        futures = []
+        sent = []
+        pending = self._pending_xids.setdefault(dpid, OrderedDict())
+        for msg in msgs:
+            if msg.xid is None:
+                msg.set_xid(self._next_xid())
+            future = self.loop.create_future()
+            pending[msg.xid] = future
+            futures.append(future)
+            sent.append((msg.xid, future, msg.msg_type in _REPLY_MSG_TYPES))
+        self.loop.call_later(self.reply_timeout, self._expire_xids, dpid, sent)
+        event = AppOFPEvent.from_msgs(dpid, msgs)
+        publish = self.loop.create_task(
+            self._broker_exchange.publish(
+                Message(bytes(event.payload)), routing_key=event.name
+            )
+        )
+        publish.add_done_callback(partial(self._on_published, futures))
+        return futures
+
+    def send_multipart(self, dpid: int, msg: MsgBase) -> MultipartStream:
+        """Publish a multipart request and stream its reply.
+
+        Instead of resolving with the list of segments once the last one
+        arrives, the segments are fed to the returned MultipartStream as
+        they're received. An OFPT_ERROR reply or a failed publish is raised
+        when iterating the stream.
+        """
+        future = self.send_msg(dpid, msg)
+        stream = MultipartStream(dpid, msg.xid)
+        self._xid_streams[(dpid, msg.xid)] = stream
+        future.add_done_callback(partial(self._on_multipart_done, stream))
+        return stream
+
+    def _on_multipart_done(
+        self, stream: MultipartStream, future: asyncio.Future
+    ) -> None:
+        """Close the stream of a multipart request once it's resolved."""
+        self._xid_streams.pop((stream.dpid, stream.xid), None)
+        if future.cancelled():
+            stream.close(asyncio.CancelledError())
+        else:
+            stream.close(future.exception())
+
+    def _on_published(
+        self, futures: List[asyncio.Future], publish: asyncio.Task
+    ) -> None:
+        """Fail the futures of messages that couldn't be published."""
+        if publish.cancelled() or not publish.exception():
+            return
+        for future in futures:
+            if not future.done():
+                future.set_exception(publish.exception())
+
+    def _expire_xids(
+        self, dpid: int, sent: List[Tuple[int, asyncio.Future, bool]]
+    ) -> None:
+        """Drop the futures of sent messages still pending after reply_timeout.
+
+        Requests raise asyncio.TimeoutError, while messages without a reply
+        resolve with None since no error arrived for them. Multipart
+        requests that received a segment within reply_timeout are checked
+        again reply_timeout after that segment.
+        """
+        pending = self._pending_xids.get(dpid)
+        if not pending:
+            return
+        now = self.loop.time()
+        for (xid, future, has_reply) in sent:
+            if pending.get(xid) is not future:
+                continue
+            deadline = self._xid_deadlines.get((dpid, xid), now)
+            if deadline > now:
+                self.loop.call_later(
+                    deadline - now,
+                    self._expire_xids,
+                    dpid,
+                    [(xid, future, has_reply)],
+                )
+                continue
+            del pending[xid]
+            self._xid_segments.pop((dpid, xid), None)
+            self._xid_deadlines.pop((dpid, xid), None)
+            if future.done():
+                continue
+            if has_reply:
+                future.set_exception(
+                    asyncio.TimeoutError(
+                        f"No reply to xid {xid} of dpid {dpid} "
+                        f"after {self.reply_timeout}s"
+                    )
+                )
+            else:
+                future.set_result(None)
+        if not pending:
+            del self._pending_xids[dpid]
+
+    def _handle_reply(self, message: IncomingMessage) -> None:
+        """Resolve the future of the message that an event replies to.
+
+        The controller publishes the replies to App requests as
+        CtlOFPEvents, so every App receives them, not only the sender.
+        Only the header of events of dpids with pending xids is parsed,
+        and an event is fully parsed only if its xid is pending here.
+        """
+        dpid = int(message.routing_key.rsplit(CtlOFPEvent._separator, 1)[-1])
+        pending = self._pending_xids.get(dpid)
+        if not pending:
+            return
+        (version, msg_type, msg_len, xid) = ofproto_parser.header(message.body)
+        future = pending.get(xid)
+        if future is None:
+            return
+        (ofproto, _) = ofproto_protocol._versions[version]
+        reply = ofproto_parser.msg(
+            version, msg_type, msg_len, xid, message.body, lazy=True
+        )
+        result = reply
+        if msg_type == ofproto.OFPT_MULTIPART_REPLY:
+            result = self._xid_streams.get((dpid, xid))
+            if result is not None:
+                result.feed(reply)
+            else:
+                result = self._xid_segments.setdefault((dpid, xid), [])
+                result.append(reply)
+            if reply.flags & ofproto.OFPMPF_REPLY_MORE:
+                self._xid_deadlines[(dpid, xid)] = (
+                    self.loop.time() + self.reply_timeout
+                )
+                return
+            self._xid_segments.pop((dpid, xid), None)
+            self._xid_deadlines.pop((dpid, xid), None)
+        if msg_type == ofproto.OFPT_BARRIER_REPLY:
+            # Messages sent before the barrier without a reply succeeded.
+            for (prev_xid, prev) in list(pending.items()):
+                if prev_xid == xid:
+                    break
+                del pending[prev_xid]
+                if not prev.done():
+                    prev.set_result(None)
+        del pending[xid]
+        if not pending:
+            del self._pending_xids[dpid]
+        if future.done():
+            return
+        if msg_type == ofproto.OFPT_ERROR:
+            future.set_exception(
+                FluxoryOFPError(
+                    f"OFPT_ERROR type {reply.type} code {reply.code} xid {xid}",
+                    reply,
+                )
+            )
+        else:
+            future.set_result(result)
+
+    def _on_ofp_message(self, message: IncomingMessage) -> None:
+        """Resolve pending replies and dispatch to on_ofp_message."""
+        if self._pending_xids:
+            self._handle_reply(message)
+        self.on_ofp_message(message)
+
+    def _on_ofp_batch_message(self, message: IncomingMessage) -> None:
+        """Accumulate OpenFlow events until a batch is complete."""
+        if self._pending_xids:
+            self._handle_reply(message)
+        self._ofp_batch.append(message)
+        if len(self._ofp_batch) >= self.ofp_batch_size:
+            self._flush_ofp_batch()
+        elif not self._ofp_batch_timer:
+            self._ofp_batch_timer = self.loop.call_later(
+                self.ofp_batch_latency, self._flush_ofp_batch
+            )
+
+    def _flush_ofp_batch(self) -> None:
+        """Dispatch the pending batch and ack it with a single multiple ack."""
+        if self._ofp_batch_timer:
+            self._ofp_batch_timer.cancel()
+            self._ofp_batch_timer = None
+        if not self._ofp_batch:
+            return
+        batch, self._ofp_batch = self._ofp_batch, []
+        try:
+            self.on_ofp_messages(batch)
+        except Exception:
+            self.log.exception(f"{self} failed to process {len(batch)} messages")
+            batch[-1].nack(multiple=True, requeue=False)
+        else:
+            batch[-1].ack(multiple=True)
+
+    def on_ofp_messages(self, messages: List[IncomingMessage]) -> None:
+        """Message broker incoming messages batch callback.
+
+        Only used when ofp_batch_size is greater than one, in which case
+        it must be overridden. The messages must not be acked individually,
+        the whole batch is acked once this callback returns.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def on_ofp_message(self, message: IncomingMessage) -> None:
         """Message broker incoming messages callback."""
         pass
 
+    def _on_t_message(self, message: IncomingMessage) -> None:
+        """Bind the dpids of connected switches and dispatch to on_t_message.
+
+        A sharded App binds a switch's OpenFlow events as soon as its
+        SwitchConnected event arrives. Events the controller publishes
+        before that bind completes aren't delivered to the shard.
+        """
+        if self.is_sharded:
+            dpid = CtlTEvent.switch_connected_dpid(message.routing_key)
+            if dpid is not None:
+                self.loop.create_task(self._bind_dpid(dpid))
+        self.on_t_message(message)
+
     @abstractmethod
     def on_t_message(self, message: IncomingMessage) -> None:
         """Message broker incoming messages callback."""
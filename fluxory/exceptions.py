@@ -22,6 +22,16 @@ class FluxoryAppError(FluxoryError):
         super().__init__(msg)
 
 
+class FluxoryOFPError(FluxoryError):
+
+    """An OFPT_ERROR reply to a message sent by an App. """
+
+    def __init__(self, msg: str, ofp_msg: object = None) -> None:
+        """Constructor of FluxoryOFPError."""
+        super().__init__(msg)
+        self.ofp_msg = ofp_msg
+
+
 class RyuException(Exception):
     message = 'An unknown exception'
 
@@ -59,6 +69,24 @@ class OFPTruncatedMessage(RyuException):
         super(OFPTruncatedMessage, self).__init__(msg, **kwargs)
 
 
+class OFPParseError(RyuException):
+    message = ('error parsing version %(version)s msg_type %(msg_type)s '
+               'msg_len %(msg_len)s xid %(xid)s: %(orig_ex)s')
+
+    def __init__(self, version, msg_type, msg_len, xid, buf,
+                 original_exception, msg=None, **kwargs):
+        self.version = version
+        self.msg_type = msg_type
+        self.msg_len = msg_len
+        self.xid = xid
+        self.buf = buf
+        self.original_exception = original_exception
+        kwargs.update(version=version, msg_type=msg_type, msg_len=msg_len,
+                      xid=xid, orig_ex=repr(original_exception))
+
+        super(OFPParseError, self).__init__(msg, **kwargs)
+
+
 class OFPInvalidActionString(RyuException):
     message = 'unable to parse: %(action_str)s'
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+from typing import Callable, List
+from fluxory.app import App
+from fluxory.exceptions import FluxoryAppError
+from fluxory.ofproto import ofproto_protocol
+from fluxory.ofproto.ofproto_parser import MsgBase
+
+
+class FlowBatchWindow(object):
+
+    """Completion report of a window of a FlowBatch. """
+
+    def __init__(self, index: int, mods: List[MsgBase]) -> None:
+        """Constructor of FlowBatchWindow."""
+        self.index = index
+        self.mods = mods
+        self.errors: List[Exception] = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Check if every flow mod of this window was installed."""
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(index={self.index}, "
+            f"mods={len(self.mods)}, errors={len(self.errors)})"
+        )
+
+
+class FlowBatch(object):
+
+    """Bulk flow installation on a switch.
+
+    Flow mods are sent in windows of up to window messages. Each window is
+    concatenated in a single AppOFPEvent and closed by an OFPBarrierRequest,
+    whose reply completes the window. On OpenFlow 1.5, bundle=True wraps
+    each window in an OFPBundleCtrlMsg open/commit pair with the flow mods
+    as OFPBundleAddMsgs, so each window is applied atomically. Up to
+    in_flight windows are sent before waiting on the oldest one.
+    """
+
+    def __init__(
+        self,
+        app: App,
+        dpid: int,
+        version: int,
+        window: int = 256,
+        in_flight: int = 2,
+        bundle: bool = False,
+    ) -> None:
+        """Constructor of FlowBatch."""
+        (self.ofproto, self.ofparser) = ofproto_protocol.get(version)
+        if bundle and not hasattr(self.ofparser, "OFPBundleAddMsg"):
+            raise FluxoryAppError(f"OFP version {version} doesn't support bundles")
+        if window < 1 or in_flight < 1:
+            raise FluxoryAppError(f"Invalid window {window} or in_flight {in_flight}")
+        self.app = app
+        self.dpid = dpid
+        self.version = version
+        self.window = window
+        self.in_flight = in_flight
+        self.bundle = bundle
+        self.mods: List[MsgBase] = []
+        self._bundle_id = 0
+
+    def __len__(self) -> int:
+        return len(self.mods)
+
+    def add(self, mod: MsgBase) -> None:
+        """Add a flow mod to the batch."""
+        self.mods.append(mod)
+
+    def _window_msgs(self, mods: List[MsgBase]) -> List[MsgBase]:
+        """Build the messages of a window, closed by a barrier."""
+        if not self.bundle:
+            return mods + [self.ofparser.OFPBarrierRequest()]
+        self._bundle_id += 1
+        flags = self.ofproto.OFPBF_ATOMIC
+        msgs = [
+            self.ofparser.OFPBundleCtrlMsg(
+                self._bundle_id, self.ofproto.OFPBCT_OPEN_REQUEST, flags, []
+            )
+        ]
+        msgs.extend(
+            self.ofparser.OFPBundleAddMsg(self._bundle_id, flags, mod, [])
+            for mod in mods
+        )
+        msgs.append(
+            self.ofparser.OFPBundleCtrlMsg(
+                self._bundle_id, self.ofproto.OFPBCT_COMMIT_REQUEST, flags, []
+            )
+        )
+        msgs.append(self.ofparser.OFPBarrierRequest())
+        return msgs
+
+    async def _complete(
+        self, report: FlowBatchWindow, futures: List[asyncio.Future], start: float
+    ) -> FlowBatchWindow:
+        """Wait for the futures of a window and collect its errors."""
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        report.errors = [r for r in results if isinstance(r, Exception)]
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    async def commit(
+        self, on_window: Callable[[FlowBatchWindow], None] = None
+    ) -> List[FlowBatchWindow]:
+        """Send every flow mod added so far, window by window.
+
+        on_window is called with each FlowBatchWindow as it completes.
+        """
+        mods, self.mods = self.mods, []
+        reports: List[FlowBatchWindow] = []
+        pending: List[asyncio.Task] = []
+        for index, i in enumerate(range(0, len(mods), self.window)):
+            if len(pending) >= self.in_flight:
+                reports.append(await pending.pop(0))
+                if on_window:
+                    on_window(reports[-1])
+            window = mods[i:i + self.window]
+            futures = self.app.send_msgs(self.dpid, self._window_msgs(window))
+            report = FlowBatchWindow(index, window)
+            pending.append(
+                asyncio.ensure_future(
+                    self._complete(report, futures, time.perf_counter())
+                )
+            )
+        for task in pending:
+            reports.append(await task)
+            if on_window:
+                on_window(reports[-1])
+        return reports
@@ -14,42 +14,149 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import netaddr
+import binascii
+import functools
+import importlib
+import socket
+
+# number of text_to_bin results kept per converter
+CACHE_SIZE = 1024
 
 
 class AddressConverter(object):
-    def __init__(self, addr, strat, fallback=None, **kwargs):
+    """
+    Text/binary converter of an address family.
+
+    to_bin and to_text are the stdlib fast paths. Text they can't convert
+    is handed to netaddr, imported on first use, and strings with a
+    netmask or prefix length go through the fallback class (IPNetwork) to
+    return a (address, netmask) pair. text_to_bin results are kept in a
+    bounded LRU cache.
+    """
+
+    def __init__(self, addr, strat, fallback=None, to_bin=None,
+                 to_text=None, cache_size=CACHE_SIZE, int_type=None,
+                 **kwargs):
+        # addr, strat and fallback are netaddr attribute names
+        self.int_type = int_type
         self._addr = addr
         self._strat = strat
         self._fallback = fallback
+        self._to_bin = to_bin
+        self._to_text = to_text
         self._addr_kwargs = kwargs
+        self._cached_text_to_bin = functools.lru_cache(
+            maxsize=cache_size)(self._text_to_bin)
+        if int_type is not None:
+            # bin_to_int is on the packet parsing hot path, so it's a single
+            # from_bytes call with no length check: callers unpack addresses
+            # with fixed size struct formats.
+            def bin_to_int(bin, from_bytes=int_type.from_bytes):
+                """Convert bin to an int_type address, which prints as text."""
+                return from_bytes(bin, 'big')
+            self.bin_to_int = bin_to_int
 
-    def text_to_bin(self, text):
+    def _netaddr(self, name):
+        netaddr = importlib.import_module('netaddr')
+        return functools.reduce(getattr, name.split('.'), netaddr)
+
+    def _text_to_bin(self, text):
+        if self.int_type is not None and isinstance(text, int):
+            return text.to_bytes(self.int_type.size, 'big')
+        if self._to_bin is not None and isinstance(text, str):
+            try:
+                return self._to_bin(text)
+            except (ValueError, OSError):
+                pass
         try:
-            return self._addr(text, **self._addr_kwargs).packed
+            return self._netaddr(self._addr)(text, **self._addr_kwargs).packed
         except Exception as e:
             if self._fallback is None:
                 raise e
 
             # text_to_bin is expected to return binary string under
             # normal circumstances. See ofproto.oxx_fields._from_user.
-            ip = self._fallback(text, **self._addr_kwargs)
+            ip = self._netaddr(self._fallback)(text, **self._addr_kwargs)
             return ip.ip.packed, ip.netmask.packed
 
+    def text_to_bin(self, text):
+        if isinstance(text, str):
+            return self._cached_text_to_bin(text)
+        return self._text_to_bin(text)
+
     def bin_to_text(self, bin):
-        return str(self._addr(self._strat.packed_to_int(bin),
-                              **self._addr_kwargs))
+        if self._to_text is not None:
+            return self._to_text(bin)
+        strat = self._netaddr(self._strat)
+        return str(self._netaddr(self._addr)(strat.packed_to_int(bin),
+                                             **self._addr_kwargs))
+
+
+class AddrInt(int):
+    """
+    Address held as an int.
+
+    Hashing and comparing an AddrInt is as cheap as for any int, and it
+    can be passed wherever the text form of the address is accepted.
+    Formatting it to text is deferred to str(), repr() and JSON output.
+    """
+
+    __slots__ = ()
+    size = 0
+    converter = None
+
+    def __str__(self):
+        return self.converter.bin_to_text(self.to_bytes(self.size, 'big'))
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+
+class MacInt(AddrInt):
+    __slots__ = ()
+    size = 6
+
+
+class IPv4Int(AddrInt):
+    __slots__ = ()
+    size = 4
+
+
+class IPv6Int(AddrInt):
+    __slots__ = ()
+    size = 16
+
 
+def _mac_to_bin(text):
+    if len(text) != 17 or text[2::3] != ':::::':
+        raise ValueError(text)
+    return binascii.unhexlify(text.replace(':', ''))
 
-ipv4 = AddressConverter(netaddr.IPAddress, netaddr.strategy.ipv4,
-                        fallback=netaddr.IPNetwork, version=4)
-ipv6 = AddressConverter(netaddr.IPAddress, netaddr.strategy.ipv6,
-                        fallback=netaddr.IPNetwork, version=6)
 
+def _mac_to_text(bin):
+    if len(bin) != 6:
+        raise ValueError('invalid mac address length %d' % len(bin))
+    return bytes(bin).hex(':')
 
-class mac_mydialect(netaddr.mac_unix):
-    word_fmt = '%.2x'
 
+ipv4 = AddressConverter('IPAddress', 'strategy.ipv4', fallback='IPNetwork',
+                        to_bin=functools.partial(socket.inet_pton,
+                                                 socket.AF_INET),
+                        to_text=functools.partial(socket.inet_ntop,
+                                                  socket.AF_INET),
+                        int_type=IPv4Int, version=4)
+ipv6 = AddressConverter('IPAddress', 'strategy.ipv6', fallback='IPNetwork',
+                        to_bin=functools.partial(socket.inet_pton,
+                                                 socket.AF_INET6),
+                        to_text=functools.partial(socket.inet_ntop,
+                                                  socket.AF_INET6),
+                        int_type=IPv6Int, version=6)
+mac = AddressConverter('EUI', 'strategy.eui48', to_bin=_mac_to_bin,
+                       to_text=_mac_to_text, int_type=MacInt, version=48)
 
-mac = AddressConverter(netaddr.EUI, netaddr.strategy.eui48, version=48,
-                       dialect=mac_mydialect)
+MacInt.converter = mac
+IPv4Int.converter = ipv4
+IPv6Int.converter = ipv6
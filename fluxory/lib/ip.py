@@ -16,8 +16,6 @@
 import numbers
 import struct
 
-import netaddr
-
 from fluxory.lib import addrconv
 from fluxory.lib import type_desc
 
@@ -43,6 +41,7 @@ def valid_ipv4(addr, flags=0):
     :param flags: See the "netaddr.valid_ipv4()" docs for details.
     :return: True is valid. False otherwise.
     """
+    import netaddr
     return _valid_ip(netaddr.valid_ipv4, 32, addr, flags)
 
 
@@ -57,6 +56,7 @@ def valid_ipv6(addr, flags=0):
     :param flags: See the "netaddr.valid_ipv6()" docs for details.
     :return: True is valid. False otherwise.
     """
+    import netaddr
     return _valid_ip(netaddr.valid_ipv6, 128, addr, flags)
 
 
@@ -17,9 +17,23 @@
 import struct
 
 
+_structs = {}
+
+
 def msg_pack_into(fmt, buf, offset, *args):
-    needed_len = offset + struct.calcsize(fmt)
+    try:
+        st = _structs[fmt]
+    except KeyError:
+        st = _structs[fmt] = struct.Struct(fmt)
+    needed_len = offset + st.size
     if len(buf) < needed_len:
-        buf += bytearray(needed_len - len(buf))
+        buf += bytes(needed_len - len(buf))
+
+    st.pack_into(buf, offset, *args)
+
 
-    struct.pack_into(fmt, buf, offset, *args)
+def msg_write_into(buf, offset, data):
+    needed_len = offset + len(data)
+    if len(buf) < offset:
+        buf += bytearray(offset - len(buf))
+    buf[offset:needed_len] = data
@@ -79,13 +79,23 @@ class arp(packet_base.PacketBase):
 
     @classmethod
     def parser(cls, buf):
+        return cls._parser(buf, addrconv.mac.bin_to_text,
+                           addrconv.ipv4.bin_to_text)
+
+    @classmethod
+    def parser_int_addrs(cls, buf):
+        return cls._parser(buf, addrconv.mac.bin_to_int,
+                           addrconv.ipv4.bin_to_int)
+
+    @classmethod
+    def _parser(cls, buf, mac_to_user, ipv4_to_user):
         (hwtype, proto, hlen, plen, opcode, src_mac, src_ip,
          dst_mac, dst_ip) = struct.unpack_from(cls._PACK_STR, buf)
         return cls(hwtype, proto, hlen, plen, opcode,
-                   addrconv.mac.bin_to_text(src_mac),
-                   addrconv.ipv4.bin_to_text(src_ip),
-                   addrconv.mac.bin_to_text(dst_mac),
-                   addrconv.ipv4.bin_to_text(dst_ip)), None, buf[arp._MIN_LEN:]
+                   mac_to_user(src_mac),
+                   ipv4_to_user(src_ip),
+                   mac_to_user(dst_mac),
+                   ipv4_to_user(dst_ip)), None, buf[arp._MIN_LEN:]
 
     def serialize(self, payload, prev):
         return struct.pack(arp._PACK_STR, self.hwtype, self.proto,
@@ -34,7 +34,6 @@ import re
 import socket
 import struct
 
-import netaddr
 import six
 
 from fluxory.lib.stringify import StringifyMixin
@@ -2592,6 +2591,7 @@ class _FlowSpecPrefixBase(_FlowSpecIPv4Component, IPAddrPrefix):
         super(_FlowSpecPrefixBase, self).__init__(type_)
         self.length = length
         prefix = "%s/%s" % (addr, length)
+        import netaddr
         self.addr = str(netaddr.ip.IPNetwork(prefix).network)
 
     @classmethod
@@ -2627,6 +2627,7 @@ class _FlowSpecIPv6PrefixBase(_FlowSpecIPv6Component, IP6AddrPrefix):
         self.length = length
         self.offset = offset
         prefix = "%s/%s" % (addr, length)
+        import netaddr
         self.addr = str(netaddr.ip.IPNetwork(prefix).network)
 
     @classmethod
@@ -4857,6 +4858,7 @@ class BGPPathAttributeMpReachNLRI(_PathAttribute):
         buf = bytearray()
         for next_hop in self.next_hop_list:
             if self.afi == addr_family.IP6:
+                import netaddr
                 next_hop = str(netaddr.IPAddress(next_hop).ipv6())
             next_hop_bin = ip.text_to_bin(next_hop)
             if RouteFamily(self.afi, self.safi) in (RF_IPv4_VPN, RF_IPv6_VPN):
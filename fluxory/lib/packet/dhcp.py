@@ -53,8 +53,6 @@ DHCP packet parser/serializer
 import random
 import struct
 
-import netaddr
-
 from fluxory.lib import addrconv
 from fluxory.lib import stringify
 from . import packet_base
@@ -197,6 +195,7 @@ class dhcp(packet_base.PacketBase):
         opt_buf = bytearray()
         if self.options is not None:
             opt_buf = self.options.serialize()
+        import netaddr
         if netaddr.valid_mac(self.chaddr):
             chaddr = addrconv.mac.text_to_bin(self.chaddr)
         else:
@@ -56,9 +56,16 @@ class ethernet(packet_base.PacketBase):
 
     @classmethod
     def parser(cls, buf):
+        return cls._parser(buf, addrconv.mac.bin_to_text)
+
+    @classmethod
+    def parser_int_addrs(cls, buf):
+        return cls._parser(buf, addrconv.mac.bin_to_int)
+
+    @classmethod
+    def _parser(cls, buf, mac_to_user):
         dst, src, ethertype = struct.unpack_from(cls._PACK_STR, buf)
-        return (cls(addrconv.mac.bin_to_text(dst),
-                    addrconv.mac.bin_to_text(src), ethertype),
+        return (cls(mac_to_user(dst), mac_to_user(src), ethertype),
                 ethernet.get_packet_type(ethertype),
                 buf[ethernet._MIN_LEN:])
 
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+"""
+Flow key extraction.
+
+Reads the fields a flow table is usually keyed on straight from a raw
+frame, without decoding it into ethernet, vlan, ipv4, tcp, ... objects.
+"""
+
+import collections
+import struct
+
+from fluxory.lib.addrconv import MacInt, IPv4Int, IPv6Int
+from . import ether_types as ether
+from . import in_proto as inet
+
+_ETH_HEADER = struct.Struct('!6s6sH')
+_VLAN_HEADER = struct.Struct('!HH')
+_IPV4_HEADER = struct.Struct('!B5xHxB2x4s4s')
+_IPV6_HEADER = struct.Struct('!6xBx16s16s')
+_IPV6_EXT_HEADER = struct.Struct('!BB')
+_IPV6_FRAG_HEADER = struct.Struct('!BxH4x')
+_ARP_HEADER = struct.Struct('!6xH6x4s6x4s')
+_L4_PORTS = struct.Struct('!HH')
+_ICMP_TYPE_CODE = struct.Struct('!BB')
+
+_VLAN_TYPES = (ether.ETH_TYPE_8021Q, ether.ETH_TYPE_8021AD)
+_PORT_PROTOS = (inet.IPPROTO_TCP, inet.IPPROTO_UDP, inet.IPPROTO_SCTP)
+_ICMP_PROTOS = (inet.IPPROTO_ICMP, inet.IPPROTO_ICMPV6)
+# IPv6 extension headers whose length is counted in 8 octets past the first 8
+_IPV6_EXT_HEADERS = (inet.IPPROTO_HOPOPTS, inet.IPPROTO_ROUTING,
+                     inet.IPPROTO_DSTOPTS)
+_IPV4_FRAG_OFFSET_MASK = 0x1fff
+_IPV6_FRAG_OFFSET_MASK = 0xfff8
+_IPV4_ZERO = IPv4Int(0)
+_IPV6_ZERO = IPv6Int(0)
+
+
+class FlowKey(collections.namedtuple('FlowKey', (
+        'in_port', 'eth_src', 'eth_dst', 'eth_type', 'vlan_vid',
+        'ip_src', 'ip_dst', 'ip_proto', 'l4_src', 'l4_dst'))):
+    """Flow key of a frame.
+
+    Addresses are addrconv.AddrInt, so keys hash and compare as tuples of
+    ints and print addresses as text. vlan_vid is the VID of the outermost
+    tag. For ARP, ip_src/ip_dst are the sender/target protocol addresses
+    and ip_proto is the opcode, as with the arp_spa, arp_tpa and arp_op
+    OXM fields. For ICMP and ICMPv6, l4_src/l4_dst are the type and code.
+    Fields that aren't present in the frame, or that are past the end of
+    a truncated frame, are 0. ip_src/ip_dst of IPv4, IPv6 and ARP frames
+    are always IPv4Int or IPv6Int, 0 if the frame is truncated before
+    them.
+    """
+
+    __slots__ = ()
+
+
+def flow_key(data, in_port=0):
+    """Extract the FlowKey of the frame *data* received on *in_port*.
+
+    *data* is a bytes-like object. Only the headers are read, the frame is
+    neither copied nor decoded. struct.error is raised if *data* is
+    shorter than an ethernet header.
+    """
+    vlan_vid = ip_src = ip_dst = ip_proto = l4_src = l4_dst = 0
+    (dst, src, eth_type) = _ETH_HEADER.unpack_from(data)
+    eth_dst = MacInt.from_bytes(dst, 'big')
+    eth_src = MacInt.from_bytes(src, 'big')
+    offset = _ETH_HEADER.size
+    try:
+        if eth_type in _VLAN_TYPES:
+            (tci, eth_type) = _VLAN_HEADER.unpack_from(data, offset)
+            vlan_vid = tci & 0xfff
+            offset += _VLAN_HEADER.size
+            while eth_type in _VLAN_TYPES:
+                (_, eth_type) = _VLAN_HEADER.unpack_from(data, offset)
+                offset += _VLAN_HEADER.size
+
+        if eth_type == ether.ETH_TYPE_IP:
+            (ver_hlen, flags_offset, ip_proto, src, dst) = \
+                _IPV4_HEADER.unpack_from(data, offset)
+            ip_src = IPv4Int.from_bytes(src, 'big')
+            ip_dst = IPv4Int.from_bytes(dst, 'big')
+            offset += (ver_hlen & 0xf) << 2
+            # only the first fragment carries the l4 header
+            proto = None if flags_offset & _IPV4_FRAG_OFFSET_MASK else ip_proto
+        elif eth_type == ether.ETH_TYPE_IPV6:
+            (proto, src, dst) = _IPV6_HEADER.unpack_from(data, offset)
+            ip_src = IPv6Int.from_bytes(src, 'big')
+            ip_dst = IPv6Int.from_bytes(dst, 'big')
+            offset += 40
+            while True:
+                if proto in _IPV6_EXT_HEADERS:
+                    (nxt, hdr_len) = _IPV6_EXT_HEADER.unpack_from(data, offset)
+                    offset += (hdr_len + 1) << 3
+                elif proto == inet.IPPROTO_FRAGMENT:
+                    (nxt, frag) = _IPV6_FRAG_HEADER.unpack_from(data, offset)
+                    if frag & _IPV6_FRAG_OFFSET_MASK:
+                        # only the first fragment carries the l4 header
+                        (ip_proto, proto) = (nxt, None)
+                        break
+                    offset += _IPV6_FRAG_HEADER.size
+                elif proto == inet.IPPROTO_AH:
+                    (nxt, hdr_len) = _IPV6_EXT_HEADER.unpack_from(data, offset)
+                    offset += (hdr_len + 2) << 2
+                else:
+                    ip_proto = proto
+                    break
+                proto = nxt
+        elif eth_type == ether.ETH_TYPE_ARP:
+            (ip_proto, spa, tpa) = _ARP_HEADER.unpack_from(data, offset)
+            ip_src = IPv4Int.from_bytes(spa, 'big')
+            ip_dst = IPv4Int.from_bytes(tpa, 'big')
+            proto = None
+        else:
+            proto = None
+
+        if proto in _PORT_PROTOS:
+            (l4_src, l4_dst) = _L4_PORTS.unpack_from(data, offset)
+        elif proto in _ICMP_PROTOS:
+            (l4_src, l4_dst) = _ICMP_TYPE_CODE.unpack_from(data, offset)
+    except struct.error:
+        if eth_type == ether.ETH_TYPE_IPV6:
+            ip_src = ip_src or _IPV6_ZERO
+            ip_dst = ip_dst or _IPV6_ZERO
+        elif eth_type in (ether.ETH_TYPE_IP, ether.ETH_TYPE_ARP):
+            ip_src = ip_src or _IPV4_ZERO
+            ip_dst = ip_dst or _IPV4_ZERO
+    return FlowKey(in_port, eth_src, eth_dst, eth_type, vlan_vid,
+                   ip_src, ip_dst, ip_proto, l4_src, l4_dst)
+
+
+def flow_keys(frames, in_ports=None):
+    """Extract the FlowKey of each frame of *frames*.
+
+    *in_ports* is an iterable of the ports the frames were received on,
+    aligned with *frames*, 0 when omitted.
+    """
+    if in_ports is None:
+        return [flow_key(data) for data in frames]
+    return [flow_key(data, in_port)
+            for (data, in_port) in zip(frames, in_ports)]
+
+
+# bytes of a frame that are read by flow_key_columns, the default
+# miss_send_len of a switch
+SNAPLEN = 128
+# zero padding past SNAPLEN, so that reads of the headers past the end
+# of a frame stay inside the array
+_SNAP_PAD = 40
+
+
+def pack_frames(frames, snaplen=SNAPLEN):
+    """Pack the first *snaplen* bytes of each frame of *frames* into the
+    rows of a zero padded 2D uint8 NumPy array."""
+    import numpy as np
+
+    width = snaplen + _SNAP_PAD
+    raw = b''.join([bytes(data[:snaplen]).ljust(width, b'\x00')
+                    for data in frames])
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(frames), width)
+
+
+def _reader(raw):
+    """Return read(offsets, size), which reads a big-endian unsigned int
+    of size bytes at offsets of each row of raw, as uint64."""
+    import numpy as np
+
+    rows = np.arange(raw.shape[0])
+    limit = raw.shape[1] - _SNAP_PAD
+
+    def read(offsets, size):
+        offsets = np.minimum(offsets, limit)
+        value = raw[rows, offsets].astype(np.uint64)
+        for i in range(1, size):
+            value = value << np.uint64(8) | raw[rows, offsets + i]
+        return value
+    return read
+
+
+def flow_key_columns(frames, in_ports=None, snaplen=SNAPLEN, lengths=None):
+    """Extract the flow keys of *frames* at once, as columns.
+
+    *frames* is a sequence of bytes-like frames, or an array from
+    pack_frames. Only their first *snaplen* bytes are read. *lengths*
+    are the lengths of the frames packed in an array, rows are read as
+    frames of the whole snaplen if omitted.
+
+    Returns a FlowKey whose fields are NumPy arrays with one item per
+    frame, holding the same values as flow_key would, as unsigned ints.
+    NumPy has no 128 bit int, so ip_src and ip_dst are (n, 2) uint64
+    arrays of the high and low halves of the address, an IPv4 address
+    being in the low half. Fields past *snaplen* are 0.
+    """
+    import numpy as np
+
+    if isinstance(frames, np.ndarray):
+        raw = frames
+    else:
+        raw = pack_frames(frames, snaplen)
+        lengths = [len(data) for data in frames]
+    (count, snaplen) = (raw.shape[0], raw.shape[1] - _SNAP_PAD)
+    length = np.full(count, snaplen, dtype=np.intp)
+    if lengths is not None:
+        length = np.minimum(np.asarray(lengths, dtype=np.intp), length)
+    read = _reader(raw)
+    zeros = np.zeros(count, dtype=np.uint64)
+
+    def fits(offset, size):
+        """Whether a header of size bytes at offset ends inside the frame,
+        flow_key leaves the fields it reads from a cut header 0."""
+        return offset + size <= length
+
+    eth_dst = read(0, 6)
+    eth_src = read(6, 6)
+    eth_type = read(12, 2)
+    offset = np.full(count, _ETH_HEADER.size, dtype=np.intp)
+    tagged = np.isin(eth_type, _VLAN_TYPES) & fits(offset, _VLAN_HEADER.size)
+    vlan_vid = np.where(tagged, read(offset, 2) & np.uint64(0xfff), zeros)
+    while tagged.any():
+        eth_type = np.where(tagged, read(offset + 2, 2), eth_type)
+        offset += tagged * _VLAN_HEADER.size
+        tagged &= np.isin(eth_type, _VLAN_TYPES)
+        tagged &= fits(offset, _VLAN_HEADER.size)
+
+    is_ipv4 = (eth_type == ether.ETH_TYPE_IP) & fits(offset,
+                                                       _IPV4_HEADER.size)
+    is_ipv6 = (eth_type == ether.ETH_TYPE_IPV6) & fits(offset,
+                                                         _IPV6_HEADER.size)
+    is_arp = (eth_type == ether.ETH_TYPE_ARP) & fits(offset,
+                                                       _ARP_HEADER.size)
+
+    # ipv4 and arp addresses, then ipv6 ones over them
+    src_lo = np.where(is_ipv4, read(offset + 12, 4),
+                      np.where(is_arp, read(offset + 14, 4), zeros))
+    dst_lo = np.where(is_ipv4, read(offset + 16, 4),
+                      np.where(is_arp, read(offset + 24, 4), zeros))
+    src_hi = np.where(is_ipv6, read(offset + 8, 8), zeros)
+    src_lo = np.where(is_ipv6, read(offset + 16, 8), src_lo)
+    dst_hi = np.where(is_ipv6, read(offset + 24, 8), zeros)
+    dst_lo = np.where(is_ipv6, read(offset + 32, 8), dst_lo)
+
+    ip_proto = np.where(is_ipv4, read(offset + 9, 1),
+                        np.where(is_arp, read(offset + 6, 2), zeros))
+    # only the first fragment carries the l4 header
+    has_l4 = is_ipv4 & (read(offset + 6, 2) & np.uint64(_IPV4_FRAG_OFFSET_MASK)
+                        == 0)
+    l4_offset = offset + ((read(offset, 1).astype(np.intp) & 0xf) << 2)
+
+    proto = read(offset + 6, 1)
+    ext_offset = offset + 40
+    in_ext = is_ipv6.copy()
+    ipv6_l4 = is_ipv6.copy()
+    unresolved = np.zeros(count, dtype=bool)
+    # every extension header is at least 8 bytes long, so that the cut
+    # headers end the loop within snaplen / 8 rounds
+    while True:
+        is_ext = in_ext & np.isin(proto, _IPV6_EXT_HEADERS)
+        is_frag = in_ext & (proto == inet.IPPROTO_FRAGMENT)
+        is_ah = in_ext & (proto == inet.IPPROTO_AH)
+        in_ext = is_ext | is_frag | is_ah
+        cut = in_ext & ~fits(ext_offset, np.where(
+            is_frag, _IPV6_FRAG_HEADER.size, _IPV6_EXT_HEADER.size))
+        unresolved |= cut
+        (is_ext, is_frag, is_ah, in_ext) = (
+            is_ext & ~cut, is_frag & ~cut, is_ah & ~cut, in_ext & ~cut)
+        if not in_ext.any():
+            break
+        hdr_len = read(ext_offset + 1, 1).astype(np.intp)
+        later_frag = is_frag & (read(ext_offset + 2, 2) &
+                                np.uint64(_IPV6_FRAG_OFFSET_MASK) != 0)
+        ipv6_l4 &= ~later_frag
+        proto = np.where(in_ext, read(ext_offset, 1), proto)
+        ext_offset += np.where(is_ext, (hdr_len + 1) << 3, 0)
+        ext_offset += np.where(is_frag, _IPV6_FRAG_HEADER.size, 0)
+        ext_offset += np.where(is_ah, (hdr_len + 2) << 2, 0)
+        in_ext &= ~later_frag
+    ipv6_l4 &= ~unresolved
+    ip_proto = np.where(is_ipv6 & ~unresolved, proto, ip_proto)
+    has_l4 |= ipv6_l4
+    l4_offset = np.where(is_ipv6, ext_offset, l4_offset)
+
+    has_ports = (has_l4 & np.isin(ip_proto, _PORT_PROTOS) &
+                 fits(l4_offset, _L4_PORTS.size))
+    is_icmp = (has_l4 & np.isin(ip_proto, _ICMP_PROTOS) &
+               fits(l4_offset, _ICMP_TYPE_CODE.size))
+    l4_src = np.where(has_ports, read(l4_offset, 2),
+                      np.where(is_icmp, read(l4_offset, 1), zeros))
+    l4_dst = np.where(has_ports, read(l4_offset + 2, 2),
+                      np.where(is_icmp, read(l4_offset + 1, 1), zeros))
+
+    if in_ports is None:
+        in_ports = zeros
+    return FlowKey(
+        np.asarray(in_ports, dtype=np.uint32),
+        eth_src, eth_dst,
+        eth_type.astype(np.uint16),
+        vlan_vid.astype(np.uint16),
+        np.stack((src_hi, src_lo), axis=1),
+        np.stack((dst_hi, dst_lo), axis=1),
+        ip_proto.astype(np.uint16),
+        l4_src.astype(np.uint16),
+        l4_dst.astype(np.uint16),
+    )
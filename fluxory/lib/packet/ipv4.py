@@ -71,6 +71,8 @@ class ipv4(packet_base.PacketBase):
 
     _PACK_STR = '!BBHHHBBH4s4s'
     _MIN_LEN = struct.calcsize(_PACK_STR)
+    # fixed header as last parsed or serialized, for checksum updates
+    _wire = None
     _TYPE = {
         'ascii': [
             'src', 'dst'
@@ -103,6 +105,14 @@ class ipv4(packet_base.PacketBase):
 
     @classmethod
     def parser(cls, buf):
+        return cls._parser(buf, addrconv.ipv4.bin_to_text)
+
+    @classmethod
+    def parser_int_addrs(cls, buf):
+        return cls._parser(buf, addrconv.ipv4.bin_to_int)
+
+    @classmethod
+    def _parser(cls, buf, ipv4_to_user):
         (version, tos, total_length, identification, flags, ttl, proto, csum,
          src, dst) = struct.unpack_from(cls._PACK_STR, buf)
         header_length = version & 0xf
@@ -116,8 +126,8 @@ class ipv4(packet_base.PacketBase):
             option = None
         msg = cls(version, header_length, tos, total_length, identification,
                   flags, offset, ttl, proto, csum,
-                  addrconv.ipv4.bin_to_text(src),
-                  addrconv.ipv4.bin_to_text(dst), option)
+                  ipv4_to_user(src), ipv4_to_user(dst), option)
+        msg._wire = bytes(buf[:ipv4._MIN_LEN])
 
         return msg, ipv4.get_packet_type(proto), buf[length:total_length]
 
@@ -140,6 +150,7 @@ class ipv4(packet_base.PacketBase):
 
         self.csum = packet_utils.checksum(hdr)
         struct.pack_into('!H', hdr, 10, self.csum)
+        self._wire = bytes(hdr[:ipv4._MIN_LEN])
         return hdr
 
 
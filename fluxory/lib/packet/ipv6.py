@@ -61,6 +61,8 @@ class ipv6(packet_base.PacketBase):
 
     _PACK_STR = '!IHBB16s16s'
     _MIN_LEN = struct.calcsize(_PACK_STR)
+    # fixed header as last parsed or serialized, for checksum updates
+    _wire = None
     _IPV6_EXT_HEADER_TYPE = {}
     _TYPE = {
         'ascii': [
@@ -95,6 +97,14 @@ class ipv6(packet_base.PacketBase):
 
     @classmethod
     def parser(cls, buf):
+        return cls._parser(buf, addrconv.ipv6.bin_to_text)
+
+    @classmethod
+    def parser_int_addrs(cls, buf):
+        return cls._parser(buf, addrconv.ipv6.bin_to_int)
+
+    @classmethod
+    def _parser(cls, buf, ipv6_to_user):
         (v_tc_flow, payload_length, nxt, hlim, src, dst) = struct.unpack_from(
             cls._PACK_STR, buf)
         version = v_tc_flow >> 28
@@ -113,8 +123,9 @@ class ipv6(packet_base.PacketBase):
             offset += len(hdr)
             last = hdr.nxt
         msg = cls(version, traffic_class, flow_label, payload_length,
-                  nxt, hop_limit, addrconv.ipv6.bin_to_text(src),
-                  addrconv.ipv6.bin_to_text(dst), ext_hdrs)
+                  nxt, hop_limit, ipv6_to_user(src), ipv6_to_user(dst),
+                  ext_hdrs)
+        msg._wire = bytes(buf[:ipv6._MIN_LEN])
         return (msg, ipv6.get_packet_type(last),
                 buf[offset:offset + payload_length])
 
@@ -135,6 +146,7 @@ class ipv6(packet_base.PacketBase):
                 payload_length += len(ext_hdr)
             self.payload_length = payload_length
             struct.pack_into('!H', hdr, 4, self.payload_length)
+        self._wire = bytes(hdr[:ipv6._MIN_LEN])
         return hdr
 
     def __len__(self):
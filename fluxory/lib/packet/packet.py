@@ -23,9 +23,15 @@ from . import packet_base
 from . import ethernet
 
 from fluxory import utils
+from fluxory.lib import stringify
 from fluxory.lib.stringify import StringifyMixin
 
 
+# bytes reserved in front of a packet being serialized, enough for the
+# headers of most packets
+_HEADROOM = 128
+
+
 # Packet class dictionary
 mod = inspect.getmembers(utils.import_module("fluxory.lib.packet"),
                          lambda cls: (inspect.ismodule(cls)))
@@ -51,33 +57,57 @@ class Packet(StringifyMixin):
     The payload is a bytearray.  They are iterated in on-wire order.
 
     *data* should be omitted when encoding a packet.
+
+    With *int_addrs* set, MAC, IPv4 and IPv6 addresses are decoded as
+    addrconv.AddrInt instead of strings.  They hash and compare as ints
+    and are only formatted to text by str(), repr() or to_jsondict().
+
+    *max_depth* and *stop_at* limit decoding to the headers that are
+    actually read.  Decoding stops once *max_depth* headers are decoded
+    or once a header of the class (or one of the tuple of classes)
+    *stop_at* is decoded, e.g. ``Packet(data, stop_at=ipv4.ipv4)``.
+    The bytes after the last decoded header are kept undecoded as the
+    last item of the packet.
     """
 
     # Ignore data field when outputting json representation.
-    _base_attributes = ['data']
+    _base_attributes = ['data', 'int_addrs']
 
-    def __init__(self, data=None, protocols=None, parse_cls=ethernet.ethernet):
+    def __init__(self, data=None, protocols=None, parse_cls=ethernet.ethernet,
+                 int_addrs=False, max_depth=None, stop_at=None):
         super(Packet, self).__init__()
         self.data = data
+        self.int_addrs = int_addrs
         if protocols is None:
             self.protocols = []
         else:
             self.protocols = protocols
         if self.data:
-            self._parser(parse_cls)
+            self._parser(parse_cls, max_depth, stop_at)
 
-    def _parser(self, cls):
+    def _parser(self, cls, max_depth=None, stop_at=None):
+        if isinstance(stop_at, list):
+            stop_at = tuple(stop_at)
         rest_data = self.data
+        depth = 0
         while cls:
+            if max_depth is not None and depth >= max_depth:
+                break
             # Ignores an empty buffer
             if not six.binary_type(rest_data).strip(b'\x00'):
                 break
             try:
-                proto, cls, rest_data = cls.parser(rest_data)
+                if self.int_addrs:
+                    proto, cls, rest_data = cls.parser_int_addrs(rest_data)
+                else:
+                    proto, cls, rest_data = cls.parser(rest_data)
             except struct.error:
                 break
             if proto:
                 self.protocols.append(proto)
+                depth += 1
+                if stop_at and isinstance(proto, stop_at):
+                    break
         # If rest_data is all padding, we ignore rest_data
         if rest_data and six.binary_type(rest_data).strip(b'\x00'):
             self.protocols.append(rest_data)
@@ -86,20 +116,43 @@ class Packet(StringifyMixin):
         """Encode a packet and store the resulted bytearray in self.data.
 
         This method is legal only when encoding a packet.
+
+        The packet is written back to front into a single bytearray, with
+        headroom reserved in front of it as in a network stack buffer.
+        Each protocol header is copied once, in front of the bytes of the
+        protocols that follow it, which are passed to its serialize as a
+        memoryview *payload*.  A payload shorter than the
+        _MIN_PAYLOAD_LEN of a protocol is zero padded at its end first.
         """
 
-        self.data = bytearray()
-        r = self.protocols[::-1]
-        for i, p in enumerate(r):
+        protocols = self.protocols
+        buf = bytearray(_HEADROOM)
+        start = _HEADROOM
+        for i in range(len(protocols) - 1, -1, -1):
+            p = protocols[i]
             if isinstance(p, packet_base.PacketBase):
-                if i == len(r) - 1:
-                    prev = None
-                else:
-                    prev = r[i + 1]
-                data = p.serialize(self.data, prev)
+                pad_len = p._MIN_PAYLOAD_LEN - (len(buf) - start)
+                if pad_len > 0:
+                    buf.extend(bytes(pad_len))
+                payload = memoryview(buf)[start:]
+                data = p.serialize(payload, protocols[i - 1] if i else None)
+                payload.release()
+            elif start == len(buf):
+                # the trailing payload goes right after the headroom
+                buf += p
+                continue
             else:
-                data = six.binary_type(p)
-            self.data = bytearray(data + self.data)
+                data = p
+            length = len(data)
+            if length > start:
+                grow = length - start + _HEADROOM
+                buf[0:0] = bytes(grow)
+                start += grow
+            buf[start - length:start] = data
+            start -= length
+        # dropping the unused headroom moves the start of buf, not its bytes
+        del buf[:start]
+        self.data = buf
 
     @classmethod
     def from_jsondict(cls, dict_, decode_string=base64.b64decode,
@@ -174,7 +227,8 @@ class Packet(StringifyMixin):
         return protocol in self.protocols
 
     def __str__(self):
-        return ', '.join(repr(protocol) for protocol in self.protocols)
+        return ', '.join(stringify._repr(protocol)
+                         for protocol in self.protocols)
     __repr__ = __str__  # note: str(list) uses __repr__ for elements
 
 
@@ -22,6 +22,8 @@ from fluxory.lib import stringify
 class PacketBase(stringify.StringifyMixin):
     """A base class for a protocol (ethernet, ipv4, ...) header."""
     _TYPES = {}
+    # the payload is zero padded up to this length when serialized
+    _MIN_PAYLOAD_LEN = 0
 
     @classmethod
     def get_packet_type(cls, type_):
@@ -70,6 +72,15 @@ class PacketBase(stringify.StringifyMixin):
         """
         pass
 
+    @classmethod
+    def parser_int_addrs(cls, buf):
+        """Decode a protocol header with addresses as addrconv.AddrInt.
+
+        Same as parser otherwise.  Protocols carrying addresses override
+        this; the others have nothing to convert.
+        """
+        return cls.parser(buf)
+
     def serialize(self, payload, prev):
         """Encode a protocol header.
 
@@ -13,27 +13,78 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import array
-import six
-import socket
+import functools
+import itertools
 import struct
 from fluxory.lib import addrconv
 
+# buffers of at least this many bytes are summed with NumPy, if installed
+NUMPY_MIN_LEN = 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Return the numpy module, or None if it isn't installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 
 def carry_around_add(a, b):
     c = a + b
     return (c & 0xffff) + (c >> 16)
 
 
+def ones_sum(data):
+    """
+    16 bit one's complement sum of the bytes-like data, as big-endian
+    words, padded with a zero byte if its length is odd.
+
+    data isn't copied when it's bytes or when NumPy sums it.
+    """
+    length = len(data)
+    np = _numpy() if length >= NUMPY_MIN_LEN else None
+    if np is not None:
+        words = np.frombuffer(data, dtype='>u2', count=length >> 1)
+        s = int(words.sum(dtype=np.uint64))
+        if length % 2:
+            s += data[-1] << 8
+    else:
+        # 2 ** 16 is 1 modulo 0xffff, so the int of the whole buffer
+        # is its sum of words modulo 0xffff
+        s = int.from_bytes(data, 'big')
+        if length % 2:
+            s <<= 8
+    if not s:
+        return 0
+    # a non-zero sum folds to 0xffff, not to 0
+    return s % 0xffff or 0xffff
+
+
 def checksum(data):
-    data = six.binary_type(data)    # input can be bytearray.
-    if len(data) % 2:
-        data += b'\x00'
+    return ~ones_sum(data) & 0xffff
+
 
-    s = sum(array.array('H', data))
+def checksum_update(csum, old, new):
+    """
+    Update the checksum csum after a 16 bit word of the checksummed data
+    changes from old to new, without summing the data again.
+
+    RFC 1624 eqn. 3: HC' = ~(~HC + ~m + m')
+    """
+    s = (~csum & 0xffff) + (~old & 0xffff) + new
     s = (s & 0xffff) + (s >> 16)
-    s += (s >> 16)
-    return socket.ntohs(~s & 0xffff)
+    return ~(s + (s >> 16)) & 0xffff
+
+
+def checksum_update_bytes(csum, old, new):
+    """
+    Update the checksum csum after the bytes old of the checksummed data
+    are replaced with new, of the same length and at an even offset.
+    """
+    return checksum_update(csum, ones_sum(old), ones_sum(new))
 
 
 # avoid circular import
@@ -41,9 +92,12 @@ _IPV4_PSEUDO_HEADER_PACK_STR = '!4s4sxBH'
 _IPV6_PSEUDO_HEADER_PACK_STR = '!16s16sI3xB'
 
 
-def checksum_ip(ipvx, length, payload):
+def checksum_ip(ipvx, length, *payloads):
     """
-    calculate checksum of IP pseudo header
+    calculate checksum of IP pseudo header and payloads
+
+    payloads are summed in order as if they were concatenated, all but
+    the last one must have an even length.
 
     IPv4 pseudo header
     UDP RFC768
@@ -96,11 +150,41 @@ def checksum_ip(ipvx, length, payload):
     else:
         raise ValueError('Unknown IP version %d' % ipvx.version)
 
-    buf = header + payload
-    return checksum(buf)
+    s = ones_sum(header)
+    for payload in payloads:
+        s = carry_around_add(s, ones_sum(payload))
+    return ~s & 0xffff
+
+
+def checksum_ip_update(ipvx, csum, old, new):
+    """
+    Update the checksum csum of an upper layer header under ipvx, after
+    its bytes change from old to new, the payload being the same.
 
+    The change of the addresses of ipvx since it was last parsed or
+    serialized is accounted for in the pseudo header.  Returns None if
+    ipvx was neither parsed nor serialized, the checksum must then be
+    calculated with checksum_ip.
+    """
+    wire = getattr(ipvx, '_wire', None)
+    if wire is None:
+        return None
+    if ipvx.version == 4:
+        old_addrs = wire[12:20]
+        new_addrs = (addrconv.ipv4.text_to_bin(ipvx.src) +
+                     addrconv.ipv4.text_to_bin(ipvx.dst))
+    elif ipvx.version == 6:
+        old_addrs = wire[8:40]
+        new_addrs = (addrconv.ipv6.text_to_bin(ipvx.src) +
+                     addrconv.ipv6.text_to_bin(ipvx.dst))
+    else:
+        raise ValueError('Unknown IP version %d' % ipvx.version)
 
-_MODX = 4102
+    if old_addrs != new_addrs:
+        csum = checksum_update_bytes(csum, old_addrs, new_addrs)
+    if old != new:
+        csum = checksum_update_bytes(csum, old, new)
+    return csum
 
 
 def fletcher_checksum(data, offset):
@@ -110,21 +194,21 @@ def fletcher_checksum(data, offset):
     calling with offset == _FLETCHER_CHECKSUM_VALIDATE will validate the
     checksum without modifying the buffer; a valid checksum returns 0.
     """
-    c0 = 0
-    c1 = 0
-    pos = 0
     length = len(data)
-    data = bytearray(data)
-    data[offset:offset + 2] = [0] * 2
-
-    while pos < length:
-        tlen = min(length - pos, _MODX)
-        for d in data[pos:pos + tlen]:
-            c0 += d
-            c1 += c0
-        c0 %= 255
-        c1 %= 255
-        pos += tlen
+    np = _numpy() if length >= NUMPY_MIN_LEN else None
+    if np is not None:
+        # c1 sums every octet once per octet from it to the end of data,
+        # float64 is exact below 2 ** 53, for lengths up to 8 MiB
+        octets = np.frombuffer(data, dtype=np.uint8).astype(np.float64)
+        c0 = int(octets.sum())
+        c1 = int(octets.dot(np.arange(length, 0, -1, dtype=np.float64)))
+    else:
+        c0 = sum(data)
+        c1 = sum(itertools.accumulate(data))
+    # the checksum field is taken as 0, without copying data to zero it
+    (a, b) = struct.unpack_from('!BB', data, offset)
+    c0 = (c0 - a - b) % 255
+    c1 = (c1 - a * (length - offset) - b * (length - offset - 1)) % 255
 
     x = ((length - offset - 1) * c0 - c1) % 255
     if x <= 0:
@@ -133,6 +217,4 @@ def fletcher_checksum(data, offset):
     if y > 255:
         y -= 255
 
-    data[offset] = x
-    data[offset + 1] = y
     return (x << 8) | (y & 0xff)
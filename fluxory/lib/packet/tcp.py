@@ -75,10 +75,17 @@ class tcp(packet_base.PacketBase):
                    containing options. \
                    None if no options.
     ============== ====================
+
+    A non-zero csum of a parsed or serialized header is updated
+    incrementally (RFC 1624) when the header fields or the addresses of
+    the IP header change, the payload must be unchanged.  It's calculated
+    again if the options or the payload length changed.
     """
 
     _PACK_STR = '!HHIIBBHHH'
     _MIN_LEN = struct.calcsize(_PACK_STR)
+    # (header, L4 length) as last parsed or serialized, for checksum updates
+    _wire = None
 
     def __init__(self, src_port=1, dst_port=1, seq=0, ack=0, offset=0,
                  bits=0, window_size=0, csum=0, urgent=0, option=None):
@@ -150,6 +157,7 @@ class tcp(packet_base.PacketBase):
             option = None
         msg = cls(src_port, dst_port, seq, ack, offset, bits,
                   window_size, csum, urgent, option)
+        msg._wire = (bytes(buf[:length]), len(buf))
 
         return msg, cls.get_payload_type(src_port, dst_port), buf[length:]
 
@@ -182,11 +190,23 @@ class tcp(packet_base.PacketBase):
             offset = self.offset << 4
             struct.pack_into('!B', h, 12, offset)
 
+        total_length = len(h) + len(payload)
+        if (self.csum != 0 and self._wire is not None and
+                h[16:18] == self._wire[0][16:18]):
+            (wire, wire_length) = self._wire
+            # csum is the one of the payload under the last headers, the
+            # pseudo header length and the options must be unchanged
+            csum = None
+            if wire_length == total_length and len(wire) == len(h):
+                csum = packet_utils.checksum_ip_update(
+                    prev, self.csum, wire, h)
+            self.csum = 0 if csum is None else csum
+            struct.pack_into('!H', h, 16, self.csum)
         if self.csum == 0:
-            total_length = len(h) + len(payload)
             self.csum = packet_utils.checksum_ip(prev, total_length,
-                                                 h + payload)
+                                                 h, payload)
             struct.pack_into('!H', h, 16, self.csum)
+        self._wire = (bytes(h), total_length)
         return six.binary_type(h)
 
 
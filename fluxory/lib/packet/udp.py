@@ -40,10 +40,17 @@ class udp(packet_base.PacketBase):
     csum           Checksum \
                    (0 means automatically-calculate when encoding)
     ============== ====================
+
+    A non-zero csum of a parsed or serialized header is updated
+    incrementally (RFC 1624) when the header fields or the addresses of
+    the IP header change, the payload must be unchanged.  It's calculated
+    again if the payload length changed.
     """
 
     _PACK_STR = '!HHHH'
     _MIN_LEN = struct.calcsize(_PACK_STR)
+    # (header, L4 length) as last parsed or serialized, for checksum updates
+    _wire = None
 
     def __init__(self, src_port=1, dst_port=1, total_length=0, csum=0):
         super(udp, self).__init__()
@@ -72,6 +79,7 @@ class udp(packet_base.PacketBase):
         (src_port, dst_port, total_length, csum) = struct.unpack_from(
             cls._PACK_STR, buf)
         msg = cls(src_port, dst_port, total_length, csum)
+        msg._wire = (bytes(buf[:udp._MIN_LEN]), min(len(buf), total_length))
         return msg, cls.get_packet_type(src_port, dst_port), buf[msg._MIN_LEN:total_length]
 
     def serialize(self, payload, prev):
@@ -79,9 +87,24 @@ class udp(packet_base.PacketBase):
             self.total_length = udp._MIN_LEN + len(payload)
         h = struct.pack(udp._PACK_STR, self.src_port, self.dst_port,
                         self.total_length, self.csum)
+        length = udp._MIN_LEN + len(payload)
+        if (self.csum != 0 and self._wire is not None and
+                h[6:8] == self._wire[0][6:8]):
+            (wire, wire_length) = self._wire
+            # csum is the one of the payload under the last headers, the
+            # payload length must be unchanged
+            csum = None
+            if wire_length == length:
+                csum = packet_utils.checksum_ip_update(
+                    prev, self.csum, wire, h)
+            # 0 is sent as 0xffff, 0 means no checksum
+            self.csum = 0 if csum is None else csum or 0xffff
+            h = struct.pack(udp._PACK_STR, self.src_port, self.dst_port,
+                            self.total_length, self.csum)
         if self.csum == 0:
             self.csum = packet_utils.checksum_ip(
-                prev, self.total_length, h + payload)
+                prev, self.total_length, h, payload)
             h = struct.pack(udp._PACK_STR, self.src_port, self.dst_port,
                             self.total_length, self.csum)
+        self._wire = (h, length)
         return h
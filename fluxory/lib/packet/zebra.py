@@ -25,7 +25,6 @@ import struct
 import logging
 from distutils.version import LooseVersion
 
-import netaddr
 import six
 
 # from fluxory import flags as cfg_flags  # For loading 'zapi' option definition
@@ -1398,6 +1397,7 @@ class _ZebraInterface(_ZebraMessageBody):
             # Case for sending message to Zebra
             return b''
         # fixup
+        import netaddr
         if netaddr.valid_mac(self.hw_addr):
             # MAC address
             hw_addr_len = 6
@@ -21,6 +21,8 @@ import inspect
 
 import six
 
+from fluxory.lib import addrconv
+
 # Some arguments to __init__ is mangled in order to avoid name conflicts
 # with builtin names.
 # The standard mangling is to append '_' in order to avoid name clashes
@@ -57,6 +59,8 @@ class AsciiStringType(TypeDescr):
         # because OFPDescStats violates this.
         if six.PY3 and isinstance(v, six.text_type):
             return v
+        if isinstance(v, addrconv.AddrInt):
+            return str(v)
         return six.text_type(v, 'ascii')
 
     @staticmethod
@@ -112,6 +116,14 @@ _types = {
 }
 
 
+def _repr(v):
+    # parsed messages may keep memoryviews of the received buffer, they're
+    # shown like the bytes they refer to
+    if isinstance(v, memoryview):
+        v = bytes(v)
+    return repr(v)
+
+
 class StringifyMixin(object):
 
     _TYPE = {}
@@ -160,7 +172,7 @@ class StringifyMixin(object):
     def __str__(self):
         # repr() to escape binaries
         return self.__class__.__name__ + '(' + \
-            ','.join("%s=%s" % (k, repr(v)) for k, v in
+            ','.join("%s=%s" % (k, _repr(v)) for k, v in
                      self.stringify_attrs()) + ')'
     __repr__ = __str__  # note: str(list) uses __repr__ for elements
 
@@ -207,9 +219,11 @@ class StringifyMixin(object):
     @classmethod
     def _get_default_encoder(cls, encode_string):
         def _encode(v):
-            if isinstance(v, (bytes, six.text_type)):
+            if isinstance(v, (bytes, bytearray, memoryview, six.text_type)):
                 if isinstance(v, six.text_type):
                     v = v.encode('utf-8')
+                elif not isinstance(v, bytes):
+                    v = bytes(v)
                 json_value = encode_string(v)
                 if six.PY3:
                     json_value = json_value.decode('ascii')
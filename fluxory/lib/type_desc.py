@@ -29,21 +29,27 @@ class TypeDescr(object):
 class IntDescr(TypeDescr):
     def __init__(self, size: int) -> None:
         self.size = size
+        self._bits = (1 << (size * 8)) - 1
 
     def to_user(self, binary):
-        i = 0
-        for _ in range(self.size):
-            c = binary[:1]
-            i = i * 256 + ord(c)
-            binary = binary[1:]
-        return i
+        if len(binary) < self.size:
+            raise ValueError('%d bytes needed, got %d' % (self.size,
+                                                          len(binary)))
+        return int.from_bytes(binary[:self.size], 'big')
 
     def from_user(self, i):
-        binary = b''
-        for _ in range(self.size):
-            binary = six.int2byte(i & 255) + binary
-            i //= 256
-        return binary
+        # wraps around like the wire format, e.g. -1 is all ones
+        return (i & self._bits).to_bytes(self.size, 'big')
+
+    def to_user_array(self, buf, offset=0, count=None, stride=None):
+        """Decode count fields spaced stride bytes apart, starting at offset.
+
+        Returns a NumPy array: unsigned integers for sizes up to 8 bytes,
+        Python ints in an object array for larger ones. stride defaults
+        to size (densely packed fields) and count to as many fields as
+        fit in buf.
+        """
+        return _to_user_array(self.size, 1, buf, offset, count, stride)
 
 
 Int1 = IntDescr(1)
@@ -55,43 +61,61 @@ Int9 = IntDescr(9)
 Int16 = IntDescr(16)
 
 
-def _split_str(s, n):
-    """
-    split string into list of strings by specified number.
-    """
-    length = len(s)
-    return [s[i:i + n] for i in range(0, length, n)]
-
-
 class IntDescrMlt(TypeDescr):
     def __init__(self, length: int, num: int) -> None:
         self.length = length
         self.num = num
         self.size = length * num
+        self._bits = (1 << (length * 8)) - 1
 
     def to_user(self, binary):
         assert len(binary) == self.size
-        lb = _split_str(binary, self.length)
-        li = []
-        for b in lb:
-            i = 0
-            for _ in range(self.length):
-                c = b[:1]
-                i = i * 256 + ord(c)
-                b = b[1:]
-            li.append(i)
-        return tuple(li)
+        n = self.length
+        return tuple(int.from_bytes(binary[i:i + n], 'big')
+                     for i in range(0, self.size, n))
 
     def from_user(self, li):
         assert len(li) == self.num
-        binary = b''
-        for i in li:
-            b = b''
-            for _ in range(self.length):
-                b = six.int2byte(i & 255) + b
-                i //= 256
-            binary += b
-        return binary
+        n = self.length
+        return b''.join((i & self._bits).to_bytes(n, 'big') for i in li)
+
+    def to_user_array(self, buf, offset=0, count=None, stride=None):
+        """Same as IntDescr.to_user_array, with num columns per row."""
+        return _to_user_array(self.length, self.num, buf, offset, count,
+                              stride)
+
+
+def _to_user_array(length, num, buf, offset, count, stride):
+    # numpy is an optional dependency, only needed for bulk decoding
+    import numpy as np
+
+    size = length * num
+    if stride is None:
+        stride = size
+    if count is None:
+        count = max(0, (len(buf) - offset - size) // stride + 1)
+    if count and offset + (count - 1) * stride + size > len(buf):
+        raise ValueError('buffer too short for %d fields' % count)
+    # count rows of size bytes each, stride bytes apart
+    raw = np.ndarray((count, size), dtype=np.uint8, buffer=buf,
+                     offset=offset, strides=(stride, 1))
+    raw = raw.reshape(count, num, length)
+    if length in (1, 2, 4, 8):
+        dtype = np.dtype('>u%d' % length)
+        out = np.ascontiguousarray(raw).view(dtype).reshape(count, num)
+        out = out.astype(dtype.newbyteorder('='))
+    elif length < 8:
+        out = np.zeros((count, num), dtype=np.uint64)
+        for i in range(length):
+            out = (out << np.uint64(8)) | raw[:, :, i]
+    else:
+        out = np.empty((count, num), dtype=object)
+        flat = raw.reshape(count * num, length)
+        out.reshape(-1)[:] = [int.from_bytes(r.tobytes(), 'big')
+                              for r in flat]
+    if num == 1:
+        out = out.reshape(count)
+    return out
 
 
 Int4Double = IntDescrMlt(4, 2)
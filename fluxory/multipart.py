@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto.ofproto_parser import MsgView
+
+
+class MultipartStream(object):
+
+    """Streaming reassembly of the segments of a multipart reply.
+
+    App.send_multipart feeds it the OFPMultipartReply segments of one
+    (dpid, xid) as they arrive, still undecoded. Iterating yields the body
+    entries of each segment as soon as it's received, and chunks() yields
+    whole segment bodies, optionally as columnar StatsColumns. A segment
+    is only decoded when it's consumed and isn't referenced afterwards, so
+    memory is bounded by the segments the consumer is lagging behind on,
+    rather than by the whole reply.
+    """
+
+    def __init__(self, dpid: int, xid: int) -> None:
+        """Constructor of MultipartStream."""
+        self.dpid = dpid
+        self.xid = xid
+        self.segments = 0
+        self._pending: Deque[MsgView] = deque()
+        self._waiter: asyncio.Future = None
+        self._done = False
+        self._exception: Exception = None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(dpid={self.dpid}, xid={self.xid}, "
+            f"segments={self.segments}, done={self._done})"
+        )
+
+    def _wakeup(self) -> None:
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def feed(self, reply: MsgView) -> None:
+        """Queue a received segment."""
+        self.segments += 1
+        self._pending.append(reply)
+        self._wakeup()
+
+    def close(self, exception: Exception = None) -> None:
+        """Mark the stream as complete, or failed with exception."""
+        self._done = True
+        self._exception = exception
+        self._wakeup()
+
+    async def _segments(self) -> AsyncIterator[MsgView]:
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+            if self._exception:
+                raise self._exception
+            if self._done:
+                return
+            self._waiter = asyncio.get_event_loop().create_future()
+            await self._waiter
+            self._waiter = None
+
+    async def chunks(self, columns: bool = False) -> AsyncIterator[Any]:
+        """Yield the body of each segment as it arrives.
+
+        With columns=True each body is an ofproto_parser.StatsColumns.
+        """
+        async for reply in self._segments():
+            if columns:
+                reply = ofproto_parser.msg_columns(
+                    reply.version, reply.msg_type, reply.msg_len, reply.xid, reply.buf
+                )
+            yield reply.body
+
+    async def _entries(self) -> AsyncIterator[Any]:
+        async for body in self.chunks():
+            if isinstance(body, list):
+                for entry in body:
+                    yield entry
+            else:
+                yield body
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._entries()
@@ -14,15 +14,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from struct import calcsize
+from struct import calcsize, Struct
 
 OFP_HEADER_VT_PACK_STR = '!BB'
 OFP_HEADER_VT_SIZE = 2
 assert calcsize(OFP_HEADER_VT_PACK_STR) == OFP_HEADER_VT_SIZE
+OFP_HEADER_VT_STRUCT = Struct(OFP_HEADER_VT_PACK_STR)
 
 OFP_HEADER_PACK_STR = '!BBHI'
 OFP_HEADER_SIZE = 8
 assert calcsize(OFP_HEADER_PACK_STR) == OFP_HEADER_SIZE
+OFP_HEADER_STRUCT = Struct(OFP_HEADER_PACK_STR)
 
 # Note: IANA assigned port number for OpenFlow is 6653
 # from OpenFlow 1.3.3 (EXT-133).
@@ -20,13 +20,15 @@ import base64
 import collections
 import json
 import logging
+import re
 import struct
 import functools
 
 from fluxory import exceptions
 from fluxory import utils
 from fluxory.lib import stringify
-from typing import Dict, Any
+from fluxory.lib.pack_utils import msg_pack_into, msg_write_into
+from typing import Dict, Any, List, Optional
 
 from fluxory.ofproto import ofproto_common
 from fluxory.ofproto import ofproto_protocol
@@ -39,49 +41,110 @@ LOG = logging.getLogger('fluxory.ofproto.ofproto_parser')
 if six.PY3:
     buffer = bytes
 
+# Flat dispatch tables indexed by version << 8 | msg_type, filled in by
+# register_msg_classes when each ofproto_vX_parser module is imported.
+_msg_classes: List[Optional[type]] = [None] * (1 << 16)
+_msg_parsers: List[Optional[Callable]] = [None] * (1 << 16)
+
+
+def register_msg_classes(version: int, classes: Dict[int, type]) -> None:
+    """Register the message classes of an OpenFlow version by msg_type."""
+    for (msg_type, cls) in classes.items():
+        _msg_classes[version << 8 | msg_type] = cls
+        _msg_parsers[version << 8 | msg_type] = cls.parser
+
+
+def msg_class(version: int, msg_type: int) -> type:
+    """Get the message class of version and msg_type.
+
+    Raises OFPUnknownVersion for an unknown version and KeyError for an
+    unknown msg_type.
+    """
+    cls = _msg_classes[version << 8 | msg_type]
+    if cls is None:
+        if version not in ofproto_protocol._versions:
+            raise exceptions.OFPUnknownVersion(version=version)
+        raise KeyError(msg_type)
+    return cls
+
 
 def header_vt(buf) -> None:
     """Parse OFP version and type of the header."""
     assert len(buf) >= ofproto_common.OFP_HEADER_VT_SIZE
-    return struct.unpack_from(ofproto_common.OFP_HEADER_VT_PACK_STR,
-                              six.binary_type(buf))
+    return ofproto_common.OFP_HEADER_VT_STRUCT.unpack_from(buf)
 
 
 def header(buf: bytes) -> Tuple[int, int, int, int]:
     assert len(buf) >= ofproto_common.OFP_HEADER_SIZE
     # LOG.debug('len %d bufsize %d', len(buf), ofproto.OFP_HEADER_SIZE)
-    return struct.unpack_from(ofproto_common.OFP_HEADER_PACK_STR,
-                              six.binary_type(buf))
+    return ofproto_common.OFP_HEADER_STRUCT.unpack_from(buf)
 
 
-def msg(version, msg_type, msg_len, xid, buf):
+def msg(version, msg_type, msg_len, xid, buf, lazy=False, columns=False):
+    """Parse an OpenFlow message.
+
+    buf can be bytes, a bytearray or a memoryview. A bytearray or a
+    memoryview isn't copied: msg.buf and the fields sliced from it, such
+    as packet in data, are memoryviews of it, so they don't support bytes
+    methods or concatenation; use bytes() on them where that's needed.
+    If lazy is True, a MsgView wrapping a memoryview of buf is returned
+    instead, and the message body is only decoded on attribute access.
+    If columns is True, the body of a multipart reply is decoded into a
+    StatsColumns, see msg_columns.
+    """
+    if lazy:
+        return msg_view(version, msg_type, msg_len, xid, buf)
+    if columns:
+        return msg_columns(version, msg_type, msg_len, xid, buf)
+
     exp = None
     try:
         assert len(buf) >= msg_len
     except AssertionError as e:
         exp = e
 
-    (_, msg_parser) = ofproto_protocol._versions.get(version)
+    msg_parser = _msg_parsers[version << 8 | msg_type]
     if msg_parser is None:
-        raise exceptions.OFPUnknownVersion(version=version)
+        # raises OFPUnknownVersion or KeyError
+        msg_class(version, msg_type)
 
     try:
-        msg = msg_parser._classes[msg_type].parser(msg_len, xid, buf)
+        msg = msg_parser(msg_len, xid, buf)
     except exceptions.OFPTruncatedMessage as e:
         raise e
-    except KeyError as e:
-        raise e
-    except Exception:
-        print(
-            'Encountered an error while parsing OpenFlow packet from switch. '
-            'This implies the switch sent a malformed OpenFlow packet. '
-            f'version {version} msg_type {msg_type} msg_len {msg_len} xid {xid} buf {utils.hex_array(buf)}')
+    except Exception as e:
+        # The switch sent a malformed message, it's reported as an
+        # OFPParseError in the ofp_parse_error attribute of the log record.
+        err = exceptions.OFPParseError(version, msg_type, msg_len, xid, buf, e)
+        LOG.warning('%s', err, exc_info=True, extra={'ofp_parse_error': err})
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug('buf %s', utils.hex_array(buf))
         msg = None
     if exp:
         raise exp
     return msg
 
 
+def msg_view(version, msg_type, msg_len, xid, buf):
+    """Build a zero-copy, lazily-decoded MsgView of an OpenFlow message."""
+    assert len(buf) >= msg_len
+    return MsgView(msg_class(version, msg_type), version, msg_type, msg_len,
+                   xid, buf)
+
+
+def msg_columns(version, msg_type, msg_len, xid, buf):
+    """Parse a multipart reply with a columnar, NumPy-backed body.
+
+    Only the replies whose entry class declares ``_columns`` (flow, port
+    and queue stats) are supported.
+    """
+    assert len(buf) >= msg_len
+    msg_cls = msg_class(version, msg_type)
+    if not hasattr(msg_cls, 'parser_columns'):
+        raise ValueError('%s has no columnar decoding' % msg_cls.__name__)
+    return msg_cls.parser_columns(msg_len, xid, buf)
+
+
 def create_list_of_base_attributes(f: Callable) -> Callable:
     @functools.wraps(f)
     def wrapper(self, *args, **kwargs):
@@ -206,6 +269,10 @@ class MsgBase(StringifyMixin):
     ========= ==============================
     """
 
+    # Fixed-size fields that MsgView can decode without a full parse,
+    # as a tuple of (pack_str, offset, attribute names).
+    _view_fields = ()
+
     @create_list_of_base_attributes
     def __init__(self, version: int, msg_type: int = None) -> None:
         super(MsgBase, self).__init__()
@@ -230,7 +297,14 @@ class MsgBase(StringifyMixin):
         self.xid = xid
 
     def set_buf(self, buf: bytes) -> None:
-        self.buf = buffer(buf)
+        # bytes and memoryviews are kept as they are and a bytearray is
+        # wrapped in a memoryview, so that buf and the fields sliced from
+        # it refer to the received data instead of copies.
+        if isinstance(buf, bytearray):
+            buf = memoryview(buf)
+        elif not isinstance(buf, memoryview):
+            buf = buffer(buf)
+        self.buf = buf
 
     def __str__(self) -> str:
         def hexify(x):
@@ -264,18 +338,317 @@ class MsgBase(StringifyMixin):
         if self.xid is None:
             self.xid = 0
 
-        struct.pack_into(self.ofproto.OFP_HEADER_PACK_STR,
-                         self.buf, 0,
-                         self.version, self.msg_type, self.msg_len, self.xid)
+        self.ofproto.OFP_HEADER_STRUCT.pack_into(
+            self.buf, 0, self.version, self.msg_type, self.msg_len, self.xid)
 
     def _serialize_body(self) -> None:
         pass
 
+    def _serialize_body_into(self, buf: bytearray, offset: int) -> int:
+        """Write the body at offset and return the message end offset.
+
+        Returns None if the message can only be serialized into self.buf.
+        """
+        if type(self)._serialize_body is not MsgBase._serialize_body:
+            return None
+        return offset + self.ofproto.OFP_HEADER_SIZE
+
     def serialize(self) -> None:
         self._serialize_pre()
         self._serialize_body()
         self._serialize_header()
 
+    def serialize_into(self, buf: bytearray, offset: int = 0) -> int:
+        """
+        Serialize this message into buf at offset and return its end offset.
+
+        The message is written in place, buf only grows when the message
+        doesn't fit and the bytes after the end offset are left untouched,
+        so many messages can be packed back to back into a single pre-sized
+        buffer without intermediate copies. self.buf isn't set by this
+        method.
+        """
+        end = self._serialize_body_into(buf, offset)
+        if end is None:
+            self.serialize()
+            msg_write_into(buf, offset, self.buf)
+            return offset + len(self.buf)
+
+        assert self.version is not None
+        assert self.msg_type is not None
+        self.msg_len = end - offset
+        if self.xid is None:
+            self.xid = 0
+        msg_pack_into(self.ofproto.OFP_HEADER_PACK_STR, buf, offset,
+                      self.version, self.msg_type, self.msg_len, self.xid)
+        return end
+
+
+class MsgView(object):
+    """
+    Zero-copy, lazily-decoded view of an OpenFlow message.
+
+    The header attributes (version, msg_type, msg_len and xid) are set
+    up front and buf is a memoryview into the received buffer.
+    Attributes declared in the message class ``_view_fields`` are
+    unpacked straight from buf on first access; any other attribute
+    triggers a single full parse through the message class ``parser``.
+    Decoded attributes are cached on the view.
+    """
+
+    _view_index: Dict[type, Dict[str, Tuple[struct.Struct, int, Tuple[str, ...]]]] = {}
+
+    def __init__(self, cls: type, version: int, msg_type: int, msg_len: int,
+                 xid: int, buf: bytes) -> None:
+        self._cls = cls
+        self._msg = None
+        self.version = version
+        self.msg_type = msg_type
+        self.msg_len = msg_len
+        self.xid = xid
+        self.buf = memoryview(buf)[:msg_len]
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}({self._cls.__name__}, "
+                f"msg_len={self.msg_len}, xid={self.xid})")
+
+    @classmethod
+    def _index(cls, msg_cls: type) -> Dict[str, Tuple[struct.Struct, int, Tuple[str, ...]]]:
+        try:
+            return cls._view_index[msg_cls]
+        except KeyError:
+            index = {}
+            for (pack_str, offset, names) in msg_cls._view_fields:
+                entry = (struct.Struct(pack_str), offset, names)
+                for name in names:
+                    index[name] = entry
+            cls._view_index[msg_cls] = index
+            return index
+
+    def parse(self) -> MsgBase:
+        """Fully parse the underlying message, at most once."""
+        if self._msg is None:
+            self._msg = self._cls.parser(self.msg_len, self.xid, self.buf)
+        return self._msg
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        field = self._index(self._cls).get(name)
+        if field is None:
+            value = getattr(self.parse(), name)
+            setattr(self, name, value)
+            return value
+        (st, offset, names) = field
+        for (k, v) in zip(names, st.unpack_from(self.buf, offset)):
+            setattr(self, k, v)
+        return self.__dict__[name]
+
+
+class MsgTemplate(object):
+    """
+    Pre-serialized message with fields patched at fixed offsets.
+
+    The message is serialized once. serialize() then copies that buffer,
+    appends data, patches the header length and any given field, so that
+    messages that only differ in a few fields, such as the packet outs of
+    a flood, skip building and serializing a new message every time.
+    set() patches fields of the template itself, for every later copy.
+
+    xid is always available; subclasses declare the other fields with
+    add_field.
+    """
+
+    _LEN_STRUCT = struct.Struct('!H')
+
+    def __init__(self, msg: MsgBase) -> None:
+        msg.serialize()
+        self.msg = msg
+        self.buf = bytearray(msg.buf)
+        self._fields: Dict[str, Tuple[struct.Struct, int]] = {}
+        self.add_field('xid', '!I', 4)
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}({self.msg.__class__.__name__}, "
+                f"fields={sorted(self._fields)})")
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._fields)
+
+    def add_field(self, name: str, fmt: str, offset: Optional[int]) -> None:
+        """Declare a patchable field, skipped if offset is None."""
+        if offset is not None:
+            self._fields[name] = (struct.Struct(fmt), offset)
+
+    def _patch(self, buf: bytearray, values: Dict[str, Any]) -> None:
+        for (name, value) in values.items():
+            try:
+                (st, offset) = self._fields[name]
+            except KeyError:
+                raise KeyError(f"{self!r} has no field {name}")
+            st.pack_into(buf, offset, value)
+
+    def set(self, **values: Any) -> None:
+        """Patch fields of the template."""
+        self._patch(self.buf, values)
+
+    def serialize(self, data: bytes = b'', **values: Any) -> bytearray:
+        """Return a copy of the message with data appended and values
+        patched."""
+        buf = self.buf + data
+        self._LEN_STRUCT.pack_into(buf, 2, len(buf))
+        if values:
+            self._patch(buf, values)
+        return buf
+
+
+def oxm_value_offset(buf, offset: int, header: int) -> Optional[int]:
+    """Find the offset of the value of the OXM field header in the
+    serialized match at offset, None if it isn't there."""
+    (length,) = struct.unpack_from('!H', buf, offset + 2)
+    end = offset + length
+    offset += 4
+    while offset < end:
+        (oxm_header,) = struct.unpack_from('!I', buf, offset)
+        if oxm_header == header:
+            return offset + 4
+        offset += 4 + (oxm_header & 0xff)
+    return None
+
+
+_PACK_STR_RE = re.compile(r'(\d*)([xBHIQbhiqs])')
+
+
+def _pack_str_dtype(pack_str, names):
+    """Build a big-endian NumPy structured dtype from a struct pack string.
+
+    names are given in order for every non-padding field of pack_str.
+    """
+    import numpy as np
+
+    assert pack_str[0] == '!'
+    formats = []
+    offsets = []
+    offset = 0
+    for (count, code) in _PACK_STR_RE.findall(pack_str[1:]):
+        count = int(count) if count else 1
+        if code == 'x':
+            offset += count
+            continue
+        if code == 's':
+            formats.append('S%d' % count)
+            offsets.append(offset)
+            offset += count
+            continue
+        size = struct.calcsize('!' + code)
+        kind = 'u' if code.isupper() else 'i'
+        for _ in range(count):
+            formats.append('>%s%d' % (kind, size))
+            offsets.append(offset)
+            offset += size
+    assert offset == struct.calcsize(pack_str)
+    assert len(names) == len(formats)
+    return np.dtype({'names': list(names), 'formats': formats,
+                     'offsets': offsets, 'itemsize': offset})
+
+
+class StatsColumns(object):
+    """
+    Columnar view of the entries of a multipart reply body.
+
+    The fixed-width leading part of every entry, as declared by the
+    entry class ``_columns`` pack string, is decoded into ``columns``,
+    a NumPy structured array with one record per entry, so that
+    ``body['byte_count']`` is a single array. Fixed-size entries are
+    viewed in place in buf without a copy.
+
+    Anything past the fixed part (matches, instructions, properties) is
+    left undecoded: tail() returns it as a memoryview and entry() parses
+    a single entry into its usual object. Iterating yields the parsed
+    entries, like the list body of a regular parse.
+    """
+
+    _dtypes = {}
+
+    def __init__(self, entry_cls, buf, columns, offsets, lengths):
+        self.entry_cls = entry_cls
+        self.buf = buf
+        self.columns = columns
+        self.offsets = offsets
+        self.lengths = lengths
+
+    @classmethod
+    def _dtype(cls, entry_cls):
+        try:
+            return cls._dtypes[entry_cls]
+        except KeyError:
+            dtype = _pack_str_dtype(*entry_cls._columns)
+            cls._dtypes[entry_cls] = dtype
+            return dtype
+
+    @classmethod
+    def parser(cls, entry_cls, buf, offset, end):
+        """Decode the entries of entry_cls found in buf[offset:end]."""
+        import numpy as np
+
+        dtype = cls._dtype(entry_cls)
+        size = dtype.itemsize
+        if 'length' not in dtype.names:
+            if (end - offset) % size:
+                raise exceptions.OFPMalformedMessage()
+            count = (end - offset) // size
+            columns = np.ndarray(count, dtype=dtype, buffer=buf,
+                                 offset=offset, strides=(size,))
+            offsets = np.arange(offset, end, size, dtype=np.intp)
+            lengths = np.full(count, size, dtype=np.intp)
+            return cls(entry_cls, buf, columns, offsets, lengths)
+
+        length_st = struct.Struct('!H')
+        length_offset = dtype.fields['length'][1]
+        offsets = []
+        while offset < end:
+            (length,) = length_st.unpack_from(buf, offset + length_offset)
+            if length < size or offset + length > end:
+                raise exceptions.OFPMalformedMessage()
+            offsets.append(offset)
+            offset += length
+        offsets = np.array(offsets, dtype=np.intp)
+        raw = np.frombuffer(buf, dtype=np.uint8)
+        # gather the fixed part of every entry into contiguous records
+        rows = raw[offsets[:, None] + np.arange(size, dtype=np.intp)]
+        columns = rows.view(dtype).reshape(len(offsets))
+        lengths = columns['length'].astype(np.intp)
+        return cls(entry_cls, buf, columns, offsets, lengths)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.entry(i)
+
+    def __repr__(self):
+        return '%s(%s, %d entries)' % (self.__class__.__name__,
+                                       self.entry_cls.__name__, len(self))
+
+    @property
+    def names(self):
+        return self.columns.dtype.names
+
+    def entry(self, i):
+        """Fully parse the i-th entry."""
+        return self.entry_cls.parser(self.buf, int(self.offsets[i]))
+
+    def tail(self, i):
+        """Return the undecoded bytes following the fixed part of entry i."""
+        start = int(self.offsets[i])
+        return memoryview(self.buf)[start + self.columns.dtype.itemsize:
+                                    start + int(self.lengths[i])]
+
 
 class MsgInMsgBase(MsgBase):
     @classmethod
@@ -14,6 +14,23 @@
 # limitations under the License.
 
 import re
+import struct
+
+
+_PACK_STR_RE = re.compile(r'_PACK_STR(\d*)$')
+
+
+def generate_structs(mod) -> None:
+    """
+    Add a precompiled X_STRUCT for each public X_PACK_STR of mod.
+    Numbered ones, such as X_PACK_STR0, get X_STRUCT0.
+    """
+    for k, v in list(mod.__dict__.items()):
+        m = _PACK_STR_RE.search(k)
+        if (m and not k.startswith('_') and
+                isinstance(v, str) and v.startswith('!')):
+            setattr(mod, k[:m.start()] + '_STRUCT' + m.group(1),
+                    struct.Struct(v))
 
 
 def generate(modname: str) -> None:
@@ -33,6 +50,7 @@ def generate(modname: str) -> None:
              functools.partial(_error_code_to_str, mod))
     add_attr('ofp_error_to_jsondict',
              functools.partial(_error_to_jsondict, mod))
+    generate_structs(mod)
 
 
 def _get_value_name(mod, value, pattern):
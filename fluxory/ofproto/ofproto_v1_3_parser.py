@@ -47,7 +47,7 @@ import six
 
 from fluxory.lib import addrconv
 from fluxory.lib import mac
-from fluxory.lib.pack_utils import msg_pack_into
+from fluxory.lib.pack_utils import msg_pack_into, msg_write_into
 from fluxory.lib.packet import packet
 from fluxory import exceptions
 from fluxory import utils
@@ -65,6 +65,9 @@ import sys
 import logging
 LOG = logging.getLogger('fluxory.ofproto.ofproto_v1_3_parser')
 
+# type, length of struct ofp_match
+_OFP_MATCH_HEADER_STRUCT = struct.Struct('!HH')
+
 
 def _register_exp_type(experimenter: int, exp_type: int) -> Callable:
     assert exp_type not in OFPExperimenter._subtypes
@@ -107,8 +110,8 @@ class OFPHello(MsgBase):
         offset = ofproto.OFP_HELLO_HEADER_SIZE
         elems = []
         while offset < msg.msg_len:
-            type_, length = struct.unpack_from(
-                ofproto.OFP_HELLO_ELEM_HEADER_PACK_STR, msg.buf, offset)
+            type_, length = ofproto.OFP_HELLO_ELEM_HEADER_STRUCT.unpack_from(
+                msg.buf, offset)
 
             # better to register Hello Element classes but currently
             # Only VerisonBitmap is supported so let's be simple.
@@ -142,9 +145,9 @@ class OFPHelloElemVersionBitmap(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, length = struct.unpack_from(
-            ofproto.OFP_HELLO_ELEM_VERSIONBITMAP_HEADER_PACK_STR,
-            buf, offset)
+        type_, length = (
+            ofproto.OFP_HELLO_ELEM_VERSIONBITMAP_HEADER_STRUCT.unpack_from(
+                buf, offset))
         assert type_ == ofproto.OFPHET_VERSIONBITMAP
 
         bitmaps_len = (length -
@@ -228,6 +231,8 @@ class OFPErrorMsg(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_ERROR
+    _view_fields = ((ofproto.OFP_ERROR_MSG_PACK_STR, ofproto.OFP_HEADER_SIZE,
+                     ('type', 'code')),)
 
     def __init__(self, type_=None, code=None, data=None, **kwargs):
         super(OFPErrorMsg, self).__init__(ofproto.OFP_VERSION, OFPErrorMsg.msg_type)
@@ -242,30 +247,28 @@ class OFPErrorMsg(MsgBase):
 
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
-        type_, = struct.unpack_from('!H', six.binary_type(buf),
-                                    ofproto.OFP_HEADER_SIZE)
+        type_, = struct.unpack_from('!H', buf, ofproto.OFP_HEADER_SIZE)
         msg = super(OFPErrorMsg, cls).parser(msg_len, xid, buf)
         if type_ == ofproto.OFPET_EXPERIMENTER:
             (msg.type, msg.exp_type, msg.experimenter,
-             msg.data) = cls.parse_experimenter_body(buf)
+             msg.data) = cls.parse_experimenter_body(msg.buf)
         else:
             (msg.type, msg.code,
-             msg.data) = cls.parse_body(buf)
+             msg.data) = cls.parse_body(msg.buf)
         return msg
 
     @classmethod
     def parse_body(cls, buf):
-        type_, code = struct.unpack_from(
-            ofproto.OFP_ERROR_MSG_PACK_STR, buf,
-            ofproto.OFP_HEADER_SIZE)
+        type_, code = ofproto.OFP_ERROR_MSG_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
         data = buf[ofproto.OFP_ERROR_MSG_SIZE:]
         return type_, code, data
 
     @classmethod
     def parse_experimenter_body(cls, buf):
-        type_, exp_type, experimenter = struct.unpack_from(
-            ofproto.OFP_ERROR_EXPERIMENTER_MSG_PACK_STR, buf,
-            ofproto.OFP_HEADER_SIZE)
+        type_, exp_type, experimenter = (
+            ofproto.OFP_ERROR_EXPERIMENTER_MSG_STRUCT.unpack_from(
+                buf, ofproto.OFP_HEADER_SIZE))
         data = buf[ofproto.OFP_ERROR_EXPERIMENTER_MSG_SIZE:]
         return type_, exp_type, experimenter, data
 
@@ -412,9 +415,9 @@ class OFPExperimenter(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPExperimenter, cls).parser(msg_len,
                                                  xid, buf)
-        (msg.experimenter, msg.exp_type) = struct.unpack_from(
-            ofproto.OFP_EXPERIMENTER_HEADER_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        (msg.experimenter, msg.exp_type) = (
+            ofproto.OFP_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
         msg.data = msg.buf[ofproto.OFP_EXPERIMENTER_HEADER_SIZE:]
         if (msg.experimenter, msg.exp_type) in cls._subtypes:
             new_msg = cls._subtypes[
@@ -504,9 +507,8 @@ class OFPSwitchFeatures(MsgBase):
          msg.n_tables,
          msg.auxiliary_id,
          msg.capabilities,
-         msg._reserved) = struct.unpack_from(
-            ofproto.OFP_SWITCH_FEATURES_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+         msg._reserved) = ofproto.OFP_SWITCH_FEATURES_STRUCT.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)
         return msg
 
 
@@ -584,9 +586,9 @@ class OFPGetConfigReply(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPGetConfigReply, cls).parser(msg_len, xid, buf)
-        msg.flags, msg.miss_send_len = struct.unpack_from(
-            ofproto.OFP_SWITCH_CONFIG_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        msg.flags, msg.miss_send_len = (
+            ofproto.OFP_SWITCH_CONFIG_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
         return msg
 
 
@@ -855,6 +857,21 @@ class OFPMatch(StringifyMixin):
                 ====================== =====
     """
 
+    # _fields2 is the ordered (name, user_value) tuple used for wire
+    # output; _oxm_index maps each name to its user_value for lookups.
+    # _oxm_wire caches the (encoding, length) of the fields once
+    # serialized, until _fields2 is assigned again. _fields2 is a tuple
+    # so that both caches can't go stale behind its back.
+    @property
+    def _fields2(self):
+        return self._oxm_fields
+
+    @_fields2.setter
+    def _fields2(self, fields):
+        self._oxm_fields = tuple(fields)
+        self._oxm_index = dict(self._oxm_fields)
+        self._oxm_wire = None
+
     def __init__(self, type_: None = None, length: None = None, _ordered_fields: None = None,
                  **kwargs) -> None:
         """
@@ -888,22 +905,22 @@ class OFPMatch(StringifyMixin):
                              in fields]
 
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        return self._oxm_index[key]
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        return key in self._oxm_index
 
     def iteritems(self):
-        return iter(dict(self._fields2).items())
+        return iter(self._oxm_index.items())
 
     def items(self):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        return self._oxm_index.get(key, default)
 
     def stringify_attrs(self):
-        yield "oxm_fields", dict(self._fields2)
+        yield "oxm_fields", dict(self._oxm_index)
 
     def to_jsondict(self):
         """
@@ -1036,24 +1053,22 @@ class OFPMatch(StringifyMixin):
         if self._composed_with_old_api():
             return self.serialize_old(buf, offset)
 
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
+        if self._oxm_wire is None:
+            wire = bytearray(_OFP_MATCH_HEADER_STRUCT.size)
+            field_offset = _OFP_MATCH_HEADER_STRUCT.size
+            for (k, uv) in self._fields2:
+                field_offset += ofproto.oxm_serialize_from_user(
+                    k, uv, wire, field_offset)
 
-        hdr_pack_str = '!HH'
-        field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
+            length = field_offset
+            _OFP_MATCH_HEADER_STRUCT.pack_into(wire, 0, ofproto.OFPMT_OXM,
+                                               length)
+            wire += bytes(utils.round_up(length, 8) - length)
+            self._oxm_wire = (bytes(wire), length)
 
-        length = field_offset - offset
-        msg_pack_into(hdr_pack_str, buf, offset,
-                      ofproto.OFPMT_OXM, length)
-        self.length = length
-
-        pad_len = utils.round_up(length, 8) - length
-        msg_pack_into("%dx" % pad_len, buf, field_offset)
-
-        return length + pad_len
+        (wire, self.length) = self._oxm_wire
+        msg_write_into(buf, offset, wire)
+        return len(wire)
 
     def serialize_old(self, buf, offset):
         if hasattr(self, '_serialized'):
@@ -1281,7 +1296,8 @@ class OFPMatch(StringifyMixin):
             field_offset += f.length
 
         length = field_offset - offset
-        msg_pack_into('!HH', buf, offset, ofproto.OFPMT_OXM, length)
+        msg_pack_into(_OFP_MATCH_HEADER_STRUCT.format, buf, offset,
+                      ofproto.OFPMT_OXM, length)
 
         pad_len = utils.round_up(length, 8) - length
         msg_pack_into("%dx" % pad_len, buf, field_offset)
@@ -1289,13 +1305,15 @@ class OFPMatch(StringifyMixin):
         return length + pad_len
 
     @classmethod
-    def parser(cls, buf, offset):
+    def parser(cls, buf, offset, int_addrs=False):
         """
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
+        With int_addrs, MAC/IPv4/IPv6 fields are parsed as
+        addrconv.AddrInt instead of strings.
         """
         match = OFPMatch()
-        type_, length = struct.unpack_from('!HH', buf, offset)
+        type_, length = _OFP_MATCH_HEADER_STRUCT.unpack_from(buf, offset)
 
         match.type = type_
         match.length = length
@@ -1315,8 +1333,8 @@ class OFPMatch(StringifyMixin):
         fields = []
         try:
             while length > 0:
-                n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-                k, uv = ofproto.oxm_to_user(n, value, mask)
+                k, uv, field_len = ofproto.oxm_parse_to_user(
+                    buf, offset, int_addrs)
                 fields.append((k, uv))
                 offset += field_len
                 length -= field_len
@@ -1656,8 +1674,9 @@ class OFPPropCommonExperimenter4ByteData(StringifyMixin):
 
     @classmethod
     def parser(cls, buf):
-        (type_, length, experimenter, exp_type) = struct.unpack_from(
-            ofproto.OFP_PROP_EXPERIMENTER_PACK_STR, buf, 0)
+        (type_, length, experimenter, exp_type) = (
+            ofproto.OFP_PROP_EXPERIMENTER_STRUCT.unpack_from(
+                buf, 0))
 
         rest = buf[ofproto.OFP_PROP_EXPERIMENTER_SIZE:length]
         data = []
@@ -2265,7 +2284,8 @@ class OFPPacketIn(MsgBase):
     table_id      ID of the table that was looked up
     cookie        Cookie of the flow entry that was looked up
     match         Instance of ``OFPMatch``
-    data          Ethernet frame
+    data          Ethernet frame, a memoryview if the message was parsed
+                  from a memoryview or bytearray
     ============= =========================================================
 
     Example::
@@ -2295,6 +2315,9 @@ class OFPPacketIn(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_PACKET_IN
+    _view_fields = ((ofproto.OFP_PACKET_IN_PACK_STR, ofproto.OFP_HEADER_SIZE,
+                     ('buffer_id', 'total_len', 'reason', 'table_id',
+                      'cookie')),)
 
     def __init__(self, buffer_id=None, total_len=None, reason=None,
                  table_id=None, cookie=None, match=None, data=None):
@@ -2311,8 +2334,7 @@ class OFPPacketIn(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPPacketIn, cls).parser(msg_len, xid, buf)
         (msg.buffer_id, msg.total_len, msg.reason,
-         msg.table_id, msg.cookie) = struct.unpack_from(
-            ofproto.OFP_PACKET_IN_PACK_STR,
+         msg.table_id, msg.cookie) = ofproto.OFP_PACKET_IN_STRUCT.unpack_from(
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
         msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
@@ -2389,6 +2411,11 @@ class OFPFlowRemoved(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_FLOW_REMOVED
+    _view_fields = ((ofproto.OFP_FLOW_REMOVED_PACK_STR0,
+                     ofproto.OFP_HEADER_SIZE,
+                     ('cookie', 'priority', 'reason', 'table_id',
+                      'duration_sec', 'duration_nsec', 'idle_timeout',
+                      'hard_timeout', 'packet_count', 'byte_count')),)
 
     def __init__(self, cookie=None, priority=None, reason=None,
                  table_id=None, duration_sec=None, duration_nsec=None,
@@ -2414,8 +2441,7 @@ class OFPFlowRemoved(MsgBase):
         (msg.cookie, msg.priority, msg.reason,
          msg.table_id, msg.duration_sec, msg.duration_nsec,
          msg.idle_timeout, msg.hard_timeout, msg.packet_count,
-         msg.byte_count) = struct.unpack_from(
-            ofproto.OFP_FLOW_REMOVED_PACK_STR0,
+         msg.byte_count) = ofproto.OFP_FLOW_REMOVED_STRUCT0.unpack_from(
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
         offset = (ofproto.OFP_FLOW_REMOVED_SIZE -
@@ -2473,7 +2499,7 @@ class OFPPort(ofproto_parser.namedtuple('OFPPort', (
 
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto.OFP_PORT_PACK_STR, buf, offset)
+        port = ofproto.OFP_PORT_STRUCT.unpack_from(buf, offset)
         port = list(port)
         i = cls._fields.index('hw_addr')
         port[i] = addrconv.mac.bin_to_text(port[i])
@@ -2533,9 +2559,8 @@ class OFPPortStatus(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPPortStatus, cls).parser(msg_len, xid, buf)
-        msg.reason = struct.unpack_from(
-            ofproto.OFP_PORT_STATUS_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)[0]
+        msg.reason = ofproto.OFP_PORT_STATUS_STRUCT.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)[0]
         msg.desc = OFPPort.parser(msg.buf,
                                   ofproto.OFP_PORT_STATUS_DESC_OFFSET)
         return msg
@@ -2585,25 +2610,31 @@ class OFPPacketOut(MsgBase):
         self.data = data
 
     def _serialize_body(self):
+        self._serialize_body_into(self.buf, 0)
+
+    def _serialize_body_into(self, buf, offset):
+        start = offset
         self.actions_len = 0
-        offset = ofproto.OFP_PACKET_OUT_SIZE
+        offset += ofproto.OFP_PACKET_OUT_SIZE
         for a in self.actions:
-            a.serialize(self.buf, offset)
+            a.serialize(buf, offset)
             offset += a.len
             self.actions_len += a.len
 
-        if self.data is not None:
-            assert self.buffer_id == 0xffffffff
-            if isinstance(self.data, packet.Packet):
-                self.data.serialize()
-                self.buf += self.data.data
-            else:
-                self.buf += self.data
-
         msg_pack_into(ofproto.OFP_PACKET_OUT_PACK_STR,
-                      self.buf, ofproto.OFP_HEADER_SIZE,
+                      buf, start + ofproto.OFP_HEADER_SIZE,
                       self.buffer_id, self.in_port, self.actions_len)
 
+        if self.data is not None:
+            assert self.buffer_id == 0xffffffff
+            data = self.data
+            if isinstance(data, packet.Packet):
+                data.serialize()
+                data = data.data
+            msg_write_into(buf, offset, data)
+            offset += len(data)
+        return offset
+
     @classmethod
     def from_jsondict(cls, dict_, decode_string=base64.b64decode,
                       **additional_args):
@@ -2622,6 +2653,39 @@ class OFPPacketOut(MsgBase):
         return ins
 
 
+class OFPPacketOutTemplate(ofproto_parser.MsgTemplate):
+    """
+    Pre-serialized packet out
+
+    See ``ofproto_parser.MsgTemplate``. The packet out must not have data,
+    it's appended by ``serialize()``. The following fields can be patched.
+
+    ================ ======================================================
+    Field            Description
+    ================ ======================================================
+    xid              Transaction id
+    buffer_id        ID assigned by datapath (OFP_NO_BUFFER if none)
+    in_port          Packet's input port or ``OFPP_CONTROLLER``
+    port             Port of the first ``OFPActionOutput``
+    ================ ======================================================
+
+    Example::
+
+        actions = [ofp_parser.OFPActionOutput(ofp.OFPP_FLOOD)]
+        flood = ofp_parser.OFPPacketOutTemplate(ofp_parser.OFPPacketOut(
+            ofp.OFP_NO_BUFFER, ofp.OFPP_CONTROLLER, actions))
+        buf = flood.serialize(pkt_in.data, in_port=in_port)
+    """
+
+    def __init__(self, packet_out):
+        assert not packet_out.data
+        super(OFPPacketOutTemplate, self).__init__(packet_out)
+        self.add_field('buffer_id', '!I', ofproto.OFP_HEADER_SIZE)
+        self.add_field('in_port', '!I', ofproto.OFP_HEADER_SIZE + 4)
+        self.add_field('port', '!I', _output_port_offset(
+            packet_out.actions, ofproto.OFP_PACKET_OUT_SIZE))
+
+
 class OFPFlowMod(MsgBase):
     """
     Modify Flow entry message
@@ -2720,22 +2784,26 @@ class OFPFlowMod(MsgBase):
         self.instructions = instructions
 
     def _serialize_body(self):
-        msg_pack_into(ofproto.OFP_FLOW_MOD_PACK_STR0, self.buf,
-                      ofproto.OFP_HEADER_SIZE,
+        self._serialize_body_into(self.buf, 0)
+
+    def _serialize_body_into(self, buf, offset):
+        msg_pack_into(ofproto.OFP_FLOW_MOD_PACK_STR0, buf,
+                      offset + ofproto.OFP_HEADER_SIZE,
                       self.cookie, self.cookie_mask, self.table_id,
                       self.command, self.idle_timeout, self.hard_timeout,
                       self.priority, self.buffer_id, self.out_port,
                       self.out_group, self.flags)
 
-        offset = (ofproto.OFP_FLOW_MOD_SIZE -
-                  ofproto.OFP_MATCH_SIZE)
+        offset += (ofproto.OFP_FLOW_MOD_SIZE -
+                   ofproto.OFP_MATCH_SIZE)
 
-        match_len = self.match.serialize(self.buf, offset)
+        match_len = self.match.serialize(buf, offset)
         offset += match_len
 
         for inst in self.instructions:
-            inst.serialize(self.buf, offset)
+            inst.serialize(buf, offset)
             offset += inst.len
+        return offset
 
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
@@ -2744,9 +2812,8 @@ class OFPFlowMod(MsgBase):
         (msg.cookie, msg.cookie_mask, msg.table_id,
          msg.command, msg.idle_timeout, msg.hard_timeout,
          msg.priority, msg.buffer_id, msg.out_port,
-         msg.out_group, msg.flags) = struct.unpack_from(
-            ofproto.OFP_FLOW_MOD_PACK_STR0, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+         msg.out_group, msg.flags) = ofproto.OFP_FLOW_MOD_STRUCT0.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)
         offset = ofproto.OFP_FLOW_MOD_SIZE - ofproto.OFP_HEADER_SIZE
 
         try:
@@ -2779,6 +2846,74 @@ class OFPFlowMod(MsgBase):
         return msg
 
 
+class OFPFlowModTemplate(ofproto_parser.MsgTemplate):
+    """
+    Pre-serialized flow mod
+
+    See ``ofproto_parser.MsgTemplate``. The following fields can be
+    patched.
+
+    ================ ======================================================
+    Field            Description
+    ================ ======================================================
+    xid              Transaction id
+    cookie           Opaque controller-issued identifier
+    idle_timeout     Idle time before discarding (seconds)
+    hard_timeout     Max time before discarding (seconds)
+    priority         Priority level of flow entry
+    buffer_id        Buffered packet to apply to (or OFP_NO_BUFFER)
+    in_port          ``in_port`` of the match, if it has one
+    port             Port of the first ``OFPActionOutput`` of the first
+                     ``OFPInstructionActions`` that has one
+    ================ ======================================================
+
+    Example::
+
+        inst = [ofp_parser.OFPInstructionActions(
+            ofp.OFPIT_APPLY_ACTIONS, [ofp_parser.OFPActionOutput(1)])]
+        tmpl = ofp_parser.OFPFlowModTemplate(ofp_parser.OFPFlowMod(
+            priority=100, match=ofp_parser.OFPMatch(in_port=1),
+            instructions=inst))
+        buf = tmpl.serialize(xid=xid, in_port=in_port, port=out_port)
+    """
+
+    def __init__(self, flow_mod):
+        super(OFPFlowModTemplate, self).__init__(flow_mod)
+        # offsets in OFP_FLOW_MOD_PACK_STR0
+        offset = ofproto.OFP_HEADER_SIZE
+        self.add_field('cookie', '!Q', offset)
+        self.add_field('idle_timeout', '!H', offset + 18)
+        self.add_field('hard_timeout', '!H', offset + 20)
+        self.add_field('priority', '!H', offset + 22)
+        self.add_field('buffer_id', '!I', offset + 24)
+
+        offset = ofproto.OFP_FLOW_MOD_SIZE - ofproto.OFP_MATCH_SIZE
+        self.add_field('in_port', '!I', ofproto_parser.oxm_value_offset(
+            self.buf, offset, ofproto.OXM_OF_IN_PORT))
+        (_, match_len) = _OFP_MATCH_HEADER_STRUCT.unpack_from(self.buf, offset)
+        offset += utils.round_up(match_len, 8)
+
+        port = None
+        for inst in flow_mod.instructions:
+            if isinstance(inst, OFPInstructionActions):
+                port = _output_port_offset(
+                    inst.actions,
+                    offset + ofproto.OFP_INSTRUCTION_ACTIONS_SIZE)
+                if port is not None:
+                    break
+            offset += inst.len
+        self.add_field('port', '!I', port)
+
+
+def _output_port_offset(actions, offset):
+    # offset of the port of the first OFPActionOutput of serialized actions
+    for a in actions:
+        if isinstance(a, OFPActionOutput):
+            return offset + 4
+        offset += a.len
+    return None
+
+
 class OFPInstruction(StringifyMixin):
     _INSTRUCTION_TYPES = {}
 
@@ -2819,9 +2954,9 @@ class OFPInstructionGotoTable(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, table_id) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_GOTO_TABLE_PACK_STR,
-            buf, offset)
+        (type_, len_, table_id) = (
+            ofproto.OFP_INSTRUCTION_GOTO_TABLE_STRUCT.unpack_from(
+                buf, offset))
         return cls(table_id)
 
     def serialize(self, buf, offset):
@@ -2853,9 +2988,9 @@ class OFPInstructionWriteMetadata(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, metadata, metadata_mask) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_WRITE_METADATA_PACK_STR,
-            buf, offset)
+        (type_, len_, metadata, metadata_mask) = (
+            ofproto.OFP_INSTRUCTION_WRITE_METADATA_STRUCT.unpack_from(
+                buf, offset))
         return cls(metadata, metadata_mask)
 
     def serialize(self, buf, offset):
@@ -2896,8 +3031,7 @@ class OFPInstructionActions(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_ACTIONS_PACK_STR,
+        (type_, len_) = ofproto.OFP_INSTRUCTION_ACTIONS_STRUCT.unpack_from(
             buf, offset)
 
         offset += ofproto.OFP_INSTRUCTION_ACTIONS_SIZE
@@ -2959,9 +3093,9 @@ class OFPInstructionMeter(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, meter_id) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_METER_PACK_STR,
-            buf, offset)
+        (type_, len_, meter_id) = (
+            ofproto.OFP_INSTRUCTION_METER_STRUCT.unpack_from(
+                buf, offset))
         return cls(meter_id)
 
     def serialize(self, buf, offset):
@@ -2998,8 +3132,8 @@ class OFPAction(OFPActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_ = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        type_, len_ = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._ACTION_TYPES.get(type_)
         assert cls_ is not None
         return cls_.parser(buf, offset)
@@ -3029,8 +3163,9 @@ class OFPActionOutput(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, port, max_len = struct.unpack_from(
-            ofproto.OFP_ACTION_OUTPUT_PACK_STR, buf, offset)
+        type_, len_, port, max_len = (
+            ofproto.OFP_ACTION_OUTPUT_STRUCT.unpack_from(
+                buf, offset))
         return cls(port, max_len)
 
     def serialize(self, buf, offset):
@@ -3059,8 +3194,8 @@ class OFPActionGroup(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, group_id) = struct.unpack_from(
-            ofproto.OFP_ACTION_GROUP_PACK_STR, buf, offset)
+        (type_, len_, group_id) = ofproto.OFP_ACTION_GROUP_STRUCT.unpack_from(
+            buf, offset)
         return cls(group_id)
 
     def serialize(self, buf, offset):
@@ -3090,8 +3225,9 @@ class OFPActionSetQueue(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, queue_id) = struct.unpack_from(
-            ofproto.OFP_ACTION_SET_QUEUE_PACK_STR, buf, offset)
+        (type_, len_, queue_id) = (
+            ofproto.OFP_ACTION_SET_QUEUE_STRUCT.unpack_from(
+                buf, offset))
         return cls(queue_id)
 
     def serialize(self, buf, offset):
@@ -3120,8 +3256,9 @@ class OFPActionSetMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, mpls_ttl) = struct.unpack_from(
-            ofproto.OFP_ACTION_MPLS_TTL_PACK_STR, buf, offset)
+        (type_, len_, mpls_ttl) = (
+            ofproto.OFP_ACTION_MPLS_TTL_STRUCT.unpack_from(
+                buf, offset))
         return cls(mpls_ttl)
 
     def serialize(self, buf, offset):
@@ -3143,8 +3280,8 @@ class OFPActionDecMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3169,8 +3306,8 @@ class OFPActionSetNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, nw_ttl) = struct.unpack_from(
-            ofproto.OFP_ACTION_NW_TTL_PACK_STR, buf, offset)
+        (type_, len_, nw_ttl) = ofproto.OFP_ACTION_NW_TTL_STRUCT.unpack_from(
+            buf, offset)
         return cls(nw_ttl)
 
     def serialize(self, buf, offset):
@@ -3192,8 +3329,8 @@ class OFPActionDecNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3212,8 +3349,8 @@ class OFPActionCopyTtlOut(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3232,8 +3369,8 @@ class OFPActionCopyTtlIn(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3258,8 +3395,8 @@ class OFPActionPushVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = ofproto.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -3288,8 +3425,8 @@ class OFPActionPushMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = ofproto.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -3311,8 +3448,8 @@ class OFPActionPopVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3331,8 +3468,9 @@ class OFPActionPopMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_POP_MPLS_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = (
+            ofproto.OFP_ACTION_POP_MPLS_STRUCT.unpack_from(
+                buf, offset))
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -3377,10 +3515,9 @@ class OFPActionSetField(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_SET_FIELD_PACK_STR, buf, offset)
-        (n, value, mask, _len) = ofproto.oxm_parse(buf, offset + 4)
-        k, uv = ofproto.oxm_to_user(n, value, mask)
+        (type_, len_) = ofproto.OFP_ACTION_SET_FIELD_STRUCT.unpack_from(
+            buf, offset)
+        (k, uv, _len) = ofproto.oxm_parse_to_user(buf, offset + 4)
         action = cls(**{k: uv})
         action.len = len_
 
@@ -3394,8 +3531,8 @@ class OFPActionSetField(OFPAction):
         if self._composed_with_old_api():
             return self.serialize_old(buf, offset)
 
-        n, value, mask = ofproto.oxm_from_user(self.key, self.value)
-        len_ = ofproto.oxm_serialize(n, value, mask, buf, offset + 4)
+        len_ = ofproto.oxm_serialize_from_user(self.key, self.value, buf,
+                                               offset + 4)
         self.len = utils.round_up(4 + len_, 8)
         msg_pack_into('!HH', buf, offset, self.type, self.len)
         pad_len = self.len - (4 + len_)
@@ -3477,8 +3614,8 @@ class OFPActionPushPbb(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = ofproto.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -3501,8 +3638,8 @@ class OFPActionPopPbb(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3535,8 +3672,9 @@ class OFPActionExperimenter(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, experimenter) = struct.unpack_from(
-            ofproto.OFP_ACTION_EXPERIMENTER_HEADER_PACK_STR, buf, offset)
+        (type_, len_, experimenter) = (
+            ofproto.OFP_ACTION_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                buf, offset))
         data = buf[(offset + ofproto.OFP_ACTION_EXPERIMENTER_HEADER_SIZE
                     ): offset + len_]
         if experimenter == ofproto_common.NX_EXPERIMENTER_ID:
@@ -3582,8 +3720,9 @@ class OFPBucket(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (len_, weight, watch_port, watch_group) = struct.unpack_from(
-            ofproto.OFP_BUCKET_PACK_STR, buf, offset)
+        (len_, weight, watch_port, watch_group) = (
+            ofproto.OFP_BUCKET_STRUCT.unpack_from(
+                buf, offset))
         msg = cls(weight, watch_port, watch_group, [])
         msg.len = len_
 
@@ -3900,6 +4039,8 @@ class OFPMultipartReply(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_MULTIPART_REPLY
+    _view_fields = ((ofproto.OFP_MULTIPART_REPLY_PACK_STR,
+                     ofproto.OFP_HEADER_SIZE, ('type', 'flags')),)
 
     def __init__(self, body=None, flags=None):
         super(OFPMultipartReply, self).__init__(ofproto.OFP_VERSION, OFPMultipartReply.msg_type)
@@ -3929,9 +4070,8 @@ class OFPMultipartReply(MsgBase):
 
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
-        type_, flags = struct.unpack_from(
-            ofproto.OFP_MULTIPART_REPLY_PACK_STR, six.binary_type(buf),
-            ofproto.OFP_HEADER_SIZE)
+        type_, flags = ofproto.OFP_MULTIPART_REPLY_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
         stats_type_cls = cls._STATS_MSG_TYPES.get(type_)
         msg = super(OFPMultipartReply, stats_type_cls).parser(msg_len, xid, buf)
         msg.type = type_
@@ -3950,6 +4090,24 @@ class OFPMultipartReply(MsgBase):
             msg.body = body
         return msg
 
+    @classmethod
+    def parser_columns(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
+        """Parse the reply with its body as an ofproto_parser.StatsColumns."""
+        type_, flags = ofproto.OFP_MULTIPART_REPLY_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
+        stats_type_cls = cls._STATS_MSG_TYPES.get(type_)
+        body_cls = getattr(stats_type_cls, 'cls_stats_body_cls', None)
+        if (not hasattr(body_cls, '_columns') or
+                stats_type_cls.cls_body_single_struct):
+            raise ValueError('multipart type %d has no columnar decoding' %
+                             type_)
+        msg = super(OFPMultipartReply, stats_type_cls).parser(msg_len, xid, buf)
+        msg.type = type_
+        msg.flags = flags
+        msg.body = ofproto_parser.StatsColumns.parser(
+            body_cls, msg.buf, ofproto.OFP_MULTIPART_REPLY_SIZE, msg_len)
+        return msg
+
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
         'mfr_desc', 'hw_desc', 'sw_desc', 'serial_num', 'dp_desc'))):
@@ -3966,8 +4124,7 @@ class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        desc = struct.unpack_from(ofproto.OFP_DESC_PACK_STR,
-                                  buf, offset)
+        desc = ofproto.OFP_DESC_STRUCT.unpack_from(buf, offset)
         desc = list(desc)
         desc = [x.rstrip(b'\0') for x in desc]
         stats = cls(*desc)
@@ -4033,6 +4190,11 @@ class OFPDescStatsReply(OFPMultipartReply):
 
 
 class OFPFlowStats(StringifyMixin):
+    _columns = (ofproto.OFP_FLOW_STATS_0_PACK_STR,
+                ('length', 'table_id', 'duration_sec', 'duration_nsec',
+                 'priority', 'idle_timeout', 'hard_timeout', 'flags',
+                 'cookie', 'packet_count', 'byte_count'))
+
     def __init__(self, table_id=None, duration_sec=None, duration_nsec=None,
                  priority=None, idle_timeout=None, hard_timeout=None,
                  flags=None, cookie=None, packet_count=None,
@@ -4062,8 +4224,8 @@ class OFPFlowStats(StringifyMixin):
          flow_stats.priority, flow_stats.idle_timeout,
          flow_stats.hard_timeout, flow_stats.flags,
          flow_stats.cookie, flow_stats.packet_count,
-         flow_stats.byte_count) = struct.unpack_from(
-            ofproto.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
+         flow_stats.byte_count) = ofproto.OFP_FLOW_STATS_0_STRUCT.unpack_from(
+            buf, offset)
         offset += ofproto.OFP_FLOW_STATS_0_SIZE
 
         flow_stats.match = OFPMatch.parser(buf, offset)
@@ -4195,8 +4357,8 @@ class OFPAggregateStats(ofproto_parser.namedtuple('OFPAggregateStats', (
         'packet_count', 'byte_count', 'flow_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        agg = struct.unpack_from(
-            ofproto.OFP_AGGREGATE_STATS_REPLY_PACK_STR, buf, offset)
+        agg = ofproto.OFP_AGGREGATE_STATS_REPLY_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*agg)
         stats.length = ofproto.OFP_AGGREGATE_STATS_REPLY_SIZE
         return stats
@@ -4287,8 +4449,7 @@ class OFPTableStats(ofproto_parser.namedtuple('OFPTableStats', (
         'matched_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        tbl = struct.unpack_from(ofproto.OFP_TABLE_STATS_PACK_STR,
-                                 buf, offset)
+        tbl = ofproto.OFP_TABLE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*tbl)
         stats.length = ofproto.OFP_TABLE_STATS_SIZE
         return stats
@@ -4356,10 +4517,15 @@ class OFPPortStats(ofproto_parser.namedtuple('OFPPortStats', (
         'rx_dropped', 'tx_dropped', 'rx_errors', 'tx_errors',
         'rx_frame_err', 'rx_over_err', 'rx_crc_err', 'collisions',
         'duration_sec', 'duration_nsec'))):
+    _columns = (ofproto.OFP_PORT_STATS_PACK_STR,
+                ('port_no', 'rx_packets', 'tx_packets', 'rx_bytes',
+                 'tx_bytes', 'rx_dropped', 'tx_dropped', 'rx_errors',
+                 'tx_errors', 'rx_frame_err', 'rx_over_err', 'rx_crc_err',
+                 'collisions', 'duration_sec', 'duration_nsec'))
+
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto.OFP_PORT_STATS_PACK_STR,
-                                  buf, offset)
+        port = ofproto.OFP_PORT_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*port)
         stats.length = ofproto.OFP_PORT_STATS_SIZE
         return stats
@@ -4447,10 +4613,13 @@ class OFPPortStatsReply(OFPMultipartReply):
 class OFPQueueStats(ofproto_parser.namedtuple('OFPQueueStats', (
         'port_no', 'queue_id', 'tx_bytes', 'tx_packets', 'tx_errors',
         'duration_sec', 'duration_nsec'))):
+    _columns = (ofproto.OFP_QUEUE_STATS_PACK_STR,
+                ('port_no', 'queue_id', 'tx_bytes', 'tx_packets',
+                 'tx_errors', 'duration_sec', 'duration_nsec'))
+
     @classmethod
     def parser(cls, buf, offset):
-        queue = struct.unpack_from(ofproto.OFP_QUEUE_STATS_PACK_STR,
-                                   buf, offset)
+        queue = ofproto.OFP_QUEUE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*queue)
         stats.length = ofproto.OFP_QUEUE_STATS_SIZE
         return stats
@@ -4537,8 +4706,9 @@ class OFPBucketCounter(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        packet_count, byte_count = struct.unpack_from(
-            ofproto.OFP_BUCKET_COUNTER_PACK_STR, buf, offset)
+        packet_count, byte_count = (
+            ofproto.OFP_BUCKET_COUNTER_STRUCT.unpack_from(
+                buf, offset))
         return cls(packet_count, byte_count)
 
 
@@ -4558,8 +4728,7 @@ class OFPGroupStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        group = struct.unpack_from(ofproto.OFP_GROUP_STATS_PACK_STR,
-                                   buf, offset)
+        group = ofproto.OFP_GROUP_STATS_STRUCT.unpack_from(buf, offset)
         group_stats = cls(*group)
 
         group_stats.bucket_stats = []
@@ -4655,8 +4824,9 @@ class OFPGroupDescStats(StringifyMixin):
     def parser(cls, buf, offset):
         stats = cls()
 
-        (stats.length, stats.type, stats.group_id) = struct.unpack_from(
-            ofproto.OFP_GROUP_DESC_STATS_PACK_STR, buf, offset)
+        (stats.length, stats.type, stats.group_id) = (
+            ofproto.OFP_GROUP_DESC_STATS_STRUCT.unpack_from(
+                buf, offset))
         offset += ofproto.OFP_GROUP_DESC_STATS_SIZE
 
         stats.buckets = []
@@ -4733,8 +4903,8 @@ class OFPGroupFeaturesStats(ofproto_parser.namedtuple('OFPGroupFeaturesStats',
                                                        'actions'))):
     @classmethod
     def parser(cls, buf, offset):
-        group_features = struct.unpack_from(
-            ofproto.OFP_GROUP_FEATURES_PACK_STR, buf, offset)
+        group_features = ofproto.OFP_GROUP_FEATURES_STRUCT.unpack_from(
+            buf, offset)
         types = group_features[0]
         capabilities = group_features[1]
         max_groups = list(group_features[2:6])
@@ -4810,8 +4980,8 @@ class OFPMeterBandStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        band_stats = struct.unpack_from(
-            ofproto.OFP_METER_BAND_STATS_PACK_STR, buf, offset)
+        band_stats = ofproto.OFP_METER_BAND_STATS_STRUCT.unpack_from(
+            buf, offset)
         return cls(*band_stats)
 
 
@@ -4836,8 +5006,9 @@ class OFPMeterStats(StringifyMixin):
         (meter_stats.meter_id, meter_stats.len,
          meter_stats.flow_count, meter_stats.packet_in_count,
          meter_stats.byte_in_count, meter_stats.duration_sec,
-         meter_stats.duration_nsec) = struct.unpack_from(
-            ofproto.OFP_METER_STATS_PACK_STR, buf, offset)
+         meter_stats.duration_nsec) = (
+             ofproto.OFP_METER_STATS_STRUCT.unpack_from(
+                 buf, offset))
         offset += ofproto.OFP_METER_STATS_SIZE
 
         meter_stats.band_stats = []
@@ -4949,8 +5120,9 @@ class OFPMeterBandHeader(OFPMeterBand):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, _rate, _burst_size = struct.unpack_from(
-            ofproto.OFP_METER_BAND_HEADER_PACK_STR, buf, offset)
+        type_, len_, _rate, _burst_size = (
+            ofproto.OFP_METER_BAND_HEADER_STRUCT.unpack_from(
+                buf, offset))
         cls_ = cls._METER_BAND[type_]
         assert cls_.cls_meter_band_len == len_
         return cls_.parser(buf, offset)
@@ -4970,8 +5142,9 @@ class OFPMeterBandDrop(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size = struct.unpack_from(
-            ofproto.OFP_METER_BAND_DROP_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size = (
+            ofproto.OFP_METER_BAND_DROP_STRUCT.unpack_from(
+                buf, offset))
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size)
@@ -4995,8 +5168,9 @@ class OFPMeterBandDscpRemark(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size, prec_level = struct.unpack_from(
-            ofproto.OFP_METER_BAND_DSCP_REMARK_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size, prec_level = (
+            ofproto.OFP_METER_BAND_DSCP_REMARK_STRUCT.unpack_from(
+                buf, offset))
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size, prec_level)
@@ -5020,8 +5194,9 @@ class OFPMeterBandExperimenter(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size, experimenter = struct.unpack_from(
-            ofproto.OFP_METER_BAND_EXPERIMENTER_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size, experimenter = (
+            ofproto.OFP_METER_BAND_EXPERIMENTER_STRUCT.unpack_from(
+                buf, offset))
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size, experimenter)
@@ -5040,8 +5215,8 @@ class OFPMeterConfigStats(StringifyMixin):
         meter_config = cls()
 
         (meter_config.length, meter_config.flags,
-         meter_config.meter_id) = struct.unpack_from(
-            ofproto.OFP_METER_CONFIG_PACK_STR, buf, offset)
+         meter_config.meter_id) = ofproto.OFP_METER_CONFIG_STRUCT.unpack_from(
+            buf, offset)
         offset += ofproto.OFP_METER_CONFIG_SIZE
 
         meter_config.bands = []
@@ -5130,8 +5305,8 @@ class OFPMeterFeaturesStats(ofproto_parser.namedtuple('OFPMeterFeaturesStats',
                                                        'max_bands', 'max_color'))):
     @classmethod
     def parser(cls, buf, offset):
-        meter_features = struct.unpack_from(
-            ofproto.OFP_METER_FEATURES_PACK_STR, buf, offset)
+        meter_features = ofproto.OFP_METER_FEATURES_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*meter_features)
         stats.length = ofproto.OFP_METER_FEATURES_SIZE
         return stats
@@ -5228,8 +5403,7 @@ class OFPTableFeaturesStats(StringifyMixin):
          name, table_features.metadata_match,
          table_features.metadata_write, table_features.config,
          table_features.max_entries
-         ) = struct.unpack_from(ofproto.OFP_TABLE_FEATURES_PACK_STR,
-                                buf, offset)
+         ) = ofproto.OFP_TABLE_FEATURES_STRUCT.unpack_from(buf, offset)
         table_features.name = name.rstrip(b'\0')
 
         props = []
@@ -5658,9 +5832,8 @@ class OFPExperimenterMultipart(ofproto_parser.namedtuple(
 
     @classmethod
     def parser(cls, buf, offset):
-        args = struct.unpack_from(
-            ofproto.OFP_EXPERIMENTER_MULTIPART_HEADER_PACK_STR, buf,
-            offset)
+        args = ofproto.OFP_EXPERIMENTER_MULTIPART_HEADER_STRUCT.unpack_from(
+            buf, offset)
         args = list(args)
         args.append(buf[offset +
                         ofproto.OFP_EXPERIMENTER_MULTIPART_HEADER_SIZE:])
@@ -5903,8 +6076,7 @@ class OFPQueueProp(OFPQueuePropHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (property_, len_) = struct.unpack_from(
-            ofproto.OFP_QUEUE_PROP_HEADER_PACK_STR,
+        (property_, len_) = ofproto.OFP_QUEUE_PROP_HEADER_STRUCT.unpack_from(
             buf, offset)
         cls_ = cls._QUEUE_PROP_PROPERTIES.get(property_)
         p = cls_.parser(buf, offset + ofproto.OFP_QUEUE_PROP_HEADER_SIZE)
@@ -5926,8 +6098,8 @@ class OFPQueuePropMinRate(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto.OFP_QUEUE_PROP_MIN_RATE_PACK_STR, buf, offset)
+        (rate,) = ofproto.OFP_QUEUE_PROP_MIN_RATE_STRUCT.unpack_from(
+            buf, offset)
         return cls(rate)
 
 
@@ -5940,8 +6112,8 @@ class OFPQueuePropMaxRate(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto.OFP_QUEUE_PROP_MAX_RATE_PACK_STR, buf, offset)
+        (rate,) = ofproto.OFP_QUEUE_PROP_MAX_RATE_STRUCT.unpack_from(
+            buf, offset)
         return cls(rate)
 
 
@@ -5957,8 +6129,9 @@ class OFPQueuePropExperimenter(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (experimenter,) = struct.unpack_from(
-            ofproto.OFP_QUEUE_PROP_EXPERIMENTER_PACK_STR, buf, offset)
+        (experimenter,) = (
+            ofproto.OFP_QUEUE_PROP_EXPERIMENTER_STRUCT.unpack_from(
+                buf, offset))
         return cls(experimenter)
 
     def parse_experimenter_data(self, rest):
@@ -5981,8 +6154,8 @@ class OFPPacketQueue(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (queue_id, port, len_) = struct.unpack_from(
-            ofproto.OFP_PACKET_QUEUE_PACK_STR, buf, offset)
+        (queue_id, port, len_) = ofproto.OFP_PACKET_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         length = ofproto.OFP_PACKET_QUEUE_SIZE
         offset += ofproto.OFP_PACKET_QUEUE_SIZE
         properties = []
@@ -6031,9 +6204,8 @@ class OFPQueueGetConfigReply(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPQueueGetConfigReply, cls).parser(msg_len, xid, buf)
-        (msg.port,) = struct.unpack_from(
-            ofproto.OFP_QUEUE_GET_CONFIG_REPLY_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        (msg.port,) = ofproto.OFP_QUEUE_GET_CONFIG_REPLY_STRUCT.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)
 
         msg.queues = []
         offset = ofproto.OFP_QUEUE_GET_CONFIG_REPLY_SIZE
@@ -6143,9 +6315,9 @@ class OFPRoleReply(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPRoleReply, cls).parser(msg_len, xid,
                                               buf)
-        (msg.role, msg.generation_id) = struct.unpack_from(
-            ofproto.OFP_ROLE_REQUEST_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        (msg.role, msg.generation_id) = (
+            ofproto.OFP_ROLE_REQUEST_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
         return msg
 
 
@@ -6238,9 +6410,9 @@ class OFPGetAsyncReply(MsgBase):
                                                   xid, buf)
         (packet_in_mask_m, packet_in_mask_s,
          port_status_mask_m, port_status_mask_s,
-         flow_removed_mask_m, flow_removed_mask_s) = struct.unpack_from(
-            ofproto.OFP_ASYNC_CONFIG_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+         flow_removed_mask_m, flow_removed_mask_s) = (
+             ofproto.OFP_ASYNC_CONFIG_STRUCT.unpack_from(
+                 msg.buf, ofproto.OFP_HEADER_SIZE))
         msg.packet_in_mask = [packet_in_mask_m, packet_in_mask_s]
         msg.port_status_mask = [port_status_mask_m, port_status_mask_s]
         msg.flow_removed_mask = [flow_removed_mask_m, flow_removed_mask_s]
@@ -6383,8 +6555,8 @@ class ONFBundleCtrlMsg(OFPExperimenter):
 
     @classmethod
     def parser_subtype(cls, super_msg):
-        (bundle_id, type_, flags) = struct.unpack_from(
-            ofproto.ONF_BUNDLE_CTRL_PACK_STR, super_msg.data)
+        (bundle_id, type_, flags) = ofproto.ONF_BUNDLE_CTRL_STRUCT.unpack_from(
+            super_msg.data)
         msg = cls(super_msg.datapath, bundle_id, type_, flags)
         msg.properties = []
         rest = super_msg.data[ofproto.ONF_BUNDLE_CTRL_SIZE:]
@@ -6482,6 +6654,7 @@ def _register_classes() -> None:
         if msg_type > -1:
             if msg_type not in _classes:
                 _classes[msg_type] = cls[1]
+    ofproto_parser.register_msg_classes(ofproto.OFP_VERSION, _classes)
 
 
 _register_classes()
@@ -6492,4 +6665,4 @@ def from_type(msg_type: int, *args, **kwargs) -> None:
     try:
         return _classes[msg_type]
     except KeyError:
-        raise FluxoryError("Unsupported msg_type {msg_type}")
+        raise FluxoryError(f"Unsupported msg_type {msg_type}")
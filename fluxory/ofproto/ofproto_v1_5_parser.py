@@ -24,7 +24,7 @@ import base64
 import six
 
 from fluxory.lib import addrconv
-from fluxory.lib.pack_utils import msg_pack_into
+from fluxory.lib.pack_utils import msg_pack_into, msg_write_into
 from fluxory.lib.packet import packet
 from fluxory import exceptions
 from fluxory import utils
@@ -40,6 +40,12 @@ import inspect
 import sys
 
 
+# type, length of struct ofp_match
+_OFP_MATCH_HEADER_STRUCT = struct.Struct('!HH')
+# reserved, length of struct ofp_stats
+_OFP_STATS_HEADER_STRUCT = struct.Struct('!HH')
+
+
 class OFPHello(MsgBase):
     """
     Hello message
@@ -72,8 +78,8 @@ class OFPHello(MsgBase):
         offset = ofproto.OFP_HELLO_HEADER_SIZE
         elems = []
         while offset < msg.msg_len:
-            type_, length = struct.unpack_from(
-                ofproto.OFP_HELLO_ELEM_HEADER_PACK_STR, msg.buf, offset)
+            type_, length = ofproto.OFP_HELLO_ELEM_HEADER_STRUCT.unpack_from(
+                msg.buf, offset)
 
             # better to register Hello Element classes but currently
             # Only VerisonBitmap is supported so let's be simple.
@@ -107,9 +113,9 @@ class OFPHelloElemVersionBitmap(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, length = struct.unpack_from(
-            ofproto.OFP_HELLO_ELEM_VERSIONBITMAP_HEADER_PACK_STR,
-            buf, offset)
+        type_, length = (
+            ofproto.OFP_HELLO_ELEM_VERSIONBITMAP_HEADER_STRUCT.unpack_from(
+                buf, offset))
         assert type_ == ofproto.OFPHET_VERSIONBITMAP
 
         bitmaps_len = (length -
@@ -239,6 +245,8 @@ class OFPErrorMsg(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_ERROR
+    _view_fields = ((ofproto.OFP_ERROR_MSG_PACK_STR, ofproto.OFP_HEADER_SIZE,
+                     ('type', 'code')),)
 
     def __init__(self, type_=None, code=None, data=None, **kwargs):
         super(OFPErrorMsg, self).__init__(ofproto.OFP_VERSION, OFPErrorMsg.msg_type)
@@ -253,30 +261,28 @@ class OFPErrorMsg(MsgBase):
 
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
-        type_, = struct.unpack_from('!H', six.binary_type(buf),
-                                    ofproto.OFP_HEADER_SIZE)
+        type_, = struct.unpack_from('!H', buf, ofproto.OFP_HEADER_SIZE)
         msg = super(OFPErrorMsg, cls).parser(msg_len, xid, buf)
         if type_ == ofproto.OFPET_EXPERIMENTER:
             (msg.type, msg.exp_type, msg.experimenter,
-             msg.data) = cls.parse_experimenter_body(buf)
+             msg.data) = cls.parse_experimenter_body(msg.buf)
         else:
             (msg.type, msg.code,
-             msg.data) = cls.parse_body(buf)
+             msg.data) = cls.parse_body(msg.buf)
         return msg
 
     @classmethod
     def parse_body(cls, buf):
-        type_, code = struct.unpack_from(
-            ofproto.OFP_ERROR_MSG_PACK_STR, buf,
-            ofproto.OFP_HEADER_SIZE)
+        type_, code = ofproto.OFP_ERROR_MSG_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
         data = buf[ofproto.OFP_ERROR_MSG_SIZE:]
         return type_, code, data
 
     @classmethod
     def parse_experimenter_body(cls, buf):
-        type_, exp_type, experimenter = struct.unpack_from(
-            ofproto.OFP_ERROR_EXPERIMENTER_MSG_PACK_STR, buf,
-            ofproto.OFP_HEADER_SIZE)
+        type_, exp_type, experimenter = (
+            ofproto.OFP_ERROR_EXPERIMENTER_MSG_STRUCT.unpack_from(
+                buf, ofproto.OFP_HEADER_SIZE))
         data = buf[ofproto.OFP_ERROR_EXPERIMENTER_MSG_SIZE:]
         return type_, exp_type, experimenter, data
 
@@ -401,9 +407,9 @@ class OFPExperimenter(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPExperimenter, cls).parser(msg_len, xid, buf)
-        (msg.experimenter, msg.exp_type) = struct.unpack_from(
-            ofproto.OFP_EXPERIMENTER_HEADER_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        (msg.experimenter, msg.exp_type) = (
+            ofproto.OFP_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
         msg.data = msg.buf[ofproto.OFP_EXPERIMENTER_HEADER_SIZE:]
 
         return msg
@@ -460,9 +466,8 @@ class OFPSwitchFeatures(MsgBase):
          msg.n_tables,
          msg.auxiliary_id,
          msg.capabilities,
-         msg._reserved) = struct.unpack_from(
-            ofproto.OFP_SWITCH_FEATURES_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+         msg._reserved) = ofproto.OFP_SWITCH_FEATURES_STRUCT.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)
         return msg
 
 
@@ -539,9 +544,9 @@ class OFPGetConfigReply(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPGetConfigReply, cls).parser(msg_len, xid, buf)
-        msg.flags, msg.miss_send_len = struct.unpack_from(
-            ofproto.OFP_SWITCH_CONFIG_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        msg.flags, msg.miss_send_len = (
+            ofproto.OFP_SWITCH_CONFIG_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
         return msg
 
 
@@ -730,6 +735,21 @@ class OFPMatch(StringifyMixin):
                 ====================== =====
     """
 
+    # _fields2 is the ordered (name, user_value) tuple used for wire
+    # output; _oxm_index maps each name to its user_value for lookups.
+    # _oxm_wire caches the (encoding, length) of the fields once
+    # serialized, until _fields2 is assigned again. _fields2 is a tuple
+    # so that both caches can't go stale behind its back.
+    @property
+    def _fields2(self):
+        return self._oxm_fields
+
+    @_fields2.setter
+    def _fields2(self, fields):
+        self._oxm_fields = tuple(fields)
+        self._oxm_index = dict(self._oxm_fields)
+        self._oxm_wire = None
+
     def __init__(self, type_=None, length=None, _ordered_fields=None,
                  **kwargs):
         super(OFPMatch, self).__init__()
@@ -752,13 +772,15 @@ class OFPMatch(StringifyMixin):
                              in fields]
 
     @classmethod
-    def parser(cls, buf, offset):
+    def parser(cls, buf, offset, int_addrs=False):
         """
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
+        With int_addrs, MAC/IPv4/IPv6 fields are parsed as
+        addrconv.AddrInt instead of strings.
         """
         match = OFPMatch()
-        type_, length = struct.unpack_from('!HH', buf, offset)
+        type_, length = _OFP_MATCH_HEADER_STRUCT.unpack_from(buf, offset)
 
         match.type = type_
         match.length = length
@@ -769,8 +791,8 @@ class OFPMatch(StringifyMixin):
 
         fields = []
         while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
+            k, uv, field_len = ofproto.oxm_parse_to_user(
+                buf, offset, int_addrs)
             fields.append((k, uv))
             offset += field_len
             length -= field_len
@@ -783,41 +805,40 @@ class OFPMatch(StringifyMixin):
         the buf.
         Returns the output length.
         """
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
-
-        hdr_pack_str = '!HH'
-        field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
-
-        length = field_offset - offset
-        msg_pack_into(hdr_pack_str, buf, offset, ofproto.OFPMT_OXM, length)
-        self.length = length
-
-        pad_len = utils.round_up(length, 8) - length
-        msg_pack_into("%dx" % pad_len, buf, field_offset)
-
-        return length + pad_len
+        if self._oxm_wire is None:
+            wire = bytearray(_OFP_MATCH_HEADER_STRUCT.size)
+            field_offset = _OFP_MATCH_HEADER_STRUCT.size
+            for (k, uv) in self._fields2:
+                field_offset += ofproto.oxm_serialize_from_user(
+                    k, uv, wire, field_offset)
+
+            length = field_offset
+            _OFP_MATCH_HEADER_STRUCT.pack_into(wire, 0, ofproto.OFPMT_OXM,
+                                               length)
+            wire += bytes(utils.round_up(length, 8) - length)
+            self._oxm_wire = (bytes(wire), length)
+
+        (wire, self.length) = self._oxm_wire
+        msg_write_into(buf, offset, wire)
+        return len(wire)
 
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        return self._oxm_index[key]
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        return key in self._oxm_index
 
     def iteritems(self):
-        return iter(dict(self._fields2).items())
+        return iter(self._oxm_index.items())
 
     def items(self):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        return self._oxm_index.get(key, default)
 
     def stringify_attrs(self):
-        yield "oxm_fields", dict(self._fields2)
+        yield "oxm_fields", dict(self._oxm_index)
 
     def to_jsondict(self):
         """
@@ -902,7 +923,7 @@ class OFPStats(StringifyMixin):
         expression of the wire protocol of the flow stats.
         """
         stats = OFPStats()
-        reserved, length = struct.unpack_from('!HH', buf, offset)
+        reserved, length = _OFP_STATS_HEADER_STRUCT.unpack_from(buf, offset)
 
         stats.length = length
 
@@ -929,8 +950,7 @@ class OFPStats(StringifyMixin):
         fields = [ofproto.oxs_from_user(k, uv) for (k, uv)
                   in self.fields]
 
-        hdr_pack_str = '!HH'
-        field_offset = offset + struct.calcsize(hdr_pack_str)
+        field_offset = offset + _OFP_STATS_HEADER_STRUCT.size
         for (n, value, _) in fields:
             # No mask
             field_offset += ofproto.oxs_serialize(n, value, None, buf,
@@ -938,7 +958,8 @@ class OFPStats(StringifyMixin):
 
         reserved = 0
         length = field_offset - offset
-        msg_pack_into(hdr_pack_str, buf, offset, reserved, length)
+        msg_pack_into(_OFP_STATS_HEADER_STRUCT.format, buf, offset,
+                      reserved, length)
         self.length = length
 
         pad_len = utils.round_up(length, 8) - length
@@ -1065,8 +1086,9 @@ class OFPPropCommonExperimenter4ByteData(StringifyMixin):
 
     @classmethod
     def parser(cls, buf):
-        (type_, length, experimenter, exp_type) = struct.unpack_from(
-            ofproto.OFP_PROP_EXPERIMENTER_PACK_STR, buf, 0)
+        (type_, length, experimenter, exp_type) = (
+            ofproto.OFP_PROP_EXPERIMENTER_STRUCT.unpack_from(
+                buf, 0))
 
         rest = buf[ofproto.OFP_PROP_EXPERIMENTER_SIZE:length]
         data = []
@@ -1125,8 +1147,9 @@ class OFPPortDescPropEthernet(OFPPortDescProp):
         ether = cls()
         (ether.type, ether.length, ether.curr,
          ether.advertised, ether.supported,
-         ether.peer, ether.curr_speed, ether.max_speed) = struct.unpack_from(
-            ofproto.OFP_PORT_DESC_PROP_ETHERNET_PACK_STR, buf, 0)
+         ether.peer, ether.curr_speed, ether.max_speed) = (
+             ofproto.OFP_PORT_DESC_PROP_ETHERNET_STRUCT.unpack_from(
+                 buf, 0))
         return ether
 
 
@@ -1156,8 +1179,9 @@ class OFPPortDescPropOptical(OFPPortDescProp):
          optical.tx_min_freq_lmda, optical.tx_max_freq_lmda,
          optical.tx_grid_freq_lmda, optical.rx_min_freq_lmda,
          optical.rx_max_freq_lmda, optical.rx_grid_freq_lmda,
-         optical.tx_pwr_min, optical.tx_pwr_max) = struct.unpack_from(
-            ofproto.OFP_PORT_DESC_PROP_OPTICAL_PACK_STR, buf, 0)
+         optical.tx_pwr_min, optical.tx_pwr_max) = (
+             ofproto.OFP_PORT_DESC_PROP_OPTICAL_STRUCT.unpack_from(
+                 buf, 0))
         return optical
 
 
@@ -1233,8 +1257,9 @@ class OFPTableModPropEviction(OFPTableModProp):
     @classmethod
     def parser(cls, buf):
         eviction = cls()
-        (eviction.type, eviction.length, eviction.flags) = struct.unpack_from(
-            ofproto.OFP_TABLE_MOD_PROP_EVICTION_PACK_STR, buf, 0)
+        (eviction.type, eviction.length, eviction.flags) = (
+            ofproto.OFP_TABLE_MOD_PROP_EVICTION_STRUCT.unpack_from(
+                buf, 0))
         return eviction
 
     def serialize(self):
@@ -1261,8 +1286,9 @@ class OFPTableModPropVacancy(OFPTableModProp):
     def parser(cls, buf):
         vacancy = cls()
         (vacancy.type, vacancy.length, vacancy.vacancy_down,
-         vacancy.vacancy_up, vacancy.vacancy) = struct.unpack_from(
-            ofproto.OFP_TABLE_MOD_PROP_VACANCY_PACK_STR, buf, 0)
+         vacancy.vacancy_up, vacancy.vacancy) = (
+             ofproto.OFP_TABLE_MOD_PROP_VACANCY_STRUCT.unpack_from(
+                 buf, 0))
         return vacancy
 
     def serialize(self):
@@ -1295,8 +1321,9 @@ class OFPQueueDescPropMinRate(OFPQueueDescProp):
     @classmethod
     def parser(cls, buf):
         minrate = cls()
-        (minrate.type, minrate.length, minrate.rate) = struct.unpack_from(
-            ofproto.OFP_QUEUE_DESC_PROP_MIN_RATE_PACK_STR, buf, 0)
+        (minrate.type, minrate.length, minrate.rate) = (
+            ofproto.OFP_QUEUE_DESC_PROP_MIN_RATE_STRUCT.unpack_from(
+                buf, 0))
         return minrate
 
 
@@ -1310,8 +1337,9 @@ class OFPQueueDescPropMaxRate(OFPQueueDescProp):
     @classmethod
     def parser(cls, buf):
         maxrate = cls()
-        (maxrate.type, maxrate.length, maxrate.rate) = struct.unpack_from(
-            ofproto.OFP_QUEUE_DESC_PROP_MAX_RATE_PACK_STR, buf, 0)
+        (maxrate.type, maxrate.length, maxrate.rate) = (
+            ofproto.OFP_QUEUE_DESC_PROP_MAX_RATE_STRUCT.unpack_from(
+                buf, 0))
         return maxrate
 
 
@@ -1337,8 +1365,8 @@ class OFPTime(StringifyMixin):
     @classmethod
     def parser(cls, buf, offset):
         cls_ = cls()
-        (cls_.seconds, cls_.nanoseconds) = struct.unpack_from(
-            ofproto.OFP_TIME_PACK_STR, buf, offset)
+        (cls_.seconds, cls_.nanoseconds) = ofproto.OFP_TIME_STRUCT.unpack_from(
+            buf, offset)
         return cls_
 
     def serialize(self, buf, offset):
@@ -1404,7 +1432,8 @@ class OFPPacketIn(MsgBase):
     table_id      ID of the table that was looked up
     cookie        Cookie of the flow entry that was looked up
     match         Instance of ``OFPMatch``
-    data          Ethernet frame
+    data          Ethernet frame, a memoryview if the message was parsed
+                  from a memoryview or bytearray
     ============= =========================================================
 
     Example::
@@ -1440,6 +1469,9 @@ class OFPPacketIn(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_PACKET_IN
+    _view_fields = ((ofproto.OFP_PACKET_IN_PACK_STR, ofproto.OFP_HEADER_SIZE,
+                     ('buffer_id', 'total_len', 'reason', 'table_id',
+                      'cookie')),)
 
     def __init__(self, buffer_id=None, total_len=None, reason=None,
                  table_id=None, cookie=None, match=None, data=None):
@@ -1456,8 +1488,7 @@ class OFPPacketIn(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPPacketIn, cls).parser(msg_len, xid, buf)
         (msg.buffer_id, msg.total_len, msg.reason,
-         msg.table_id, msg.cookie) = struct.unpack_from(
-            ofproto.OFP_PACKET_IN_PACK_STR,
+         msg.table_id, msg.cookie) = ofproto.OFP_PACKET_IN_STRUCT.unpack_from(
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
         msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
@@ -1535,6 +1566,10 @@ class OFPFlowRemoved(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_FLOW_REMOVED
+    _view_fields = ((ofproto.OFP_FLOW_REMOVED_PACK_STR0,
+                     ofproto.OFP_HEADER_SIZE,
+                     ('table_id', 'reason', 'priority', 'idle_timeout',
+                      'hard_timeout', 'cookie')),)
 
     def __init__(self, table_id=None, reason=None, priority=None,
                  idle_timeout=None, hard_timeout=None, cookie=None,
@@ -1554,8 +1589,8 @@ class OFPFlowRemoved(MsgBase):
         msg = super(OFPFlowRemoved, cls).parser(msg_len, xid, buf)
 
         (msg.table_id, msg.reason, msg.priority, msg.idle_timeout,
-         msg.hard_timeout, msg.cookie) = struct.unpack_from(
-            ofproto.OFP_FLOW_REMOVED_PACK_STR0,
+         msg.hard_timeout,
+         msg.cookie) = ofproto.OFP_FLOW_REMOVED_STRUCT0.unpack_from(
             msg.buf, ofproto.OFP_HEADER_SIZE)
         offset = (ofproto.OFP_FLOW_REMOVED_SIZE - ofproto.OFP_MATCH_SIZE)
 
@@ -1622,8 +1657,9 @@ class OFPPort(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (port_no, length, hw_addr, name, config, state) = struct.unpack_from(
-            ofproto.OFP_PORT_PACK_STR, buf, offset)
+        (port_no, length, hw_addr, name, config, state) = (
+            ofproto.OFP_PORT_STRUCT.unpack_from(
+                buf, offset))
         hw_addr = addrconv.mac.bin_to_text(hw_addr)
         name = name.rstrip(b'\0')
         props = []
@@ -1646,8 +1682,8 @@ class OFPTableDesc(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (length, table_id, config) = struct.unpack_from(
-            ofproto.OFP_TABLE_DESC_PACK_STR, buf, offset)
+        (length, table_id, config) = ofproto.OFP_TABLE_DESC_STRUCT.unpack_from(
+            buf, offset)
         props = []
         rest = buf[offset + ofproto.OFP_TABLE_DESC_SIZE:offset + length]
         while rest:
@@ -1668,8 +1704,8 @@ class OFPQueueDesc(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (port_no, queue_id, len_) = struct.unpack_from(
-            ofproto.OFP_QUEUE_DESC_PACK_STR, buf, offset)
+        (port_no, queue_id, len_) = ofproto.OFP_QUEUE_DESC_STRUCT.unpack_from(
+            buf, offset)
         props = []
         rest = buf[offset + ofproto.OFP_QUEUE_DESC_SIZE:offset + len_]
         while rest:
@@ -1751,8 +1787,9 @@ class OFPMeterMod(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPMeterMod, cls).parser(msg_len, xid, buf)
 
-        (msg.command, msg.flags, msg.meter_id) = struct.unpack_from(
-            ofproto.OFP_METER_MOD_PACK_STR, buf, ofproto.OFP_HEADER_SIZE)
+        (msg.command, msg.flags, msg.meter_id) = (
+            ofproto.OFP_METER_MOD_STRUCT.unpack_from(
+                buf, ofproto.OFP_HEADER_SIZE))
         offset = ofproto.OFP_METER_MOD_SIZE
 
         msg.bands = []
@@ -1841,6 +1878,8 @@ class OFPMultipartReply(MsgBase):
 
     version = ofproto.OFP_VERSION
     msg_type = ofproto.OFPT_MULTIPART_REPLY
+    _view_fields = ((ofproto.OFP_MULTIPART_REPLY_PACK_STR,
+                     ofproto.OFP_HEADER_SIZE, ('type', 'flags')),)
 
     def __init__(self, body=None, flags=None):
         super(OFPMultipartReply, self).__init__(ofproto.OFP_VERSION, OFPMultipartReply.msg_type)
@@ -1870,9 +1909,8 @@ class OFPMultipartReply(MsgBase):
 
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
-        type_, flags = struct.unpack_from(
-            ofproto.OFP_MULTIPART_REPLY_PACK_STR, six.binary_type(buf),
-            ofproto.OFP_HEADER_SIZE)
+        type_, flags = ofproto.OFP_MULTIPART_REPLY_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
         stats_type_cls = cls._STATS_MSG_TYPES.get(type_)
         msg = super(OFPMultipartReply, stats_type_cls).parser(msg_len, xid, buf)
         msg.type = type_
@@ -1894,6 +1932,24 @@ class OFPMultipartReply(MsgBase):
             msg.body = body
         return msg
 
+    @classmethod
+    def parser_columns(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
+        """Parse the reply with its body as an ofproto_parser.StatsColumns."""
+        type_, flags = ofproto.OFP_MULTIPART_REPLY_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
+        stats_type_cls = cls._STATS_MSG_TYPES.get(type_)
+        body_cls = getattr(stats_type_cls, 'cls_stats_body_cls', None)
+        if (not hasattr(body_cls, '_columns') or
+                stats_type_cls.cls_body_single_struct):
+            raise ValueError('multipart type %d has no columnar decoding' %
+                             type_)
+        msg = super(OFPMultipartReply, stats_type_cls).parser(msg_len, xid, buf)
+        msg.type = type_
+        msg.flags = flags
+        msg.body = ofproto_parser.StatsColumns.parser(
+            body_cls, msg.buf, ofproto.OFP_MULTIPART_REPLY_SIZE, msg_len)
+        return msg
+
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
         'mfr_desc', 'hw_desc', 'sw_desc', 'serial_num', 'dp_desc'))):
@@ -1910,8 +1966,7 @@ class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        desc = struct.unpack_from(ofproto.OFP_DESC_PACK_STR,
-                                  buf, offset)
+        desc = ofproto.OFP_DESC_STRUCT.unpack_from(buf, offset)
         desc = list(desc)
         desc = [x.rstrip(b'\0') for x in desc]
         stats = cls(*desc)
@@ -2007,8 +2062,7 @@ class OFPTableFeaturesStats(StringifyMixin):
         (tbl.length, tbl.table_id, tbl.command, tbl.features,
          name, tbl.metadata_match, tbl.metadata_write,
          tbl.capabilities, tbl.max_entries
-         ) = struct.unpack_from(ofproto.OFP_TABLE_FEATURES_PACK_STR,
-                                buf, offset)
+         ) = ofproto.OFP_TABLE_FEATURES_STRUCT.unpack_from(buf, offset)
         tbl.name = name.rstrip(b'\0')
 
         props = []
@@ -2621,6 +2675,10 @@ class OFPQueueStatsPropExperimenter(OFPPropCommonExperimenter4ByteData):
 
 
 class OFPQueueStats(StringifyMixin):
+    _columns = (ofproto.OFP_QUEUE_STATS_PACK_STR,
+                ('length', 'port_no', 'queue_id', 'tx_bytes', 'tx_packets',
+                 'tx_errors', 'duration_sec', 'duration_nsec'))
+
     def __init__(self, length=None, port_no=None, queue_id=None,
                  tx_bytes=None, tx_packets=None, tx_errors=None,
                  duration_sec=None, duration_nsec=None, properties=None):
@@ -2638,8 +2696,9 @@ class OFPQueueStats(StringifyMixin):
     @classmethod
     def parser(cls, buf, offset):
         (length, port_no, queue_id, tx_bytes, tx_packets, tx_errors,
-         duration_sec, duration_nsec) = struct.unpack_from(
-            ofproto.OFP_QUEUE_STATS_PACK_STR, buf, offset)
+         duration_sec, duration_nsec) = (
+             ofproto.OFP_QUEUE_STATS_STRUCT.unpack_from(
+                 buf, offset))
         props = []
         rest = buf[offset + ofproto.OFP_QUEUE_STATS_SIZE:offset + length]
         while rest:
@@ -2733,8 +2792,9 @@ class OFPBucketCounter(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        packet_count, byte_count = struct.unpack_from(
-            ofproto.OFP_BUCKET_COUNTER_PACK_STR, buf, offset)
+        packet_count, byte_count = (
+            ofproto.OFP_BUCKET_COUNTER_STRUCT.unpack_from(
+                buf, offset))
         return cls(packet_count, byte_count)
 
 
@@ -2754,8 +2814,7 @@ class OFPGroupStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        group = struct.unpack_from(ofproto.OFP_GROUP_STATS_PACK_STR,
-                                   buf, offset)
+        group = ofproto.OFP_GROUP_STATS_STRUCT.unpack_from(buf, offset)
         group_stats = cls(*group)
 
         group_stats.bucket_stats = []
@@ -2857,8 +2916,9 @@ class OFPGroupDescStats(StringifyMixin):
         stats = cls()
 
         (stats.length, stats.type, stats.group_id,
-         stats.bucket_array_len) = struct.unpack_from(
-            ofproto.OFP_GROUP_DESC_STATS_PACK_STR, buf, offset)
+         stats.bucket_array_len) = (
+             ofproto.OFP_GROUP_DESC_STATS_STRUCT.unpack_from(
+                 buf, offset))
         offset += ofproto.OFP_GROUP_DESC_STATS_SIZE
 
         bucket_buf = buf[offset:offset + stats.bucket_array_len]
@@ -2949,8 +3009,8 @@ class OFPGroupFeaturesStats(ofproto_parser.namedtuple('OFPGroupFeaturesStats',
                                                        'actions'))):
     @classmethod
     def parser(cls, buf, offset):
-        group_features = struct.unpack_from(
-            ofproto.OFP_GROUP_FEATURES_PACK_STR, buf, offset)
+        group_features = ofproto.OFP_GROUP_FEATURES_STRUCT.unpack_from(
+            buf, offset)
         types = group_features[0]
         capabilities = group_features[1]
         max_groups = list(group_features[2:6])
@@ -3026,8 +3086,8 @@ class OFPMeterBandStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        band_stats = struct.unpack_from(
-            ofproto.OFP_METER_BAND_STATS_PACK_STR, buf, offset)
+        band_stats = ofproto.OFP_METER_BAND_STATS_STRUCT.unpack_from(
+            buf, offset)
         return cls(*band_stats)
 
 
@@ -3052,8 +3112,9 @@ class OFPMeterStats(StringifyMixin):
         (meter_stats.meter_id, meter_stats.len,
          meter_stats.ref_count, meter_stats.packet_in_count,
          meter_stats.byte_in_count, meter_stats.duration_sec,
-         meter_stats.duration_nsec) = struct.unpack_from(
-            ofproto.OFP_METER_STATS_PACK_STR, buf, offset)
+         meter_stats.duration_nsec) = (
+             ofproto.OFP_METER_STATS_STRUCT.unpack_from(
+                 buf, offset))
         offset += ofproto.OFP_METER_STATS_SIZE
 
         meter_stats.band_stats = []
@@ -3165,8 +3226,9 @@ class OFPMeterBandHeader(OFPMeterBand):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, _rate, _burst_size = struct.unpack_from(
-            ofproto.OFP_METER_BAND_HEADER_PACK_STR, buf, offset)
+        type_, len_, _rate, _burst_size = (
+            ofproto.OFP_METER_BAND_HEADER_STRUCT.unpack_from(
+                buf, offset))
         cls_ = cls._METER_BAND[type_]
         assert cls_.cls_meter_band_len == len_
         return cls_.parser(buf, offset)
@@ -3186,8 +3248,9 @@ class OFPMeterBandDrop(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size = struct.unpack_from(
-            ofproto.OFP_METER_BAND_DROP_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size = (
+            ofproto.OFP_METER_BAND_DROP_STRUCT.unpack_from(
+                buf, offset))
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size)
@@ -3211,8 +3274,9 @@ class OFPMeterBandDscpRemark(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size, prec_level = struct.unpack_from(
-            ofproto.OFP_METER_BAND_DSCP_REMARK_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size, prec_level = (
+            ofproto.OFP_METER_BAND_DSCP_REMARK_STRUCT.unpack_from(
+                buf, offset))
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size, prec_level)
@@ -3236,8 +3300,9 @@ class OFPMeterBandExperimenter(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size, experimenter = struct.unpack_from(
-            ofproto.OFP_METER_BAND_EXPERIMENTER_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size, experimenter = (
+            ofproto.OFP_METER_BAND_EXPERIMENTER_STRUCT.unpack_from(
+                buf, offset))
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size, experimenter)
@@ -3256,8 +3321,8 @@ class OFPMeterDescStats(StringifyMixin):
         meter_config = cls()
 
         (meter_config.length, meter_config.flags,
-         meter_config.meter_id) = struct.unpack_from(
-            ofproto.OFP_METER_DESC_PACK_STR, buf, offset)
+         meter_config.meter_id) = ofproto.OFP_METER_DESC_STRUCT.unpack_from(
+            buf, offset)
         offset += ofproto.OFP_METER_DESC_SIZE
 
         meter_config.bands = []
@@ -3346,8 +3411,8 @@ class OFPMeterFeaturesStats(ofproto_parser.namedtuple('OFPMeterFeaturesStats',
                                                        'max_bands', 'max_color', 'features'))):
     @classmethod
     def parser(cls, buf, offset):
-        meter_features = struct.unpack_from(
-            ofproto.OFP_METER_FEATURES_PACK_STR, buf, offset)
+        meter_features = ofproto.OFP_METER_FEATURES_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*meter_features)
         stats.length = ofproto.OFP_METER_FEATURES_SIZE
         return stats
@@ -3441,8 +3506,8 @@ class OFPFlowUpdateHeader(OFPFlowUpdate):
 
     @classmethod
     def parser(cls, buf, offset):
-        length, event = struct.unpack_from(
-            ofproto.OFP_FLOW_UPDATE_HEADER_PACK_STR, buf, offset)
+        length, event = ofproto.OFP_FLOW_UPDATE_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._EVENT[event]
         return cls_.parser(buf, offset)
 
@@ -3476,8 +3541,8 @@ class OFPFlowUpdateFull(OFPFlowUpdateHeader):
     @classmethod
     def parser(cls, buf, offset):
         (length, event, table_id, reason, idle_timeout, hard_timeout, priority,
-         cookie) = struct.unpack_from(ofproto.OFP_FLOW_UPDATE_FULL_0_PACK_STR,
-                                      buf, offset)
+         cookie) = ofproto.OFP_FLOW_UPDATE_FULL_0_STRUCT.unpack_from(
+             buf, offset)
         offset += ofproto.OFP_FLOW_UPDATE_FULL_0_SIZE
         assert cls.cls_flow_update_length <= length
         assert cls.cls_flow_update_event == event
@@ -3508,8 +3573,8 @@ class OFPFlowUpdateAbbrev(OFPFlowUpdateHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        length, event, xid = struct.unpack_from(
-            ofproto.OFP_FLOW_UPDATE_ABBREV_PACK_STR, buf, offset)
+        length, event, xid = ofproto.OFP_FLOW_UPDATE_ABBREV_STRUCT.unpack_from(
+            buf, offset)
         assert cls.cls_flow_update_length == length
         assert cls.cls_flow_update_event == event
 
@@ -3523,8 +3588,8 @@ class OFPFlowUpdateAbbrev(OFPFlowUpdateHeader):
 class OFPFlowUpdatePaused(OFPFlowUpdateHeader):
     @classmethod
     def parser(cls, buf, offset):
-        length, event = struct.unpack_from(
-            ofproto.OFP_FLOW_UPDATE_PAUSED_PACK_STR, buf, offset)
+        length, event = ofproto.OFP_FLOW_UPDATE_PAUSED_STRUCT.unpack_from(
+            buf, offset)
         assert cls.cls_flow_update_length == length
         assert cls.cls_flow_update_event == event
 
@@ -3683,8 +3748,9 @@ class OFPBundleFeaturesPropTime(OFPBundleFeaturesProp):
     @classmethod
     def parser(cls, buf):
         prop = cls()
-        (prop.type, prop.length) = struct.unpack_from(
-            ofproto.OFP_BUNDLE_FEATURES_PROP_TIME_0_PACK_STR, buf)
+        (prop.type, prop.length) = (
+            ofproto.OFP_BUNDLE_FEATURES_PROP_TIME_0_STRUCT.unpack_from(
+                buf))
         offset = ofproto.OFP_BUNDLE_FEATURES_PROP_TIME_0_SIZE
 
         for f in ['sched_accuracy', 'sched_max_future', 'sched_max_past',
@@ -3721,8 +3787,8 @@ class OFPBundleFeaturesStats(ofproto_parser.namedtuple(
         'OFPBundleFeaturesStats', ('capabilities', 'properties'))):
     @classmethod
     def parser(cls, buf, offset):
-        (capabilities, ) = struct.unpack_from(
-            ofproto.OFP_BUNDLE_FEATURES_PACK_STR, buf, offset)
+        (capabilities, ) = ofproto.OFP_BUNDLE_FEATURES_STRUCT.unpack_from(
+            buf, offset)
 
         properties = []
         length = ofproto.OFP_BUNDLE_FEATURES_SIZE
@@ -3833,9 +3899,8 @@ class OFPExperimenterMultipart(ofproto_parser.namedtuple(
 
     @classmethod
     def parser(cls, buf, offset):
-        args = struct.unpack_from(
-            ofproto.OFP_EXPERIMENTER_MULTIPART_HEADER_PACK_STR, buf,
-            offset)
+        args = ofproto.OFP_EXPERIMENTER_MULTIPART_HEADER_STRUCT.unpack_from(
+            buf, offset)
         args = list(args)
         args.append(buf[offset +
                         ofproto.OFP_EXPERIMENTER_MULTIPART_HEADER_SIZE:])
@@ -3933,8 +3998,8 @@ class OFPFlowDesc(StringifyMixin):
          flow_desc.priority, flow_desc.idle_timeout,
          flow_desc.hard_timeout, flow_desc.flags,
          flow_desc.importance,
-         flow_desc.cookie) = struct.unpack_from(
-            ofproto.OFP_FLOW_DESC_0_PACK_STR, buf, offset)
+         flow_desc.cookie) = ofproto.OFP_FLOW_DESC_0_STRUCT.unpack_from(
+            buf, offset)
         offset += ofproto.OFP_FLOW_DESC_0_SIZE
 
         flow_desc.match = OFPMatch.parser(buf, offset)
@@ -3959,6 +4024,9 @@ class OFPFlowDesc(StringifyMixin):
 
 
 class OFPFlowStats(StringifyMixin):
+    _columns = (ofproto.OFP_FLOW_STATS_0_PACK_STR,
+                ('length', 'table_id', 'reason', 'priority'))
+
     def __init__(self, table_id=None, reason=None, priority=None,
                  match=None, stats=None, length=None):
         super(OFPFlowStats, self).__init__()
@@ -3974,8 +4042,8 @@ class OFPFlowStats(StringifyMixin):
         flow_stats = cls()
 
         (flow_stats.length, flow_stats.table_id, flow_stats.reason,
-         flow_stats.priority) = struct.unpack_from(
-            ofproto.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
+         flow_stats.priority) = ofproto.OFP_FLOW_STATS_0_STRUCT.unpack_from(
+            buf, offset)
         offset += ofproto.OFP_FLOW_STATS_0_SIZE
 
         flow_stats.match = OFPMatch.parser(buf, offset)
@@ -4275,8 +4343,7 @@ class OFPTableStats(ofproto_parser.namedtuple('OFPTableStats', (
         'matched_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        tbl = struct.unpack_from(ofproto.OFP_TABLE_STATS_PACK_STR,
-                                 buf, offset)
+        tbl = ofproto.OFP_TABLE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*tbl)
         stats.length = ofproto.OFP_TABLE_STATS_SIZE
         return stats
@@ -4358,8 +4425,9 @@ class OFPPortStatsPropEthernet(OFPPortStatsProp):
     def parser(cls, buf):
         ether = cls()
         (ether.type, ether.length, ether.rx_frame_err, ether.rx_over_err,
-         ether.rx_crc_err, ether.collisions) = struct.unpack_from(
-            ofproto.OFP_PORT_STATS_PROP_ETHERNET_PACK_STR, buf, 0)
+         ether.rx_crc_err, ether.collisions) = (
+             ofproto.OFP_PORT_STATS_PROP_ETHERNET_STRUCT.unpack_from(
+                 buf, 0))
         return ether
 
 
@@ -4391,8 +4459,9 @@ class OFPPortStatsPropOptical(OFPPortStatsProp):
          optical.tx_freq_lmda, optical.tx_offset, optical.tx_grid_span,
          optical.rx_freq_lmda, optical.rx_offset, optical.rx_grid_span,
          optical.tx_pwr, optical.rx_pwr, optical.bias_current,
-         optical.temperature) = struct.unpack_from(
-            ofproto.OFP_PORT_STATS_PROP_OPTICAL_PACK_STR, buf, 0)
+         optical.temperature) = (
+             ofproto.OFP_PORT_STATS_PROP_OPTICAL_STRUCT.unpack_from(
+                 buf, 0))
         return optical
 
 
@@ -4402,6 +4471,11 @@ class OFPPortStatsPropExperimenter(OFPPropCommonExperimenter4ByteData):
 
 
 class OFPPortStats(StringifyMixin):
+    _columns = (ofproto.OFP_PORT_STATS_PACK_STR,
+                ('length', 'port_no', 'duration_sec', 'duration_nsec',
+                 'rx_packets', 'tx_packets', 'rx_bytes', 'tx_bytes',
+                 'rx_dropped', 'tx_dropped', 'rx_errors', 'tx_errors'))
+
     def __init__(self, length=None, port_no=None, duration_sec=None,
                  duration_nsec=None, rx_packets=None, tx_packets=None,
                  rx_bytes=None, tx_bytes=None, rx_dropped=None,
@@ -4426,8 +4500,8 @@ class OFPPortStats(StringifyMixin):
     def parser(cls, buf, offset):
         (length, port_no, duration_sec, duration_nsec, rx_packets,
          tx_packets, rx_bytes, tx_bytes, rx_dropped, tx_dropped,
-         rx_errors, tx_errors) = struct.unpack_from(
-            ofproto.OFP_PORT_STATS_PACK_STR, buf, offset)
+         rx_errors, tx_errors) = ofproto.OFP_PORT_STATS_STRUCT.unpack_from(
+            buf, offset)
         props = []
         rest = buf[offset + ofproto.OFP_PORT_STATS_SIZE:offset + length]
         while rest:
@@ -4601,9 +4675,8 @@ class OFPPortStatus(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPPortStatus, cls).parser(msg_len, xid, buf)
-        msg.reason = struct.unpack_from(
-            ofproto.OFP_PORT_STATUS_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)[0]
+        msg.reason = ofproto.OFP_PORT_STATUS_STRUCT.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)[0]
         msg.desc = OFPPort.parser(msg.buf, ofproto.OFP_PORT_STATUS_DESC_OFFSET)
         return msg
 
@@ -4676,9 +4749,9 @@ class OFPRoleStatus(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPRoleStatus, cls).parser(msg_len, xid, buf)
-        (msg.role, msg.reason, msg.generation_id) = struct.unpack_from(
-            ofproto.OFP_ROLE_STATUS_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        (msg.role, msg.reason, msg.generation_id) = (
+            ofproto.OFP_ROLE_STATUS_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
 
         msg.properties = []
         rest = msg.buf[ofproto.OFP_ROLE_STATUS_SIZE:]
@@ -4737,8 +4810,8 @@ class OFPTableStatus(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPTableStatus, cls).parser(msg_len, xid, buf)
-        (msg.reason,) = struct.unpack_from(ofproto.OFP_TABLE_STATUS_0_PACK_STR,
-                                           msg.buf, ofproto.OFP_HEADER_SIZE)
+        (msg.reason,) = ofproto.OFP_TABLE_STATUS_0_STRUCT.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)
 
         msg.table = OFPTableDesc.parser(msg.buf,
                                         ofproto.OFP_TABLE_STATUS_0_SIZE)
@@ -4886,8 +4959,9 @@ class OFPControllerStatusStats(StringifyMixin):
 
         (status.length, status.short_id,
          status.role, status.reason,
-         status.channel_status) = struct.unpack_from(
-            ofproto.OFP_CONTROLLER_STATUS_PACK_STR, buf, offset)
+         status.channel_status) = (
+             ofproto.OFP_CONTROLLER_STATUS_STRUCT.unpack_from(
+                 buf, offset))
         offset += ofproto.OFP_CONTROLLER_STATUS_SIZE
 
         status.properties = []
@@ -5090,30 +5164,36 @@ class OFPPacketOut(MsgBase):
         self.data = data
 
     def _serialize_body(self):
+        self._serialize_body_into(self.buf, 0)
+
+    def _serialize_body_into(self, buf, offset):
+        start = offset
         # adjustment
-        offset = ofproto.OFP_PACKET_OUT_0_SIZE
-        match_len = self.match.serialize(self.buf, offset)
+        offset += ofproto.OFP_PACKET_OUT_0_SIZE
+        match_len = self.match.serialize(buf, offset)
         offset += match_len
 
         self.actions_len = 0
         for a in self.actions:
-            a.serialize(self.buf, offset)
+            a.serialize(buf, offset)
             offset += a.len
             self.actions_len += a.len
 
+        msg_pack_into(ofproto.OFP_PACKET_OUT_0_PACK_STR,
+                      buf, start + ofproto.OFP_HEADER_SIZE,
+                      self.buffer_id, self.actions_len)
+
         if self.buffer_id == ofproto.OFP_NO_BUFFER:
             assert self.data is not None
-            if isinstance(self.data, packet.Packet):
-                self.data.serialize()
-                self.buf += self.data.data
-            else:
-                self.buf += self.data
+            data = self.data
+            if isinstance(data, packet.Packet):
+                data.serialize()
+                data = data.data
+            msg_write_into(buf, offset, data)
+            offset += len(data)
         else:
             assert self.data is None
-
-        msg_pack_into(ofproto.OFP_PACKET_OUT_0_PACK_STR,
-                      self.buf, ofproto.OFP_HEADER_SIZE,
-                      self.buffer_id, self.actions_len)
+        return offset
 
     @classmethod
     def from_jsondict(cls, dict_, decode_string=base64.b64decode,
@@ -5133,6 +5213,45 @@ class OFPPacketOut(MsgBase):
         return ins
 
 
+class OFPPacketOutTemplate(ofproto_parser.MsgTemplate):
+    """
+    Pre-serialized packet out
+
+    See ``ofproto_parser.MsgTemplate``. The packet out must have empty
+    data, it's appended by ``serialize()``. The following fields can be
+    patched.
+
+    ================ ======================================================
+    Field            Description
+    ================ ======================================================
+    xid              Transaction id
+    buffer_id        ID assigned by datapath (OFP_NO_BUFFER if none)
+    in_port          ``in_port`` of the match
+    port             Port of the first ``OFPActionOutput``
+    ================ ======================================================
+
+    Example::
+
+        actions = [ofp_parser.OFPActionOutput(ofp.OFPP_FLOOD)]
+        match = ofp_parser.OFPMatch(in_port=ofp.OFPP_CONTROLLER)
+        flood = ofp_parser.OFPPacketOutTemplate(ofp_parser.OFPPacketOut(
+            ofp.OFP_NO_BUFFER, match, actions, data=b''))
+        buf = flood.serialize(pkt_in.data, in_port=in_port)
+    """
+
+    def __init__(self, packet_out):
+        assert not packet_out.data
+        super(OFPPacketOutTemplate, self).__init__(packet_out)
+        self.add_field('buffer_id', '!I', ofproto.OFP_HEADER_SIZE)
+        offset = ofproto.OFP_PACKET_OUT_0_SIZE
+        self.add_field('in_port', '!I', ofproto_parser.oxm_value_offset(
+            self.buf, offset, ofproto.OXM_OF_IN_PORT))
+        (_, match_len) = _OFP_MATCH_HEADER_STRUCT.unpack_from(self.buf, offset)
+        offset += utils.round_up(match_len, 8)
+        self.add_field('port', '!I', _output_port_offset(
+            packet_out.actions, offset))
+
+
 class OFPFlowMod(MsgBase):
     """
     Modify Flow entry message
@@ -5235,22 +5354,26 @@ class OFPFlowMod(MsgBase):
         self.instructions = instructions
 
     def _serialize_body(self):
-        msg_pack_into(ofproto.OFP_FLOW_MOD_PACK_STR0, self.buf,
-                      ofproto.OFP_HEADER_SIZE,
+        self._serialize_body_into(self.buf, 0)
+
+    def _serialize_body_into(self, buf, offset):
+        msg_pack_into(ofproto.OFP_FLOW_MOD_PACK_STR0, buf,
+                      offset + ofproto.OFP_HEADER_SIZE,
                       self.cookie, self.cookie_mask, self.table_id,
                       self.command, self.idle_timeout, self.hard_timeout,
                       self.priority, self.buffer_id, self.out_port,
                       self.out_group, self.flags, self.importance)
 
-        offset = (ofproto.OFP_FLOW_MOD_SIZE -
-                  ofproto.OFP_MATCH_SIZE)
+        offset += (ofproto.OFP_FLOW_MOD_SIZE -
+                   ofproto.OFP_MATCH_SIZE)
 
-        match_len = self.match.serialize(self.buf, offset)
+        match_len = self.match.serialize(buf, offset)
         offset += match_len
 
         for inst in self.instructions:
-            inst.serialize(self.buf, offset)
+            inst.serialize(buf, offset)
             offset += inst.len
+        return offset
 
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
@@ -5259,9 +5382,9 @@ class OFPFlowMod(MsgBase):
         (msg.cookie, msg.cookie_mask, msg.table_id,
          msg.command, msg.idle_timeout, msg.hard_timeout,
          msg.priority, msg.buffer_id, msg.out_port,
-         msg.out_group, msg.flags, msg.importance) = struct.unpack_from(
-            ofproto.OFP_FLOW_MOD_PACK_STR0, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+         msg.out_group, msg.flags,
+         msg.importance) = ofproto.OFP_FLOW_MOD_STRUCT0.unpack_from(
+            msg.buf, ofproto.OFP_HEADER_SIZE)
         offset = ofproto.OFP_FLOW_MOD_SIZE - ofproto.OFP_HEADER_SIZE
 
         msg.match = OFPMatch.parser(buf, offset)
@@ -5277,6 +5400,74 @@ class OFPFlowMod(MsgBase):
         return msg
 
 
+class OFPFlowModTemplate(ofproto_parser.MsgTemplate):
+    """
+    Pre-serialized flow mod
+
+    See ``ofproto_parser.MsgTemplate``. The following fields can be
+    patched.
+
+    ================ ======================================================
+    Field            Description
+    ================ ======================================================
+    xid              Transaction id
+    cookie           Opaque controller-issued identifier
+    idle_timeout     Idle time before discarding (seconds)
+    hard_timeout     Max time before discarding (seconds)
+    priority         Priority level of flow entry
+    buffer_id        Buffered packet to apply to (or OFP_NO_BUFFER)
+    in_port          ``in_port`` of the match, if it has one
+    port             Port of the first ``OFPActionOutput`` of the first
+                     ``OFPInstructionActions`` that has one
+    ================ ======================================================
+
+    Example::
+
+        inst = [ofp_parser.OFPInstructionActions(
+            ofp.OFPIT_APPLY_ACTIONS, [ofp_parser.OFPActionOutput(1)])]
+        tmpl = ofp_parser.OFPFlowModTemplate(ofp_parser.OFPFlowMod(
+            priority=100, match=ofp_parser.OFPMatch(in_port=1),
+            instructions=inst))
+        buf = tmpl.serialize(xid=xid, in_port=in_port, port=out_port)
+    """
+
+    def __init__(self, flow_mod):
+        super(OFPFlowModTemplate, self).__init__(flow_mod)
+        # offsets in OFP_FLOW_MOD_PACK_STR0
+        offset = ofproto.OFP_HEADER_SIZE
+        self.add_field('cookie', '!Q', offset)
+        self.add_field('idle_timeout', '!H', offset + 18)
+        self.add_field('hard_timeout', '!H', offset + 20)
+        self.add_field('priority', '!H', offset + 22)
+        self.add_field('buffer_id', '!I', offset + 24)
+
+        offset = ofproto.OFP_FLOW_MOD_SIZE - ofproto.OFP_MATCH_SIZE
+        self.add_field('in_port', '!I', ofproto_parser.oxm_value_offset(
+            self.buf, offset, ofproto.OXM_OF_IN_PORT))
+        (_, match_len) = _OFP_MATCH_HEADER_STRUCT.unpack_from(self.buf, offset)
+        offset += utils.round_up(match_len, 8)
+
+        port = None
+        for inst in flow_mod.instructions:
+            if isinstance(inst, OFPInstructionActions):
+                port = _output_port_offset(
+                    inst.actions,
+                    offset + ofproto.OFP_INSTRUCTION_ACTIONS_SIZE)
+                if port is not None:
+                    break
+            offset += inst.len
+        self.add_field('port', '!I', port)
+
+
+def _output_port_offset(actions, offset):
+    # offset of the port of the first OFPActionOutput of serialized actions
+    for a in actions:
+        if isinstance(a, OFPActionOutput):
+            return offset + 4
+        offset += a.len
+    return None
+
+
 class OFPInstruction(StringifyMixin):
     _INSTRUCTION_TYPES = {}
 
@@ -5317,9 +5508,9 @@ class OFPInstructionGotoTable(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, table_id) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_GOTO_TABLE_PACK_STR,
-            buf, offset)
+        (type_, len_, table_id) = (
+            ofproto.OFP_INSTRUCTION_GOTO_TABLE_STRUCT.unpack_from(
+                buf, offset))
         return cls(table_id)
 
     def serialize(self, buf, offset):
@@ -5351,9 +5542,9 @@ class OFPInstructionWriteMetadata(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, metadata, metadata_mask) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_WRITE_METADATA_PACK_STR,
-            buf, offset)
+        (type_, len_, metadata, metadata_mask) = (
+            ofproto.OFP_INSTRUCTION_WRITE_METADATA_STRUCT.unpack_from(
+                buf, offset))
         return cls(metadata, metadata_mask)
 
     def serialize(self, buf, offset):
@@ -5394,8 +5585,7 @@ class OFPInstructionActions(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_ACTIONS_PACK_STR,
+        (type_, len_) = ofproto.OFP_INSTRUCTION_ACTIONS_STRUCT.unpack_from(
             buf, offset)
 
         offset += ofproto.OFP_INSTRUCTION_ACTIONS_SIZE
@@ -5454,8 +5644,8 @@ class OFPInstructionStatTrigger(OFPInstruction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, flags) = struct.unpack_from(
-            ofproto.OFP_INSTRUCTION_STAT_TRIGGER_PACK_STR0, buf, offset)
+        stat_trigger = ofproto.OFP_INSTRUCTION_STAT_TRIGGER_STRUCT0
+        (type_, len_, flags) = stat_trigger.unpack_from(buf, offset)
 
         # adjustment
         offset += 8
@@ -5502,8 +5692,8 @@ class OFPAction(OFPActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_ = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        type_, len_ = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._ACTION_TYPES.get(type_)
         assert cls_ is not None
         return cls_.parser(buf, offset)
@@ -5533,8 +5723,9 @@ class OFPActionOutput(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, port, max_len = struct.unpack_from(
-            ofproto.OFP_ACTION_OUTPUT_PACK_STR, buf, offset)
+        type_, len_, port, max_len = (
+            ofproto.OFP_ACTION_OUTPUT_STRUCT.unpack_from(
+                buf, offset))
         return cls(port, max_len)
 
     def serialize(self, buf, offset):
@@ -5563,8 +5754,8 @@ class OFPActionGroup(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, group_id) = struct.unpack_from(
-            ofproto.OFP_ACTION_GROUP_PACK_STR, buf, offset)
+        (type_, len_, group_id) = ofproto.OFP_ACTION_GROUP_STRUCT.unpack_from(
+            buf, offset)
         return cls(group_id)
 
     def serialize(self, buf, offset):
@@ -5594,8 +5785,9 @@ class OFPActionSetQueue(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, queue_id) = struct.unpack_from(
-            ofproto.OFP_ACTION_SET_QUEUE_PACK_STR, buf, offset)
+        (type_, len_, queue_id) = (
+            ofproto.OFP_ACTION_SET_QUEUE_STRUCT.unpack_from(
+                buf, offset))
         return cls(queue_id)
 
     def serialize(self, buf, offset):
@@ -5624,8 +5816,9 @@ class OFPActionSetMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, mpls_ttl) = struct.unpack_from(
-            ofproto.OFP_ACTION_MPLS_TTL_PACK_STR, buf, offset)
+        (type_, len_, mpls_ttl) = (
+            ofproto.OFP_ACTION_MPLS_TTL_STRUCT.unpack_from(
+                buf, offset))
         return cls(mpls_ttl)
 
     def serialize(self, buf, offset):
@@ -5647,8 +5840,8 @@ class OFPActionDecMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -5673,8 +5866,8 @@ class OFPActionSetNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, nw_ttl) = struct.unpack_from(
-            ofproto.OFP_ACTION_NW_TTL_PACK_STR, buf, offset)
+        (type_, len_, nw_ttl) = ofproto.OFP_ACTION_NW_TTL_STRUCT.unpack_from(
+            buf, offset)
         return cls(nw_ttl)
 
     def serialize(self, buf, offset):
@@ -5696,8 +5889,8 @@ class OFPActionDecNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -5716,8 +5909,8 @@ class OFPActionCopyTtlOut(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -5736,8 +5929,8 @@ class OFPActionCopyTtlIn(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -5762,8 +5955,8 @@ class OFPActionPushVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = ofproto.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -5792,8 +5985,8 @@ class OFPActionPushMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = ofproto.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -5815,8 +6008,8 @@ class OFPActionPopVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -5835,8 +6028,9 @@ class OFPActionPopMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_POP_MPLS_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = (
+            ofproto.OFP_ACTION_POP_MPLS_STRUCT.unpack_from(
+                buf, offset))
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -5873,17 +6067,16 @@ class OFPActionSetField(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_SET_FIELD_PACK_STR, buf, offset)
-        (n, value, mask, _len) = ofproto.oxm_parse(buf, offset + 4)
-        k, uv = ofproto.oxm_to_user(n, value, mask)
+        (type_, len_) = ofproto.OFP_ACTION_SET_FIELD_STRUCT.unpack_from(
+            buf, offset)
+        (k, uv, _len) = ofproto.oxm_parse_to_user(buf, offset + 4)
         action = cls(**{k: uv})
         action.len = len_
         return action
 
     def serialize(self, buf, offset):
-        n, value, mask = ofproto.oxm_from_user(self.key, self.value)
-        len_ = ofproto.oxm_serialize(n, value, mask, buf, offset + 4)
+        len_ = ofproto.oxm_serialize_from_user(self.key, self.value, buf,
+                                               offset + 4)
         self.len = utils.round_up(4 + len_, 8)
         msg_pack_into('!HH', buf, offset, self.type, self.len)
         pad_len = self.len - (4 + len_)
@@ -5928,8 +6121,8 @@ class OFPActionPushPbb(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_, ethertype) = ofproto.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -5952,8 +6145,8 @@ class OFPActionPopPbb(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -6000,8 +6193,9 @@ class OFPActionCopyField(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, n_bits, src_offset, dst_offset) = struct.unpack_from(
-            ofproto.OFP_ACTION_COPY_FIELD_PACK_STR, buf, offset)
+        (type_, len_, n_bits, src_offset, dst_offset) = (
+            ofproto.OFP_ACTION_COPY_FIELD_STRUCT.unpack_from(
+                buf, offset))
         offset += ofproto.OFP_ACTION_COPY_FIELD_SIZE
 
         rest = buf[offset:offset + len_]
@@ -6046,8 +6240,8 @@ class OFPActionMeter(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, meter_id = struct.unpack_from(
-            ofproto.OFP_ACTION_METER_PACK_STR, buf, offset)
+        type_, len_, meter_id = ofproto.OFP_ACTION_METER_STRUCT.unpack_from(
+            buf, offset)
         return cls(meter_id)
 
     def serialize(self, buf, offset):
@@ -6084,8 +6278,9 @@ class OFPActionExperimenter(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, experimenter) = struct.unpack_from(
-            ofproto.OFP_ACTION_EXPERIMENTER_HEADER_PACK_STR, buf, offset)
+        (type_, len_, experimenter) = (
+            ofproto.OFP_ACTION_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                buf, offset))
         data = buf[(offset + ofproto.OFP_ACTION_EXPERIMENTER_HEADER_SIZE
                     ): offset + len_]
         if experimenter == ofproto_common.NX_EXPERIMENTER_ID:
@@ -6207,8 +6402,8 @@ class OFPGroupMod(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPGroupMod, cls).parser(msg_len, xid, buf)
         (msg.command, msg.type, msg.group_id, msg.bucket_array_len,
-         msg.command_bucket_id) = struct.unpack_from(
-            ofproto.OFP_GROUP_MOD_PACK_STR, buf, ofproto.OFP_HEADER_SIZE)
+         msg.command_bucket_id) = ofproto.OFP_GROUP_MOD_STRUCT.unpack_from(
+            buf, ofproto.OFP_HEADER_SIZE)
         offset = ofproto.OFP_GROUP_MOD_SIZE
 
         bucket_buf = buf[offset:offset + msg.bucket_array_len]
@@ -6380,8 +6575,9 @@ class OFPGroupBucketPropWeight(OFPGroupBucketProp):
     @classmethod
     def parser(cls, buf):
         prop = cls()
-        (prop.type, prop.length, prop.weight) = struct.unpack_from(
-            ofproto.OFP_GROUP_BUCKET_PROP_WEIGHT_PACK_STR, buf, 0)
+        (prop.type, prop.length, prop.weight) = (
+            ofproto.OFP_GROUP_BUCKET_PROP_WEIGHT_STRUCT.unpack_from(
+                buf, 0))
         return prop
 
     def serialize(self):
@@ -6404,8 +6600,9 @@ class OFPGroupBucketPropWatch(OFPGroupBucketProp):
     @classmethod
     def parser(cls, buf):
         prop = cls()
-        (prop.type, prop.length, prop.watch) = struct.unpack_from(
-            ofproto.OFP_GROUP_BUCKET_PROP_WATCH_PACK_STR, buf, 0)
+        (prop.type, prop.length, prop.watch) = (
+            ofproto.OFP_GROUP_BUCKET_PROP_WATCH_STRUCT.unpack_from(
+                buf, 0))
         return prop
 
     def serialize(self):
@@ -6437,8 +6634,8 @@ class OFPBucket(StringifyMixin):
     def parser(cls, buf, offset):
         msg = cls()
         (msg.len, msg.action_array_len,
-         msg.bucket_id) = struct.unpack_from(
-            ofproto.OFP_BUCKET_PACK_STR, buf, offset)
+         msg.bucket_id) = ofproto.OFP_BUCKET_STRUCT.unpack_from(
+            buf, offset)
         offset += ofproto.OFP_BUCKET_SIZE
 
         action_buf = buf[offset:offset + msg.action_array_len]
@@ -6586,9 +6783,9 @@ class OFPRoleReply(MsgBase):
     @classmethod
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPRoleReply, cls).parser(msg_len, xid, buf)
-        (msg.role, msg.short_id, msg.generation_id) = struct.unpack_from(
-            ofproto.OFP_ROLE_REQUEST_PACK_STR, msg.buf,
-            ofproto.OFP_HEADER_SIZE)
+        (msg.role, msg.short_id, msg.generation_id) = (
+            ofproto.OFP_ROLE_REQUEST_STRUCT.unpack_from(
+                msg.buf, ofproto.OFP_HEADER_SIZE))
         return msg
 
 
@@ -6617,8 +6814,9 @@ class OFPAsyncConfigPropReasons(OFPAsyncConfigProp):
     @classmethod
     def parser(cls, buf):
         reasons = cls()
-        (reasons.type, reasons.length, reasons.mask) = struct.unpack_from(
-            ofproto.OFP_ASYNC_CONFIG_PROP_REASONS_PACK_STR, buf, 0)
+        (reasons.type, reasons.length, reasons.mask) = (
+            ofproto.OFP_ASYNC_CONFIG_PROP_REASONS_STRUCT.unpack_from(
+                buf, 0))
         return reasons
 
     def serialize(self):
@@ -6809,9 +7007,9 @@ class OFPBundleCtrlMsg(MsgBase):
     def parser(cls, msg_len: int, xid: int, buf: bytes) -> Callable:
         msg = super(OFPBundleCtrlMsg, cls).parser(msg_len,
                                                   xid, buf)
-        (bundle_id, type_, flags) = struct.unpack_from(
-            ofproto.OFP_BUNDLE_CTRL_MSG_PACK_STR, buf,
-            ofproto.OFP_HEADER_SIZE)
+        (bundle_id, type_, flags) = (
+            ofproto.OFP_BUNDLE_CTRL_MSG_STRUCT.unpack_from(
+                buf, ofproto.OFP_HEADER_SIZE))
         msg.bundle_id = bundle_id
         msg.type = type_
         msg.flags = flags
@@ -6910,6 +7108,7 @@ def _register_classes() -> None:
         if msg_type > -1:
             if msg_type not in _classes:
                 _classes[msg_type] = cls[1]
+    ofproto_parser.register_msg_classes(ofproto.OFP_VERSION, _classes)
 
 
 _register_classes()
@@ -6920,4 +7119,4 @@ def from_type(msg_type: int, *args, **kwargs) -> None:
     try:
         return _classes[msg_type]
     except KeyError:
-        raise FluxoryError("Unsupported msg_type {msg_type}")
+        raise FluxoryError(f"Unsupported msg_type {msg_type}")
@@ -75,8 +75,12 @@ from fluxory.ofproto.oxx_fields import (
     _parse,
     _parse_header,
     _serialize,
-    _serialize_header)
+    _serialize_header,
+    _make_codecs,
+    _parse_to_user,
+    _serialize_from_user)
 from fluxory.ofproto import ofproto_common
+from fluxory.lib import addrconv
 
 
 from fluxory.lib.type_desc import IPv4Addr, IPv6Addr, IntDescr, MacAddr
@@ -182,6 +186,7 @@ def generate(modname: str) -> None:
     oxx = 'oxm'
     name_to_field = dict((f.name, f) for f in mod.oxm_types)
     num_to_field = dict((f.num, f) for f in mod.oxm_types)
+    header_to_codec, name_to_codec = _make_codecs(oxx, mod.oxm_types)
 
     # create functions by using oxx_fields module.
     add_attr('oxm_get_field_info_by_name',
@@ -206,6 +211,11 @@ def generate(modname: str) -> None:
              functools.partial(_serialize, oxx, mod))
     add_attr('oxm_serialize_header',
              functools.partial(_serialize_header, oxx, mod))
+    add_attr('oxm_parse_to_user',
+             functools.partial(_parse_to_user, oxx, mod, header_to_codec))
+    add_attr('oxm_serialize_from_user',
+             functools.partial(_serialize_from_user, oxx, mod,
+                               name_to_codec))
 
     add_attr('oxm_to_jsondict', _to_jsondict)
     add_attr('oxm_from_jsondict', _from_jsondict)
@@ -217,6 +227,10 @@ def _to_jsondict(k, uv):
     else:
         value = uv
         mask = None
+    if isinstance(value, addrconv.AddrInt):
+        value = str(value)
+    if isinstance(mask, addrconv.AddrInt):
+        mask = str(mask)
     return {"OXMTlv": {"field": k, "value": value, "mask": mask}}
 
 
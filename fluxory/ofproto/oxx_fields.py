@@ -27,7 +27,8 @@ import six
 import struct
 
 from fluxory.ofproto import ofproto_common
-from fluxory.lib.pack_utils import msg_pack_into
+from fluxory.lib.pack_utils import msg_pack_into, msg_write_into
+from fluxory.lib import addrconv
 from fluxory.lib import type_desc
 
 if six.PY3:
@@ -39,6 +40,10 @@ else:
 # This is transparently value for Experimenter class ID for OXM/OXS.
 OFPXXC_EXPERIMENTER = 0xffff
 
+_HEADER_STRUCT = struct.Struct('!I')
+_EXP_ID_STRUCT = struct.Struct('!I')  # experimenter_id
+_ONF_EXP_TYPE_STRUCT = struct.Struct('!H')
+
 
 def _get_field_info_by_name(oxx, name_to_field, name):
     try:
@@ -141,9 +146,8 @@ def _normalize_user(oxx, mod, k, uv):
 
 
 def _parse_header_impl(mod, buf, offset):
-    hdr_pack_str = '!I'
-    (header, ) = struct.unpack_from(hdr_pack_str, buf, offset)
-    hdr_len = struct.calcsize(hdr_pack_str)
+    (header, ) = _HEADER_STRUCT.unpack_from(buf, offset)
+    hdr_len = _HEADER_STRUCT.size
     oxx_type = header >> 9  # class|field
     oxm_hasmask = mod.oxm_tlv_header_extract_hasmask(header)
     oxx_class = oxx_type >> 7
@@ -151,19 +155,16 @@ def _parse_header_impl(mod, buf, offset):
     if oxx_class == OFPXXC_EXPERIMENTER:
         # Experimenter OXMs/OXSs have 64-bit header.
         # (vs 32-bit for other OXMs/OXSs)
-        exp_hdr_pack_str = '!I'  # experimenter_id
-        (exp_id, ) = struct.unpack_from(exp_hdr_pack_str, buf,
-                                        offset + hdr_len)
-        exp_hdr_len = struct.calcsize(exp_hdr_pack_str)
+        (exp_id, ) = _EXP_ID_STRUCT.unpack_from(buf, offset + hdr_len)
+        exp_hdr_len = _EXP_ID_STRUCT.size
         assert exp_hdr_len == 4
         oxx_field = oxx_type & 0x7f
         if exp_id == ofproto_common.ONF_EXPERIMENTER_ID and oxx_field == 0:
             # XXX
             # This block implements EXT-256 style experimenter OXM.
-            onf_exp_type_pack_str = '!H'
-            (exp_type, ) = struct.unpack_from(onf_exp_type_pack_str, buf,
-                                              offset + hdr_len + exp_hdr_len)
-            exp_hdr_len += struct.calcsize(onf_exp_type_pack_str)
+            (exp_type, ) = _ONF_EXP_TYPE_STRUCT.unpack_from(
+                buf, offset + hdr_len + exp_hdr_len)
+            exp_hdr_len += _ONF_EXP_TYPE_STRUCT.size
             assert exp_hdr_len == 4 + 2
             num = (exp_id, exp_type)
         else:
@@ -192,12 +193,12 @@ def _parse(mod, buf, offset):
     # Note: OXM/OXS payload length (oxx_len) includes Experimenter ID
     # (exp_hdr_len) for experimenter OXMs/OXSs.
     value_offset = offset + total_hdr_len
-    value_pack_str = '!%ds' % value_len
-    assert struct.calcsize(value_pack_str) == value_len
-    (value, ) = struct.unpack_from(value_pack_str, buf, value_offset)
+    if offset + field_len > len(buf):
+        raise struct.error('truncated oxm/oxs at offset %d' % offset)
+    mask_offset = value_offset + value_len
+    value = bytes(buf[value_offset:mask_offset])
     if hasmask:
-        (mask, ) = struct.unpack_from(value_pack_str, buf,
-                                      value_offset + value_len)
+        mask = bytes(buf[mask_offset:mask_offset + value_len])
     else:
         mask = None
     return oxx_type_num, value, mask, field_len
@@ -263,3 +264,129 @@ def _serialize(oxx, mod, n, value, mask, buf, offset):
                       (n << 9) | (0 << 8) | (exp_hdr_len + value_len),
                       bytes(exp_hdr), value)
     return struct.calcsize(pack_str)
+
+
+# Table-driven fast path.
+#
+# Fields with a plain 32-bit header (i.e. every class but experimenter)
+# get a codec precomputed by _make_codecs.  Parsing looks the codec up by
+# the whole on-wire header, which also pins the payload length and the
+# hasmask bit, so a hit can be sliced and converted without any further
+# checks.  Anything else (experimenter fields, unknown fields, unexpected
+# lengths) goes through the generic _parse/_to_user and
+# _from_user/_serialize functions above.
+
+def _int_to_user(binary):
+    return int.from_bytes(binary, 'big')
+
+
+def _mac_to_user(binary):
+    # same text as addrconv.mac.bin_to_text
+    return binary.hex(':')
+
+
+def _ipv4_to_user(binary):
+    # same text as addrconv.ipv4.bin_to_text
+    return '%d.%d.%d.%d' % tuple(binary)
+
+
+_TO_USER = {
+    type_desc.MacAddr: _mac_to_user,
+    type_desc.IPv4Addr: _ipv4_to_user,
+}
+
+_TO_USER_INT = {
+    type_desc.MacAddr: addrconv.mac.bin_to_int,
+    type_desc.IPv4Addr: addrconv.ipv4.bin_to_int,
+    type_desc.IPv6Addr: addrconv.ipv6.bin_to_int,
+}
+
+
+def _make_codecs(oxx, fields):
+    """Build (header_to_codec, name_to_codec) tables for fields."""
+    header_to_codec = {}
+    name_to_codec = {}
+    for f in fields:
+        if isinstance(f.num, tuple) or not hasattr(f.type, 'size'):
+            continue
+        size = f.type.size
+        oxx_type = getattr(f, oxx + '_type')
+        header = (oxx_type << 9) | size
+        header_w = (oxx_type << 9) | (1 << 8) | (size * 2)
+        if isinstance(f.type, type_desc.IntDescr):
+            # the codec already checked the length
+            to_user = _int_to_user
+            from_user = f.type.from_user
+            user_types = six.integer_types
+        elif isinstance(f.type, type_desc.IntDescrMlt):
+            to_user = f.type.to_user
+            from_user = None
+        else:
+            to_user = _TO_USER.get(f.type, f.type.to_user)
+            from_user = f.type.from_user
+            user_types = six.string_types + six.integer_types
+        to_user_int = _TO_USER_INT.get(f.type, to_user)
+        header_to_codec[header] = (f.name, size, False, to_user, to_user_int)
+        header_to_codec[header_w] = (f.name, size, True, to_user,
+                                     to_user_int)
+        if from_user is not None:
+            name_to_codec[f.name] = (_HEADER_STRUCT.pack(header),
+                                     _HEADER_STRUCT.pack(header_w),
+                                     user_types, from_user)
+    return header_to_codec, name_to_codec
+
+
+def _parse_to_user(oxx, mod, header_to_codec, buf, offset,
+                   int_addrs=False):
+    """Parse the field at offset and return (name, user_value, len).
+
+    With int_addrs, address fields are returned as addrconv.AddrInt.
+    """
+    (header, ) = _HEADER_STRUCT.unpack_from(buf, offset)
+    codec = header_to_codec.get(header)
+    if codec is None:
+        (n, value, mask, field_len) = _parse(mod, buf, offset)
+        to_user = getattr(mod, oxx + '_to_user')
+        (name, user_value) = to_user(n, value, mask)
+        return name, user_value, field_len
+    (name, size, hasmask, to_user, to_user_int) = codec
+    if int_addrs:
+        to_user = to_user_int
+    value_offset = offset + 4
+    field_len = 4 + (size * 2 if hasmask else size)
+    if offset + field_len > len(buf):
+        raise struct.error('truncated oxm/oxs at offset %d' % offset)
+    value = to_user(bytes(buf[value_offset:value_offset + size]))
+    if not hasmask:
+        return name, value, field_len
+    mask_offset = value_offset + size
+    mask = to_user(bytes(buf[mask_offset:mask_offset + size]))
+    return name, (value, mask), field_len
+
+
+def _serialize_from_user(oxx, mod, name_to_codec, name, user_value,
+                         buf, offset):
+    """Serialize a (name, user_value) field at offset and return its len."""
+    codec = name_to_codec.get(name)
+    if codec is not None:
+        (header, header_w, user_types, from_user) = codec
+        if isinstance(user_value, (tuple, list)):
+            (value, mask) = user_value
+        else:
+            (value, mask) = (user_value, None)
+        data = None
+        if isinstance(value, user_types):
+            value = from_user(value)
+            if mask is None:
+                if isinstance(value, bytes):
+                    data = header + value
+            elif isinstance(mask, user_types):
+                mask = from_user(mask)
+                if isinstance(value, bytes) and isinstance(mask, bytes):
+                    data = header_w + value + mask
+        if data is not None:
+            msg_write_into(buf, offset, data)
+            return len(data)
+    from_user = getattr(mod, oxx + '_from_user')
+    (n, value, mask) = from_user(name, user_value)
+    return _serialize(oxx, mod, n, value, mask, buf, offset)
@@ -1,8 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import Union
+from typing import List, Union
 from fluxory.ofproto.ofproto_parser import MsgBase
+from fluxory.lib.pack_utils import msg_pack_into
 from struct import pack, unpack
 
 
@@ -73,20 +74,56 @@ class CtlOFPEvent(QueueEvent):
         else:
             return f"CtlOFPEvent{QueueEvent._separator}#"
 
+    @classmethod
+    def dpid_wildcard(self, dpid: int) -> str:
+        """Get the wildcard of every message type of a dpid."""
+        return f"CtlOFPEvent{QueueEvent._separator}*{QueueEvent._separator}{dpid}"
+
 
 class AppOFPEvent(QueueEvent):
 
     """OpenFlow messagges from Ryum Apps to the Controller. """
 
-    def __init__(self, msg: MsgBase, dpid: int = 0) -> None:
-        """Constructor of AppOFPEvent."""
+    def __init__(self, msg: MsgBase, dpid: int = 0, *msgs: MsgBase) -> None:
+        """Constructor of AppOFPEvent.
+
+        Additional msgs are concatenated after msg in the same payload.
+        """
         assert msg.buf
         payload = bytearray(pack("!Q", dpid) + msg.buf)
+        for m in msgs:
+            assert m.buf
+            payload += m.buf
         super().__init__(
             f"{self.__class__.__name__}.{str(msg.version)}.{str(msg.msg_type)}",
             payload=payload,
         )
 
+    @classmethod
+    def from_msgs(
+        cls, dpid: int, msgs: List[MsgBase], buf: bytearray = None
+    ) -> "AppOFPEvent":
+        """Build an AppOFPEvent serializing msgs straight into its payload.
+
+        A reusable, pre-sized buf can be given, it's overwritten in place
+        and only grows if the messages don't fit. In that case the payload
+        is a memoryview of buf up to the end of the last message, so buf
+        shouldn't be reused while the event is still in use.
+        """
+        payload = buf if buf is not None else bytearray()
+        msg_pack_into("!Q", payload, 0, dpid)
+        offset = 8
+        for msg in msgs:
+            offset = msg.serialize_into(payload, offset)
+        if offset < len(payload):
+            payload = memoryview(payload)[:offset]
+        event = cls.__new__(cls)
+        QueueEvent.__init__(
+            event, cls.__name__, str(msgs[0].version), str(msgs[0].msg_type),
+            payload=payload
+        )
+        return event
+
     @classmethod
     def decode(self, payload: bytes) -> (int, bytes):
         """Decode the dpid number and serialized message (payload)."""
@@ -97,7 +134,7 @@ class AppOFPEvent(QueueEvent):
         """Get queue wildcard."""
         if version:
             return (
-                f"AppOFPEvent{QueueEvent._separator}{version}.{QueueEvent._separator}#"
+                f"AppOFPEvent{QueueEvent._separator}{version}{QueueEvent._separator}#"
             )
         else:
             return f"AppOFPEvent{QueueEvent._separator}#"
@@ -107,6 +144,10 @@ class CtlTEvent(QueueEvent):
 
     """Generic T messages from the Controller to Ryum Apps. """
 
+    # published as CtlTEvent.SwitchConnected.<dpid> once a switch handshake
+    # completes, see handleFeaReply in pkg/controller.go
+    switch_connected = "SwitchConnected"
+
     def __init__(self, event_name: str, payload: bytes = b"") -> None:
         """Constructor of CtlTEvent."""
         super().__init__(f"{self.__class__.__name__}.{event_name}", payload=payload)
@@ -116,6 +157,18 @@ class CtlTEvent(QueueEvent):
         """Get queue wildcard."""
         return f"CtlTEvent{QueueEvent._separator}#"
 
+    @classmethod
+    def switch_connected_dpid(self, routing_key: str) -> Union[int, None]:
+        """Get the dpid of a SwitchConnected event routing key, None if the
+        routing key is of another event."""
+        prefix = (
+            f"CtlTEvent{QueueEvent._separator}{self.switch_connected}"
+            f"{QueueEvent._separator}"
+        )
+        if not routing_key.startswith(prefix):
+            return None
+        return int(routing_key[len(prefix):])
+
 
 class AppTEvent(QueueEvent):
 
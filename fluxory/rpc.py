@@ -3,15 +3,20 @@
 
 from aio_pika.patterns import RPC
 import json
-from typing import Dict, List, Any
+from struct import Struct
+from typing import Dict, List, Any, Union
 
 
 class RequestRawRPC(object):
 
     """Abstract a RPC Request encoding. """
 
-    def __init__(self, dpid: int, payload=List[int]) -> None:
-        """Constructor of RequestRPC."""
+    def __init__(self, dpid: int, payload: Union[List[int], bytes]) -> None:
+        """Constructor of RequestRPC.
+
+        The payload can be either a list of ints or the raw bytes of a
+        serialized OpenFlow message.
+        """
         self.dpid = dpid
         self.payload = payload
 
@@ -56,8 +61,43 @@ class JsonRPC(RPC):
     SERIALIZER = json
     CONTENT_TYPE = "application/json"
 
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            return list(bytes(obj))
+        raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
     def serialize(self, data: Any) -> bytes:
-        return self.SERIALIZER.dumps(data).encode()
+        return self.SERIALIZER.dumps(data, default=self._default).encode()
 
     def deserialize(self, data: bytes) -> Any:
         return self.SERIALIZER.loads(data)
+
+
+class BinaryRPC(JsonRPC):
+
+    """Binary RPC serializer.
+
+    RequestRawRPC dicts are framed as a zero byte, the 64-bit dpid and the
+    raw OpenFlow payload. The controller picks the framing by the message
+    content type. Everything else, including the controller responses,
+    is still JSON, which never starts with a zero byte.
+    """
+
+    CONTENT_TYPE = "application/x-fluxory-raw"
+    RAW_TAG = b"\x00"
+    DPID_STRUCT = Struct("!Q")
+
+    def serialize(self, data: Any) -> bytes:
+        if isinstance(data, dict) and data.keys() == {"dpid", "payload"}:
+            return b"".join(
+                (self.RAW_TAG, self.DPID_STRUCT.pack(data["dpid"]), bytes(data["payload"]))
+            )
+        return super().serialize(data)
+
+    def deserialize(self, data: bytes) -> Any:
+        if data[:1] == self.RAW_TAG:
+            offset = len(self.RAW_TAG)
+            (dpid,) = self.DPID_STRUCT.unpack_from(data, offset)
+            return {"dpid": dpid, "payload": data[offset + self.DPID_STRUCT.size:]}
+        return super().deserialize(data)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from logging import getLogger
+from typing import Callable, List, Optional
+from fluxory.app import App
+
+
+log = getLogger(__name__)
+
+# delay before restarting a worker that died, doubled on each crash up to
+# RESTART_DELAY_MAX and reset once a worker stays up for RESTART_DELAY_MAX
+RESTART_DELAY = 1.0
+RESTART_DELAY_MAX = 60.0
+
+
+async def _worker_main(factory: Callable[[], App], worker_id: int, workers: int) -> None:
+    """Run one sharded App until it's cancelled.
+
+    A failure to connect to the broker is raised, so that the worker
+    process exits and the supervisor restarts it.
+    """
+    app = factory()
+    app.set_shard(worker_id, workers)
+    await app.run()
+    while True:
+        await asyncio.sleep(1)
+
+
+def _worker(factory: Callable[[], App], worker_id: int, workers: int) -> None:
+    """Worker process entry point."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_worker_main(factory, worker_id, workers))
+
+
+def run_sharded(factory: Callable[[], App], workers: int = 0) -> None:
+    """Supervise worker processes of the same App sharded by dpid.
+
+    Each worker builds its own App through factory, so per-worker state
+    such as learning tables stays local to the process, and consumes only
+    the CtlOFPEvents of the dpids that the consistent hash ring assigns
+    to it. Workers that die are restarted with an exponential backoff.
+    """
+    workers = workers or os.cpu_count() or 1
+    ctx = multiprocessing.get_context("fork")
+    procs: List[multiprocessing.Process] = [None] * workers
+    started: List[float] = [0.0] * workers
+    delays: List[float] = [RESTART_DELAY] * workers
+    restart_at: List[Optional[float]] = [None] * workers
+
+    def start(worker_id: int) -> None:
+        proc = ctx.Process(
+            target=_worker,
+            args=(factory, worker_id, workers),
+            name=f"fluxory-worker-{worker_id}",
+        )
+        proc.start()
+        procs[worker_id] = proc
+        started[worker_id] = time.monotonic()
+        restart_at[worker_id] = None
+        log.info(f"Started worker {worker_id}/{workers} pid {proc.pid}")
+
+    for worker_id in range(workers):
+        start(worker_id)
+    try:
+        while True:
+            for worker_id, proc in enumerate(procs):
+                proc.join(timeout=1.0 / workers)
+                if proc.is_alive():
+                    continue
+                now = time.monotonic()
+                if restart_at[worker_id] is None:
+                    if now - started[worker_id] >= RESTART_DELAY_MAX:
+                        delays[worker_id] = RESTART_DELAY
+                    delay = delays[worker_id]
+                    delays[worker_id] = min(delay * 2, RESTART_DELAY_MAX)
+                    restart_at[worker_id] = now + delay
+                    log.error(
+                        f"Worker {worker_id} exited with code {proc.exitcode}, "
+                        f"restarting it in {delay:.1f}s"
+                    )
+                elif now >= restart_at[worker_id]:
+                    start(worker_id)
+                    continue
+                time.sleep(1.0 / workers)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for proc in procs:
+            proc.join()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from bisect import bisect
+from typing import Iterable, List
+from zlib import crc32
+
+
+class HashRing(object):
+
+    """Consistent hash ring mapping dpids to worker ids. """
+
+    def __init__(self, nodes: Iterable[int], replicas: int = 128) -> None:
+        """Constructor of HashRing."""
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._nodes: List[int] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return crc32(key.encode())
+
+    def add(self, node: int) -> None:
+        """Add a node with its virtual replicas to the ring."""
+        for i in range(self.replicas):
+            point = self._hash(f"{node}-{i}")
+            idx = bisect(self._points, point)
+            self._points.insert(idx, point)
+            self._nodes.insert(idx, node)
+
+    def remove(self, node: int) -> None:
+        """Remove a node and its virtual replicas from the ring."""
+        keep = [(p, n) for (p, n) in zip(self._points, self._nodes) if n != node]
+        self._points = [p for (p, _) in keep]
+        self._nodes = [n for (_, n) in keep]
+
+    def get(self, dpid: int) -> int:
+        """Get the node that owns a dpid."""
+        if not self._points:
+            raise KeyError("The HashRing is empty")
+        idx = bisect(self._points, self._hash(str(dpid))) % len(self._points)
+        return self._nodes[idx]
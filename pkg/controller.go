@@ -1,8 +1,10 @@
 package pkg
 
 import (
+	"encoding/binary"
 	"encoding/json"
 	"fmt"
+	"sync"
 	"time"
 
 	log "github.com/sirupsen/logrus"
@@ -18,6 +20,7 @@ type Controller struct {
 	xidsOut   map[XidPair]XidResp
 	bh        BrokerHandler
 	enableRPC bool
+	appXids   *sync.Map
 }
 
 func NewController(enableRPC bool, netAddress string, versions ...int) Controller {
@@ -29,7 +32,12 @@ func NewController(enableRPC bool, netAddress string, versions ...int) Controlle
 		xidInitialCap int = 1000
 	)
 	xidsOut := make(map[XidPair]XidResp, xidInitialCap)
-	return Controller{NewTCPServer(netAddress), vmap, xidsOut, NewBrokerHandler(), enableRPC}
+	appXids := &sync.Map{}
+	server := NewTCPServer(netAddress)
+	server.onDisconnect = func(sw *SwitchConn) {
+		clearAppXids(appXids, sw.NetAddress)
+	}
+	return Controller{server, vmap, xidsOut, NewBrokerHandler(), enableRPC, appXids}
 }
 
 func (c *Controller) Versions() []int {
@@ -104,6 +112,7 @@ func (c *Controller) handleFeaReply(sw *SwitchConn, version uint8, data []byte)
 	}
 	c.Dpids[sw.Dpid] = sw
 	log.Infof("Completed OFP Handshake with %v dpid %v", sw.NetAddress, sw.Dpid)
+	c.publishSwitchConnected(sw.Dpid)
 }
 
 func (c Controller) Run() error {
@@ -117,6 +126,7 @@ func (c Controller) Run() error {
 		log.Fatalf("%v", err)
 	}
 	c.declarePubQueues()
+	c.consumeAppQueue()
 	err = c.ServeForever()
 	// TODO stop goroutines..
 	return err
@@ -147,6 +157,31 @@ func (c Controller) publish(dpid uint64, msg_type uint8, payload []byte) {
 	failOnError(err, "Failed to publish a message")
 }
 
+// publishSwitchConnected publishes a CtlTEvent.SwitchConnected.<dpid>
+// event, whose payload is the 64-bit dpid, so that sharded Apps bind the
+// OpenFlow events of a switch as soon as its handshake completes.
+func (c Controller) publishSwitchConnected(dpid uint64) {
+	log.Debugf("Publishing SwitchConnected dpid: %v", dpid)
+	conn, err := amqp.Dial(c.bh.fullAddress)
+	failOnError(err, "Failed to Dial")
+	defer conn.Close()
+	ch, err := conn.Channel()
+	failOnError(err, "Failed to create a channel")
+	payload := make([]byte, 8)
+	binary.BigEndian.PutUint64(payload, dpid)
+	err = ch.Publish(
+		"fluxory", // exchange
+		fmt.Sprintf("CtlTEvent.SwitchConnected.%d", dpid), // routing key
+		false, // mandatory
+		false,
+		amqp.Publishing{
+			DeliveryMode: amqp.Persistent,
+			ContentType:  "text/plain",
+			Body:         payload,
+		})
+	failOnError(err, "Failed to publish a message")
+}
+
 func (c Controller) declarePubQueues() {
 	log.Info("Declaring PubQueues")
 
@@ -182,6 +217,105 @@ func (c Controller) declarePubQueues() {
 	failOnError(err, "Failed to bind a queue")
 }
 
+func (c Controller) consumeAppQueue() {
+	log.Info("Consuming AppOFPEvents")
+
+	conn, err := amqp.Dial(c.bh.fullAddress)
+	failOnError(err, "Failed to Dial")
+	ch, err := conn.Channel()
+	failOnError(err, "Failed to create a channel")
+	q, err := ch.QueueDeclare(
+		"AppOFPEvent", // name
+		false,         // durable
+		false,         // delete when usused
+		true,          // exclusive
+		false,         // no-wait
+		nil,           // arguments
+	)
+	failOnError(err, "Failed to declare a queue")
+	err = ch.QueueBind(
+		q.Name,          // queue name
+		"AppOFPEvent.#", // routing key
+		"fluxory",       // exchange
+		false,
+		nil)
+	failOnError(err, "Failed to bind a queue")
+	msgs, err := ch.Consume(
+		q.Name, // queue
+		"",     // consumer
+		true,   // auto-ack
+		true,   // exclusive
+		false,  // no-local
+		false,  // no-wait
+		nil,    // args
+	)
+	failOnError(err, "Failed to consume a queue")
+	go func() {
+		for d := range msgs {
+			c.writeAppMsg(d.Body)
+		}
+	}()
+}
+
+// writeAppMsg writes an AppOFPEvent payload, which is the 64-bit dpid
+// followed by one or more concatenated OpenFlow messages, to its switch.
+// The xids of requests are recorded so that their replies are published
+// back to the Apps.
+func (c Controller) writeAppMsg(body []byte) {
+	if len(body) < 8 {
+		log.Errorf("Invalid AppOFPEvent payload %v", body)
+		return
+	}
+	dpid := binary.BigEndian.Uint64(body[:8])
+	payload := body[8:]
+	sw, ok := c.Dpids[dpid]
+	if !ok {
+		log.Errorf("Dpid %v not found", dpid)
+		return
+	}
+	ofpMsg := ofp.Header{}
+	for offset := 0; offset < len(payload); offset += int(ofpMsg.Length) {
+		err := ofpMsg.Decode(payload[offset:])
+		if err != nil || ofpMsg.Length == 0 {
+			log.Errorf("Couldn't decode message %v", payload[offset:])
+			return
+		}
+		if ofp.ExpectedType(ofpMsg.Type) != ofpMsg.Type {
+			c.appXids.Store(XidPair{sw.NetAddress, ofpMsg.Xid}, true)
+		}
+	}
+	err := sw.WriteRaw(payload)
+	if err != nil {
+		log.Errorf("Couldn't write raw bytes, error: %v", err)
+	}
+}
+
+// isAppReply checks if a message replies to a request sent by an App.
+// A reply or an OFPT_ERROR ends the request, except for the segments of a
+// multipart reply before the last one.
+func (c Controller) isAppReply(xidPair XidPair, msgType uint8, data []byte) bool {
+	if _, ok := c.appXids.Load(xidPair); !ok {
+		return false
+	}
+	// multipart replies keep the xid until the last segment
+	more := msgType == ofp.OFPT_MULTIPART_REPLY && len(data) >= 12 &&
+		binary.BigEndian.Uint16(data[10:12])&ofp.OFPMPF_REPLY_MORE != 0
+	if !more {
+		c.appXids.Delete(xidPair)
+	}
+	return true
+}
+
+// clearAppXids drops the pending App requests of a switch.
+func clearAppXids(appXids *sync.Map, netAddress string) {
+	appXids.Range(func(key, _ interface{}) bool {
+		if key.(XidPair).NetAddress == netAddress {
+			appXids.Delete(key)
+		}
+		return true
+	})
+}
+
 func (c Controller) registerRPCMethods() error {
 	log.Info("Registering RPC methods")
 	err := c.listSwitchesRPC()
@@ -249,7 +383,11 @@ func (c Controller) WriteDpidRPC() error {
 			log.Debugf("ReplyTo: %s", string(d.ReplyTo))
 
 			var rpcRes RPCRequest
-			err = json.Unmarshal(d.Body, &rpcRes)
+			if d.ContentType == RawRPCContentType {
+				err = rpcRes.DecodeRaw(d.Body)
+			} else {
+				err = json.Unmarshal(d.Body, &rpcRes)
+			}
 			if err != nil {
 				log.Errorf("Couldn't Unmarshal %v", d.Body)
 				continue
@@ -367,7 +505,9 @@ func (c Controller) fetchInQueue() {
 			sw.UpdateRespTime(&res.Sent)
 			delete(c.xidsOut, *xidPair)
 		}
-		if ofp.IsAsymmetric(ofpMsg.Type) {
+		// isAppReply goes first so that errors of App requests end them
+		appReply := c.isAppReply(*xidPair, ofpMsg.Type, msg.Data)
+		if appReply || ofp.IsAsymmetric(ofpMsg.Type) {
 			c.publish(sw.Dpid, ofpMsg.Type, msg.Data[:ofpMsg.Length])
 		}
 		sw.LastSeen = time.Now()
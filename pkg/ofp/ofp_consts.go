@@ -71,6 +71,11 @@ const (
 	OFPT_METER_MOD = 29
 )
 
+// Multipart reply flags
+const (
+	OFPMPF_REPLY_MORE = 1 << 0
+)
+
 // Match oxm type
 const (
 	OFPMT_STANDARD = iota
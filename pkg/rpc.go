@@ -1,7 +1,9 @@
 package pkg
 
 import (
+	"encoding/binary"
 	"encoding/json"
+	"fmt"
 
 	log "github.com/sirupsen/logrus"
 	"github.com/streadway/amqp"
@@ -75,3 +77,17 @@ func (b BrokerHandler) NewRPCQueue(name string) (*amqp.Channel, <-chan amqp.Deli
 	)
 	return ch, msgs, err
 }
+
+// RawRPCContentType is the content type of binary framed RPC requests.
+const RawRPCContentType = "application/x-fluxory-raw"
+
+// DecodeRaw decodes a binary framed RPC request, which is a zero byte,
+// the 64-bit dpid in network byte order and the raw OpenFlow payload.
+func (r *RPCRequest) DecodeRaw(body []byte) error {
+	if len(body) < 9 || body[0] != 0 {
+		return fmt.Errorf("invalid raw RPC request of %d bytes", len(body))
+	}
+	r.Dpid = int(binary.BigEndian.Uint64(body[1:9]))
+	r.Payload = body[9:]
+	return nil
+}
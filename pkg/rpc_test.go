@@ -24,3 +24,17 @@ func TestRPCResponse(t *testing.T) {
 		assert.Equal(m["foo"], res["foo"])
 	}
 }
+
+func TestRPCRequestDecodeRaw(t *testing.T) {
+	assert := assert.New(t)
+
+	body := []byte{0, 0, 0, 0, 0, 0, 0, 1, 2, 6, 20, 0, 8, 0, 0, 0, 1}
+	var req RPCRequest
+	err := req.DecodeRaw(body)
+	assert.Nil(err)
+	assert.Equal(258, req.Dpid)
+	assert.Equal([]byte{6, 20, 0, 8, 0, 0, 0, 1}, req.Payload)
+
+	err = req.DecodeRaw([]byte("{}"))
+	assert.NotNil(err)
+}
@@ -18,13 +18,15 @@ type TCPServer struct {
 	Clients    map[string]*SwitchConn
 	Dpids      map[uint64]*SwitchConn
 	inQueue    chan Message
+	// onDisconnect is called with each switch that disconnects
+	onDisconnect func(sw *SwitchConn)
 }
 
 func NewTCPServer(netAddress string) TCPServer {
 	const (
 		initialCap int = 100
 	)
-	return TCPServer{netAddress, make(map[string]*SwitchConn, initialCap), make(map[uint64]*SwitchConn), make(chan Message)}
+	return TCPServer{netAddress, make(map[string]*SwitchConn, initialCap), make(map[uint64]*SwitchConn), make(chan Message), nil}
 }
 
 func (s TCPServer) ServeForever() (err error) {
@@ -51,6 +53,9 @@ func (s *TCPServer) DelSwitch(sw *SwitchConn) {
 	delete(s.Dpids, sw.Dpid)
 	delete(s.Clients, sw.NetAddress)
 	sw.C.Close()
+	if s.onDisconnect != nil {
+		s.onDisconnect(sw)
+	}
 }
 
 func (s TCPServer) handleConnection(c net.Conn) {
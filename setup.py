@@ -14,6 +14,7 @@ setup(
     packages=['fluxory'],
     license='Apache',
     install_requires=['nose>=1.3.7', 'pytest>=4.3.0', 'aio-pika>=5.2.3', 'netaddr>=0.7.19'],
+    extras_require={'numpy': ['numpy>=1.17']},
     classifiers=[
         'Programming Language :: Python :: 3.7',
         'Operating System :: POSIX :: Linux',
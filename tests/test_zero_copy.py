@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Copies of the received body made while parsing a packet in."""
+
+import struct
+import tracemalloc
+
+import pytest
+
+from fluxory.ofproto import ofproto_parser
+from fluxory.ofproto import ofproto_v1_3, ofproto_v1_3_parser
+from fluxory.ofproto import ofproto_v1_5, ofproto_v1_5_parser
+
+# a jumbo frame makes copies of the body stand out of other allocations
+PAYLOAD = 9000
+VERSIONS = [
+    (ofproto_v1_3, ofproto_v1_3_parser),
+    (ofproto_v1_5, ofproto_v1_5_parser),
+]
+
+
+def packet_in(ofproto, ofparser, data: bytes) -> bytes:
+    """Build a serialized OFPPacketIn as a switch would send it."""
+    match = ofparser.OFPMatch(in_port=3)
+    buf = bytearray(ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE)
+    match.serialize(buf, len(buf))
+    buf += b"\x00\x00" + data
+    struct.pack_into(ofproto.OFP_PACKET_IN_PACK_STR, buf,
+                     ofproto.OFP_HEADER_SIZE, ofproto.OFP_NO_BUFFER,
+                     len(data), 0, 0, 0)
+    struct.pack_into(ofproto.OFP_HEADER_PACK_STR, buf, 0,
+                     ofproto.OFP_VERSION, ofproto.OFPT_PACKET_IN, len(buf), 1)
+    return bytes(buf)
+
+
+def parse(body):
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(body)
+    return ofproto_parser.msg(version, msg_type, msg_len, xid, body)
+
+
+def traced_parse(body):
+    """Parse body and return the message, the number and size of the
+    allocations of at least PAYLOAD bytes still alive after parsing, and
+    the peak of allocated memory while parsing."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        (start, _) = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        msg = parse(body)
+        (_, peak) = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    large = [s for s in after.compare_to(before, "lineno")
+             if s.size_diff >= PAYLOAD]
+    return (msg, sum(s.count_diff for s in large),
+            sum(s.size_diff for s in large), peak - start)
+
+
+@pytest.mark.parametrize("ofproto, ofparser", VERSIONS)
+@pytest.mark.parametrize("wrap", [memoryview, bytearray])
+def test_packet_in_body_is_not_copied(ofproto, ofparser, wrap):
+    data = b"\xab" * PAYLOAD
+    body = wrap(packet_in(ofproto, ofparser, data))
+    (msg, count, size, peak) = traced_parse(body)
+    assert (count, size) == (0, 0)
+    assert peak < PAYLOAD
+    assert isinstance(msg.data, memoryview)
+    owner = body if isinstance(body, bytearray) else body.obj
+    assert msg.data.obj is owner
+    assert msg.data == data
+
+
+@pytest.mark.parametrize("ofproto, ofparser", VERSIONS)
+def test_packet_in_bytes_body_keeps_bytes_data(ofproto, ofparser):
+    data = b"\xab" * PAYLOAD
+    msg = parse(packet_in(ofproto, ofparser, data))
+    assert isinstance(msg.data, bytes)
+    assert msg.data + b"" == data